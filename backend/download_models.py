@@ -13,33 +13,185 @@ Usage:
     python backend/download_models.py
     python backend/download_models.py --models svd  # Download only SVD
     python backend/download_models.py --output /custom/path  # Custom output location
+    MAX_PARALLEL_DOWNLOADS=3 python backend/download_models.py  # Download all models at once
+    python backend/download_models.py --yes  # Unattended, no prompts
 """
 
 import os
 import sys
+import json
+import time
+import struct
 import argparse
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
+
+# Enable HuggingFace's multi-connection Rust downloader when it is installed.
+# Must be set before huggingface_hub is imported, since it reads the flag at import time.
+try:
+    import hf_transfer  # noqa: F401
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+except ImportError:
+    os.environ.pop("HF_HUB_ENABLE_HF_TRANSFER", None)
+
 from huggingface_hub import snapshot_download, hf_hub_download
-from typing import Optional
+from huggingface_hub.utils import disable_progress_bars
+from typing import List, Optional, Tuple
+
+
+class DownloadCancelled(Exception):
+    """A download was stopped because the user cancelled the run"""
+    pass
+
+
+def positioned_tqdm(position: int) -> type:
+    """
+    Make a tqdm class whose bars default to a fixed terminal line
+
+    Args:
+        position: Line offset for the bars (one per concurrent download)
+
+    Returns:
+        tqdm subclass (usable as snapshot_download's tqdm_class)
+    """
+    class PositionedTqdm(tqdm):
+        def __init__(self, *args, **kwargs):
+            kwargs.setdefault("position", position)
+            super().__init__(*args, **kwargs)
+
+    return PositionedTqdm
+
+
+def print_block(*lines: str) -> None:
+    """
+    Write several lines to stdout in a single call
+
+    Keeps section output contiguous when downloads run concurrently and avoids
+    one pipe write per line when stdout is captured.
+
+    Args:
+        *lines: Lines to print
+    """
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 class ModelDownloader:
     """Handles downloading AI models with progress tracking and resume capability"""
 
-    def __init__(self, base_path: str = "/mnt/d/VideoGenerator/models"):
+    # Attempts per CivitAI download before giving up (each resumes the .part file)
+    MAX_DOWNLOAD_ATTEMPTS = 5
+
+    # CivitAI write buffering and how often written pages are released from the page cache
+    WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+    FADVISE_WINDOW = 64 * 1024 * 1024
+
+    # CivitAI models, keyed by the download_all model name
+    CIVITAI_MODELS = {
+        "realistic-vision": {
+            "model_id": 130072,  # Realistic Vision v5.1
+            "output_filename": "realisticVision_v51.safetensors",
+            "local_dir": "realistic-vision",
+        },
+    }
+
+    # Only the files the diffusers loaders read, keyed by weight precision.
+    # SVD-XT also ships the original single-file checkpoints at the repo root,
+    # which the pipeline never uses. The fp16 variants are half the size and are
+    # what the pipelines load on CUDA.
+    SVD_ALLOW_PATTERNS = {
+        "fp16": ["model_index.json", "*/*.json", "*/*.fp16.safetensors"],
+        "fp32": ["model_index.json", "*/*.json", "*/*.safetensors"],
+    }
+    ANIMATEDIFF_ALLOW_PATTERNS = {
+        "fp16": ["*.json", "*.fp16.safetensors"],
+        "fp32": ["*.json", "*.safetensors"],
+    }
+
+    # Files each pipeline actually loads; "{variant}" is ".fp16" or "" by precision.
+    # Verification stats only these instead of walking the snapshot trees.
+    EXPECTED_FILES = {
+        "SVD-XT": [
+            "svd-xt/model_index.json",
+            "svd-xt/unet/config.json",
+            "svd-xt/unet/diffusion_pytorch_model{variant}.safetensors",
+            "svd-xt/vae/config.json",
+            "svd-xt/vae/diffusion_pytorch_model{variant}.safetensors",
+            "svd-xt/image_encoder/config.json",
+            "svd-xt/image_encoder/model{variant}.safetensors",
+            "svd-xt/scheduler/scheduler_config.json",
+            "svd-xt/feature_extractor/preprocessor_config.json",
+        ],
+        "AnimateDiff": [
+            "animatediff/config.json",
+            "animatediff/diffusion_pytorch_model{variant}.safetensors",
+        ],
+        "Realistic Vision": [
+            "realistic-vision/realisticVision_v51.safetensors",
+        ],
+    }
+
+    # Docs plus pickle/ONNX/Flax duplicates of the safetensors weights
+    IGNORE_PATTERNS = [
+        "*.md", ".gitattributes",
+        "*.bin", "*.ckpt", "*.pt", "*.onnx", "*.onnx_data", "*.msgpack"
+    ]
+
+    def __init__(
+        self,
+        base_path: str = "/mnt/d/VideoGenerator/models",
+        max_workers: int = 8,
+        precision: str = "fp16",
+        assume_yes: bool = False,
+        force_redownload: bool = False
+    ):
         """
         Initialize downloader
 
         Args:
             base_path: Base directory for model storage (default: D:\\VideoGenerator\\models)
+            max_workers: Number of files fetched concurrently from HuggingFace (default: 8)
+            precision: Weight precision to download, "fp16" or "fp32" (default: fp16)
+            assume_yes: Never prompt; keep existing files unless force_redownload
+            force_redownload: Re-download CivitAI files that already exist
         """
         self.base_path = Path(base_path)
+        self.max_workers = max_workers
+        self.precision = precision
+        self.force_redownload = force_redownload
+        # Prompts would block unattended runs (CI, Docker, backgrounded shells)
+        self.interactive = not assume_yes and sys.stdin.isatty()
+        # Set on Ctrl+C; in-flight CivitAI transfers stop at their next chunk
+        self._cancel = threading.Event()
         self.base_path.mkdir(parents=True, exist_ok=True)
 
-        print(f"📦 Models will be downloaded to: {self.base_path}")
-        print(f"   (Windows path: {self.wsl_to_windows_path(str(self.base_path))})\n")
+        # Shared HTTP session: keep-alive across CDN redirects, retry 5xx blips
+        self.session = self._create_session()
+
+        print_block(
+            f"📦 Models will be downloaded to: {self.base_path}",
+            f"   (Windows path: {self.wsl_to_windows_path(str(self.base_path))})\n"
+        )
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """Create an HTTP session with connection pooling and retries"""
+        retry = Retry(
+            total=5,
+            backoff_factor=1.5,
+            status_forcelist=[502, 503, 504],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        return session
 
     @staticmethod
     def wsl_to_windows_path(wsl_path: str) -> str:
@@ -48,8 +200,8 @@ class ModelDownloader:
             parts = wsl_path[5:].split('/', 1)
             if len(parts) >= 1:
                 drive = parts[0].upper()
-                rest = parts[1] if len(parts) > 1 else ''
-                return f"{drive}:\\{rest.replace('/', '\\')}"
+                rest = parts[1].replace('/', '\\') if len(parts) > 1 else ''
+                return f"{drive}:\\{rest}"
         return wsl_path
 
     def check_disk_space(self, required_gb: float = 20) -> bool:
@@ -63,12 +215,14 @@ class ModelDownloader:
             True if enough space, False otherwise
         """
         try:
-            stat = os.statvfs(self.base_path)
-            available_gb = (stat.f_bavail * stat.f_frsize) / (1024**3)
+            vfs = os.statvfs(self.base_path)
+            available_gb = (vfs.f_bavail * vfs.f_frsize) / (1024**3)
 
-            print(f"💾 Disk Space Check:")
-            print(f"   Available: {available_gb:.2f} GB")
-            print(f"   Required:  {required_gb:.2f} GB")
+            print_block(
+                f"💾 Disk Space Check:",
+                f"   Available: {available_gb:.2f} GB",
+                f"   Required:  {required_gb:.2f} GB"
+            )
 
             if available_gb < required_gb:
                 print(f"   ❌ Insufficient space!")
@@ -86,7 +240,8 @@ class ModelDownloader:
         local_dir: str,
         repo_type: str = "model",
         allow_patterns: Optional[list] = None,
-        ignore_patterns: Optional[list] = None
+        ignore_patterns: Optional[list] = None,
+        progress_position: Optional[int] = None
     ) -> Path:
         """
         Download model from HuggingFace Hub
@@ -97,15 +252,19 @@ class ModelDownloader:
             repo_type: Type of repository ("model" or "dataset")
             allow_patterns: Patterns to include
             ignore_patterns: Patterns to exclude
+            progress_position: Terminal line for the progress bar when
+                downloads run concurrently (None = tqdm default)
 
         Returns:
             Path to downloaded model
         """
         output_dir = self.base_path / local_dir
 
-        print(f"📥 Downloading {repo_id}")
-        print(f"   To: {output_dir}")
-        print(f"   This may take 10-30 minutes depending on your internet speed...\n")
+        header = [f"📥 Downloading {repo_id}", f"   To: {output_dir}"]
+        if os.environ.get("HF_HUB_ENABLE_HF_TRANSFER") == "1":
+            header.append(f"   Using hf_transfer (multi-connection downloads)")
+        header.append(f"   This may take 10-30 minutes depending on your internet speed...\n")
+        print_block(*header)
 
         try:
             snapshot_download(
@@ -115,7 +274,9 @@ class ModelDownloader:
                 repo_type=repo_type,
                 resume_download=True,  # Resume interrupted downloads
                 allow_patterns=allow_patterns,
-                ignore_patterns=ignore_patterns
+                ignore_patterns=ignore_patterns,
+                max_workers=self.max_workers,
+                tqdm_class=positioned_tqdm(progress_position) if progress_position is not None else None
             )
 
             print(f"   ✅ Successfully downloaded {repo_id}\n")
@@ -129,7 +290,9 @@ class ModelDownloader:
         self,
         model_id: int,
         output_filename: str,
-        local_dir: str
+        local_dir: str,
+        redownload: Optional[bool] = None,
+        progress_position: Optional[int] = None
     ) -> Path:
         """
         Download model from CivitAI
@@ -138,147 +301,324 @@ class ModelDownloader:
             model_id: CivitAI model ID
             output_filename: Output filename (e.g., "model.safetensors")
             local_dir: Local directory name (relative to base_path)
+            redownload: Whether to replace an existing file (None = decide
+                with resolve_redownload, which may prompt)
+            progress_position: Terminal line for the progress bar when
+                downloads run concurrently (None = tqdm default)
 
         Returns:
             Path to downloaded model
         """
         output_dir = self.base_path / local_dir
-        output_dir.mkdir(parents=True, exist_ok=True)
-
         output_path = output_dir / output_filename
 
+        # One stat answers both "already downloaded?" and its size; stats on
+        # /mnt/d go through the WSL drvfs bridge and are slow
+        try:
+            existing_size = os.stat(output_path).st_size
+        except FileNotFoundError:
+            existing_size = None
+            output_dir.mkdir(parents=True, exist_ok=True)
+
         # Check if already downloaded
-        if output_path.exists():
-            file_size_mb = output_path.stat().st_size / (1024**2)
-            print(f"📁 Model already exists: {output_path}")
-            print(f"   Size: {file_size_mb:.2f} MB")
+        if existing_size is not None:
+            file_size_mb = existing_size / (1024**2)
+            print_block(
+                f"📁 Model already exists: {output_path}",
+                f"   Size: {file_size_mb:.2f} MB"
+            )
+
+            if redownload is None:
+                redownload = self.resolve_redownload()
 
-            response = input("   Re-download? (y/n): ").strip().lower()
-            if response != 'y':
+            if not redownload:
                 print(f"   ✅ Using existing file\n")
                 return output_path
 
         url = f"https://civitai.com/api/download/models/{model_id}"
 
-        print(f"📥 Downloading from CivitAI (Model ID: {model_id})")
-        print(f"   URL: {url}")
-        print(f"   To: {output_path}")
-        print(f"   This may take 5-15 minutes...\n")
+        print_block(
+            f"📥 Downloading from CivitAI (Model ID: {model_id})",
+            f"   URL: {url}",
+            f"   To: {output_path}",
+            f"   This may take 5-15 minutes...\n"
+        )
+
+        # Download into a .part file so interrupted transfers can resume
+        part_path = output_path.with_name(output_filename + ".part")
+
+        for attempt in range(1, self.MAX_DOWNLOAD_ATTEMPTS + 1):
+            try:
+                self._stream_to_file(url, part_path, desc=output_filename, position=progress_position)
+                part_path.replace(output_path)
+
+                file_size_mb = output_path.stat().st_size / (1024**2)
+                print(f"   ✅ Successfully downloaded ({file_size_mb:.2f} MB)\n")
+                return output_path
+
+            except requests.exceptions.RequestException as e:
+                if attempt == self.MAX_DOWNLOAD_ATTEMPTS:
+                    print_block(
+                        f"   ❌ Failed to download from CivitAI: {e}",
+                        f"   Partial download kept at {part_path}, re-run to resume\n"
+                    )
+                    raise
+
+                delay = 2 ** attempt
+                print(f"   ⚠️  Download interrupted ({e}), resuming in {delay}s "
+                      f"(attempt {attempt + 1}/{self.MAX_DOWNLOAD_ATTEMPTS})")
+                time.sleep(delay)
+
+    def resolve_redownload(self) -> bool:
+        """
+        Decide whether an existing CivitAI file is downloaded again
+
+        May prompt, so call it from the main thread.
+
+        Returns:
+            True to replace the existing file
+        """
+        if self.force_redownload:
+            return True
+        if not self.interactive:
+            return False
+        return input("   Re-download? (y/n): ").strip().lower() == 'y'
+
+    def _stream_to_file(
+        self,
+        url: str,
+        part_path: Path,
+        desc: str,
+        position: Optional[int] = None
+    ) -> None:
+        """
+        Stream URL into a partial file, resuming from its current size
+
+        Args:
+            url: Download URL
+            part_path: Partial file to create or append to
+            desc: Progress bar label
+            position: Progress bar terminal line (None = tqdm default)
+
+        Raises:
+            DownloadCancelled: If the run was cancelled (the partial file is
+                kept for resuming)
+        """
+        existing = part_path.stat().st_size if part_path.exists() else 0
+        headers = {"Range": f"bytes={existing}-"} if existing else {}
+
+        with self.session.get(url, stream=True, timeout=30, headers=headers) as response:
+            # Range starts at or past EOF: the partial file is complete only
+            # if it matches the size the server reports ("bytes */<total>")
+            if existing and response.status_code == 416:
+                total = response.headers.get('content-range', '').rpartition('/')[2]
+                if total.isdigit() and int(total) == existing:
+                    return
+                print(f"   ⚠️  Partial file does not match the server's size "
+                      f"({existing} vs {total or 'unknown'} bytes), restarting")
+                response.close()
+                part_path.unlink()
+                self._stream_to_file(url, part_path, desc, position)
+                return
 
-        try:
-            # Stream download with progress bar
-            response = requests.get(url, stream=True, timeout=30)
             response.raise_for_status()
 
-            total_size = int(response.headers.get('content-length', 0))
-            block_size = 8192
+            # Server ignored the Range header, start over
+            if existing and response.status_code != 206:
+                existing = 0
+
+            content_length = int(response.headers.get('content-length', 0))
+            total_size = content_length + existing
 
-            with open(output_path, 'wb') as f, tqdm(
-                desc=output_filename,
+            # Aim for ~1000 chunks: small files don't over-allocate, multi-GB files
+            # don't pay per-chunk write/progress overhead. Unknown length uses 1 MiB.
+            if content_length:
+                block_size = max(64 * 1024, min(4 * 1024 * 1024, content_length // 1024))
+            else:
+                block_size = 1024 * 1024
+
+            flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if existing else os.O_TRUNC)
+            fd = os.open(part_path, flags, 0o644)
+            can_fadvise = hasattr(os, 'posix_fadvise') and hasattr(os, 'fdatasync')
+            unadvised = 0
+
+            with os.fdopen(fd, 'wb', buffering=self.WRITE_BUFFER_SIZE) as f, tqdm(
+                desc=desc,
                 total=total_size,
+                initial=existing,
                 unit='B',
                 unit_scale=True,
                 unit_divisor=1024,
+                position=position,
             ) as progress_bar:
                 for chunk in response.iter_content(chunk_size=block_size):
+                    if self._cancel.is_set():
+                        raise DownloadCancelled(f"{desc} cancelled")
                     if chunk:
                         f.write(chunk)
                         progress_bar.update(len(chunk))
-
-            file_size_mb = output_path.stat().st_size / (1024**2)
-            print(f"   ✅ Successfully downloaded ({file_size_mb:.2f} MB)\n")
-            return output_path
-
-        except requests.exceptions.RequestException as e:
-            print(f"   ❌ Failed to download from CivitAI: {e}\n")
-            if output_path.exists():
-                output_path.unlink()  # Delete partial download
-            raise
-
-    def download_svd_xt(self) -> Path:
+                        unadvised += len(chunk)
+
+                        # The weights are read once, much later: drop written pages
+                        # from the page cache instead of evicting hotter data
+                        if can_fadvise and unadvised >= self.FADVISE_WINDOW:
+                            f.flush()
+                            # DONTNEED skips dirty pages, so write them back first
+                            os.fdatasync(fd)
+                            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+                            unadvised = 0
+
+    def download_svd_xt(self, progress_position: Optional[int] = None) -> Path:
         """Download Stable Video Diffusion XT model (~10GB)"""
-        print("=" * 70)
-        print("📦 MODEL 1/3: Stable Video Diffusion XT (SVD-XT)")
-        print("=" * 70)
-        print("Source: Stability AI (HuggingFace)")
-        print("Size: ~10 GB")
-        print("Purpose: Fast image-to-video generation\n")
+        print_block(
+            "=" * 70,
+            "📦 MODEL 1/3: Stable Video Diffusion XT (SVD-XT)",
+            "=" * 70,
+            "Source: Stability AI (HuggingFace)",
+            "Size: ~10 GB",
+            "Purpose: Fast image-to-video generation\n"
+        )
 
         return self.download_from_huggingface(
             repo_id="stabilityai/stable-video-diffusion-img2vid-xt",
             local_dir="svd-xt",
-            ignore_patterns=["*.md", "*.txt", ".gitattributes"]  # Skip docs
+            allow_patterns=self.SVD_ALLOW_PATTERNS[self.precision],
+            ignore_patterns=self.IGNORE_PATTERNS,
+            progress_position=progress_position
         )
 
-    def download_animatediff(self) -> Path:
+    def download_animatediff(self, progress_position: Optional[int] = None) -> Path:
         """Download AnimateDiff motion adapter (~3GB)"""
-        print("=" * 70)
-        print("📦 MODEL 2/3: AnimateDiff Motion Adapter")
-        print("=" * 70)
-        print("Source: guoyww (HuggingFace)")
-        print("Size: ~3 GB")
-        print("Purpose: Motion module for Stable Diffusion models\n")
+        print_block(
+            "=" * 70,
+            "📦 MODEL 2/3: AnimateDiff Motion Adapter",
+            "=" * 70,
+            "Source: guoyww (HuggingFace)",
+            "Size: ~3 GB",
+            "Purpose: Motion module for Stable Diffusion models\n"
+        )
 
         return self.download_from_huggingface(
             repo_id="guoyww/animatediff-motion-adapter-v1-5-2",
             local_dir="animatediff",
-            ignore_patterns=["*.md", "*.txt", ".gitattributes"]
+            allow_patterns=self.ANIMATEDIFF_ALLOW_PATTERNS[self.precision],
+            ignore_patterns=self.IGNORE_PATTERNS,
+            progress_position=progress_position
         )
 
-    def download_realistic_vision(self) -> Path:
+    def download_realistic_vision(
+        self,
+        redownload: Optional[bool] = None,
+        progress_position: Optional[int] = None
+    ) -> Path:
         """Download Realistic Vision v5.1 from CivitAI (~2GB)"""
-        print("=" * 70)
-        print("📦 MODEL 3/3: Realistic Vision v5.1 (SD 1.5 Base)")
-        print("=" * 70)
-        print("Source: CivitAI (Model ID: 130072)")
-        print("Size: ~2 GB")
-        print("Purpose: Photorealistic base model for AnimateDiff")
-        print("NSFW: Capable (no safety filter)\n")
+        print_block(
+            "=" * 70,
+            "📦 MODEL 3/3: Realistic Vision v5.1 (SD 1.5 Base)",
+            "=" * 70,
+            "Source: CivitAI (Model ID: 130072)",
+            "Size: ~2 GB",
+            "Purpose: Photorealistic base model for AnimateDiff",
+            "NSFW: Capable (no safety filter)\n"
+        )
 
         return self.download_from_civitai(
-            model_id=130072,  # Realistic Vision v5.1
-            output_filename="realisticVision_v51.safetensors",
-            local_dir="realistic-vision"
+            **self.CIVITAI_MODELS["realistic-vision"],
+            redownload=redownload,
+            progress_position=progress_position
         )
 
+    @staticmethod
+    def _safetensors_ok(path: Path, file_size: int) -> bool:
+        """
+        Check that a .safetensors file has a valid header and is not truncated
+
+        Reads only the 8-byte length prefix and the JSON header, then checks
+        the file size matches the end of the last tensor's data.
+
+        Args:
+            path: Path to .safetensors file
+            file_size: Size of the file in bytes (from an existing stat)
+
+        Returns:
+            True if the header parses and the file is complete
+        """
+        try:
+            with open(path, 'rb') as f:
+                (header_len,) = struct.unpack('<Q', f.read(8))
+                # An HTML error page or a truncated file yields a nonsense length
+                if header_len > min(file_size - 8, 100 * 1024**2):
+                    return False
+                header = json.loads(f.read(header_len))
+        except (OSError, struct.error, ValueError):
+            return False
+
+        # A corrupt header can be any JSON value; treat every malformed
+        # shape as corrupt rather than letting it abort verification
+        if not isinstance(header, dict):
+            return False
+
+        try:
+            tensors = [v for k, v in header.items() if k != "__metadata__"]
+            if not tensors:
+                return False
+            data_end = max(t["data_offsets"][1] for t in tensors)
+            return file_size == 8 + header_len + data_end
+        except (AttributeError, KeyError, TypeError, IndexError):
+            return False
+
     def verify_downloads(self) -> bool:
         """Verify all models are downloaded correctly"""
-        print("\n" + "=" * 70)
-        print("🔍 Verifying Downloads")
-        print("=" * 70 + "\n")
+        print_block(
+            "\n" + "=" * 70,
+            "🔍 Verifying Downloads",
+            "=" * 70 + "\n"
+        )
 
+        variant = ".fp16" if self.precision == "fp16" else ""
         models = {
-            "SVD-XT": self.base_path / "svd-xt",
-            "AnimateDiff": self.base_path / "animatediff",
-            "Realistic Vision": self.base_path / "realistic-vision" / "realisticVision_v51.safetensors"
+            name: [self.base_path / f.format(variant=variant) for f in files]
+            for name, files in self.EXPECTED_FILES.items()
         }
 
-        all_valid = True
+        # Each check is pure filesystem I/O; on /mnt/d every stat crosses the
+        # drvfs bridge, so checking models concurrently hides that latency
+        with ThreadPoolExecutor(max_workers=len(models)) as executor:
+            results = list(executor.map(self._verify_model, models.values()))
 
-        for name, path in models.items():
-            if path.exists():
-                if path.is_dir():
-                    # Check if directory has files
-                    file_count = len(list(path.glob("**/*")))
-                    if file_count > 0:
-                        print(f"✅ {name}: Found ({file_count} files)")
-                    else:
-                        print(f"❌ {name}: Directory empty")
-                        all_valid = False
-                else:
-                    # Check file size
-                    size_mb = path.stat().st_size / (1024**2)
-                    if size_mb > 100:  # Should be at least 100MB
-                        print(f"✅ {name}: Found ({size_mb:.0f} MB)")
-                    else:
-                        print(f"❌ {name}: File too small ({size_mb:.0f} MB)")
-                        all_valid = False
-            else:
-                print(f"❌ {name}: Not found")
-                all_valid = False
+        all_valid = True
+        for name, (ok, detail) in zip(models, results):
+            print(f"{'✅' if ok else '❌'} {name}: {detail}")
+            all_valid = all_valid and ok
 
         return all_valid
 
+    def _verify_model(self, files: List[Path]) -> Tuple[bool, str]:
+        """
+        Verify a single downloaded model against its expected files
+
+        Args:
+            files: Files the model's loader needs
+
+        Returns:
+            Tuple of (is_valid, status detail)
+        """
+        total_size = 0
+
+        for path in files:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                return False, f"Missing {path.relative_to(self.base_path)}"
+
+            # Check safetensors header and that no data is missing
+            if path.suffix == ".safetensors" and not self._safetensors_ok(path, st.st_size):
+                return False, f"Corrupt or incomplete {path.relative_to(self.base_path)}"
+
+            total_size += st.st_size
+
+        return True, f"Found ({len(files)} files, {total_size / (1024**2):.0f} MB)"
+
     def download_all(self, models: list = None) -> bool:
         """
         Download all models or specific models
@@ -289,60 +629,126 @@ class ModelDownloader:
 
         Returns:
             True if all downloads successful, False otherwise
+
+        Raises:
+            KeyboardInterrupt: If the user cancels; downloads may still be
+                running in worker threads
         """
         if models is None:
             models = ["svd", "animatediff", "realistic-vision"]
 
-        print("\n" + "=" * 70)
-        print("🚀 IMAGE-TO-VIDEO GENERATOR - MODEL DOWNLOADER")
-        print("=" * 70)
-        print(f"\nModels to download: {', '.join(models)}")
-        print(f"Total size: ~15 GB (may vary)")
-        print(f"Estimated time: 20-60 minutes (depends on internet speed)\n")
+        print_block(
+            "\n" + "=" * 70,
+            "🚀 IMAGE-TO-VIDEO GENERATOR - MODEL DOWNLOADER",
+            "=" * 70,
+            f"\nModels to download: {', '.join(models)}",
+            f"Total size: ~15 GB (may vary)",
+            f"Estimated time: 20-60 minutes (depends on internet speed)\n"
+        )
 
         # Check disk space
         if not self.check_disk_space(required_gb=20):
             print("❌ Insufficient disk space. Please free up space and try again.")
             return False
 
-        input("Press Enter to start downloading, or Ctrl+C to cancel...")
-        print()
-
-        try:
-            if "svd" in models:
-                self.download_svd_xt()
+        # Re-download prompts happen here, on the main thread, rather than on
+        # a download worker where input() would race the progress bars
+        redownload = {}
+        for name, spec in self.CIVITAI_MODELS.items():
+            output_path = self.base_path / spec["local_dir"] / spec["output_filename"]
+            if name in models and output_path.exists():
+                print(f"📁 Model already exists: {output_path}")
+                redownload[name] = self.resolve_redownload()
+
+        if self.interactive:
+            input("Press Enter to start downloading, or Ctrl+C to cancel...")
+            print()
+
+        downloads = {
+            "svd": self.download_svd_xt,
+            "animatediff": self.download_animatediff,
+            "realistic-vision": self.download_realistic_vision,
+        }
 
-            if "animatediff" in models:
-                self.download_animatediff()
+        selected = [name for name in models if name in downloads]
+        executor = None
 
-            if "realistic-vision" in models:
-                self.download_realistic_vision()
+        try:
+            max_parallel_env = os.environ.get("MAX_PARALLEL_DOWNLOADS", "2")
+            try:
+                max_parallel = max(1, int(max_parallel_env))
+            except ValueError:
+                raise ValueError(
+                    f"MAX_PARALLEL_DOWNLOADS must be an integer, got {max_parallel_env!r}"
+                ) from None
+
+            # Concurrent downloads each get their own progress bar line. The
+            # per-file bars inside snapshot_download cannot be positioned, so
+            # they are turned off to keep the bars from interleaving.
+            concurrent = min(max_parallel, len(selected)) > 1
+            if concurrent:
+                disable_progress_bars()
+
+            # HuggingFace and CivitAI are separate origins, so running downloads
+            # concurrently fills bandwidth that a single slow mirror would leave idle
+            executor = ThreadPoolExecutor(max_workers=max_parallel)
+
+            futures = {}
+            for position, name in enumerate(selected):
+                kwargs = {"progress_position": position} if concurrent else {}
+                if name in redownload:
+                    kwargs["redownload"] = redownload[name]
+                futures[executor.submit(downloads[name], **kwargs)] = name
+
+            failures = []
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    failures.append(f"{futures[future]}: {e}")
+
+            if failures:
+                raise RuntimeError("; ".join(failures))
 
             # Verify all downloads
             if self.verify_downloads():
-                print("\n" + "=" * 70)
-                print("✅ ALL MODELS DOWNLOADED SUCCESSFULLY!")
-                print("=" * 70)
-                print("\nNext steps:")
-                print("  1. Verify GPU access: python scripts/check_gpu.py")
-                print("  2. Test generation: python backend/test_generation.py")
-                print("  3. Start developing!\n")
+                print_block(
+                    "\n" + "=" * 70,
+                    "✅ ALL MODELS DOWNLOADED SUCCESSFULLY!",
+                    "=" * 70,
+                    "\nNext steps:",
+                    "  1. Verify GPU access: python scripts/check_gpu.py",
+                    "  2. Test generation: python backend/test_generation.py",
+                    "  3. Start developing!\n"
+                )
                 return True
             else:
-                print("\n" + "=" * 70)
-                print("⚠️  SOME MODELS MAY BE INCOMPLETE")
-                print("=" * 70)
-                print("\nPlease re-run this script to retry failed downloads.\n")
+                print_block(
+                    "\n" + "=" * 70,
+                    "⚠️  SOME MODELS MAY BE INCOMPLETE",
+                    "=" * 70,
+                    "\nPlease re-run this script to retry failed downloads.\n"
+                )
                 return False
 
         except KeyboardInterrupt:
-            print("\n\n⚠️  Download cancelled by user")
-            print("You can resume by running this script again.\n")
-            return False
+            # Stop CivitAI transfers at their next chunk; the caller exits
+            # the process for the HuggingFace ones (see main)
+            self._cancel.set()
+            print_block(
+                "\n\n⚠️  Download cancelled by user",
+                "You can resume by running this script again.\n"
+            )
+            raise
         except Exception as e:
-            print(f"\n\n❌ Download failed: {e}")
-            print("You can retry by running this script again.\n")
+            print_block(
+                f"\n\n❌ Download failed: {e}",
+                "You can retry by running this script again.\n"
+            )
             return False
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
 
 
 def main():
@@ -363,14 +769,52 @@ def main():
         choices=["svd", "animatediff", "realistic-vision"],
         help="Specific models to download (default: all)"
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Concurrent file downloads per HuggingFace repo (default: 8)"
+    )
+    parser.add_argument(
+        "--precision",
+        choices=["fp16", "fp32"],
+        default="fp16",
+        help="Weight precision for SVD-XT and AnimateDiff (default: fp16)"
+    )
+    parser.add_argument(
+        "--yes",
+        "-y",
+        action="store_true",
+        help="Do not prompt for confirmation (implied when stdin is not a TTY)"
+    )
+    parser.add_argument(
+        "--force-redownload",
+        action="store_true",
+        help="Re-download CivitAI models that already exist"
+    )
 
     args = parser.parse_args()
 
     # Create downloader
-    downloader = ModelDownloader(base_path=args.output)
+    downloader = ModelDownloader(
+        base_path=args.output,
+        max_workers=args.max_workers,
+        precision=args.precision,
+        assume_yes=args.yes,
+        force_redownload=args.force_redownload
+    )
 
     # Download models
-    success = downloader.download_all(models=args.models)
+    try:
+        success = downloader.download_all(models=args.models)
+    except KeyboardInterrupt:
+        # snapshot_download's worker threads cannot be interrupted, and
+        # concurrent.futures joins them at interpreter exit, so a normal exit
+        # would wait for every in-flight file. Exit immediately instead;
+        # partial files are resumed on the next run.
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(130)
 
     return 0 if success else 1
 
@@ -11,21 +11,143 @@ Usage:
     python generate.py --help
     python generate.py --list-models
     python generate.py --vram-stats
+    python generate.py --serve
 
 Returns JSON response with generation results.
+
+In --serve mode the process stays alive, reads one JSON request per line
+from stdin and writes one compact JSON response per line to stdout, so
+torch/diffusers imports and loaded pipelines are reused across requests.
+Progress output goes to stderr in this mode.
 """
 
+import os
+import re
 import sys
 import json
 import argparse
-from typing import Dict, Any
+import contextlib
+from typing import Dict, Any, TYPE_CHECKING
 from pathlib import Path
 
+# CUDA caching allocator tuning; must be set before torch is first imported.
+# Expandable segments avoid fragmentation OOMs without emptying the cache
+# between generations.
+os.environ.setdefault(
+    "PYTORCH_CUDA_ALLOC_CONF",
+    "max_split_size_mb:128,expandable_segments:True,garbage_collection_threshold:0.8"
+)
+
 # Add backend directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from services.video_service import VideoService
 from utils.path_utils import windows_to_wsl_path, wsl_to_windows_path
+from utils.log_utils import setup_logging, flush_logging
+from utils.prompt_utils import is_blank
+
+# orjson is optional: faster parse/serialize at the C# <-> Python boundary
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# VideoService pulls in torch and diffusers (seconds of import time), so it is
+# imported only once main() knows a generation is needed
+if TYPE_CHECKING:
+    from services.video_service import VideoService
+
+# Compact separators: the C# frontend parses stdout programmatically
+COMPACT_SEPARATORS = (',', ':')
+
+# Required request fields
+REQUIRED_FIELDS = ('image_path', 'prompt')
+
+# Optional request fields passed to VideoService.generate_video, with defaults
+GENERATION_DEFAULTS = {
+    'model_name': 'svd-xt',
+    'output_path': None,
+    'negative_prompt': None,
+    'num_frames': None,
+    'fps': None,
+    'width': None,
+    'height': None,
+    'seed': -1,
+}
+
+# Pipeline-specific fields, forwarded only when present in the request
+SVD_PARAM_KEYS = ('motion_bucket_id', 'noise_aug_strength', 'decode_chunk_size')
+ANIMATEDIFF_PARAM_KEYS = ('guidance_scale', 'num_inference_steps', 'clip_skip')
+PIPELINE_PARAM_KEYS = SVD_PARAM_KEYS + ANIMATEDIFF_PARAM_KEYS
+
+# Drive-letter Windows path (D:\... or D:/...) sent by the C# frontend
+WINDOWS_PATH_RE = re.compile(r'^[A-Za-z]:(?:[\\/]|$)')
+
+
+def to_wsl_path(path: str) -> str:
+    """
+    Convert a Windows drive path to WSL, leaving other paths untouched
+
+    Args:
+        path: Path from request parameters
+
+    Returns:
+        WSL path
+    """
+    return windows_to_wsl_path(path) if WINDOWS_PATH_RE.match(path) else path
+
+
+def load_json(text: str) -> Any:
+    """
+    Parse JSON request text, using orjson when available
+
+    Args:
+        text: JSON string
+
+    Returns:
+        Parsed object
+
+    Raises:
+        json.JSONDecodeError: If text is not valid JSON (orjson's error subclasses it)
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def dump_json(data: Dict[str, Any], pretty: bool = False) -> str:
+    """
+    Serialize response to JSON, using orjson when available
+
+    Args:
+        data: Response dictionary
+        pretty: Indent output for humans (default: compact)
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+        except TypeError:
+            # orjson rejects some types json accepts (e.g. non-str keys)
+            pass
+
+    if pretty:
+        return json.dumps(data, indent=2)
+    return json.dumps(data, separators=COMPACT_SEPARATORS)
+
+
+def emit_json(data: Dict[str, Any], pretty: bool = False) -> None:
+    """
+    Print JSON response to stdout
+
+    Args:
+        data: Response dictionary
+        pretty: Indent output for humans (default: compact)
+    """
+    # Pending progress lines must land before the response
+    flush_logging()
+    print(dump_json(data, pretty))
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -51,6 +173,11 @@ Examples:
 
     # Check VRAM status
     python generate.py --vram-stats
+
+    # Persistent worker: one JSON request per stdin line
+    python generate.py --serve
+    {"command":"list_models"}
+    {"image_path":"input.jpg","prompt":"slow zoom in","model_name":"svd-xt"}
         """
     )
 
@@ -72,6 +199,12 @@ Examples:
         help='Show VRAM statistics and exit'
     )
 
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Run as a persistent worker reading newline-delimited JSON requests from stdin'
+    )
+
     parser.add_argument(
         '--models-dir',
         default='/mnt/d/VideoGenerator/models',
@@ -98,35 +231,44 @@ Examples:
     return parser.parse_args()
 
 
-def list_models(service: VideoService) -> None:
+def list_models(models_dir: str, pretty: bool = False) -> None:
     """
     List available models and print as JSON
 
+    Scans the filesystem only; torch and diffusers are not imported.
+
     Args:
-        service: Video service instance
+        models_dir: Models directory
+        pretty: Indent output for humans
     """
-    models = service.list_models()
+    from services.model_discovery import discover_models
+
+    models = [info.to_dict() for info in discover_models(Path(models_dir)).values()]
     output = {
         'success': True,
         'models': models,
         'count': len(models)
     }
-    print(json.dumps(output, indent=2))
+    emit_json(output, pretty)
 
 
-def show_vram_stats(service: VideoService) -> None:
+def show_vram_stats(pretty: bool = False) -> None:
     """
     Show VRAM statistics and print as JSON
 
+    Imports torch but not diffusers, and skips model discovery.
+
     Args:
-        service: Video service instance
+        pretty: Indent output for humans
     """
-    stats = service.get_vram_stats()
+    from utils.vram_utils import VRAMMonitor
+
+    stats = VRAMMonitor(device='cuda').get_vram_stats()
     output = {
         'success': True,
         'vram': stats
     }
-    print(json.dumps(output, indent=2))
+    emit_json(output, pretty)
 
 
 def validate_params(params: Dict[str, Any]) -> tuple[bool, str]:
@@ -140,8 +282,7 @@ def validate_params(params: Dict[str, Any]) -> tuple[bool, str]:
         Tuple of (is_valid, error_message)
     """
     # Required fields
-    required = ['image_path', 'prompt']
-    for field in required:
+    for field in REQUIRED_FIELDS:
         if field not in params:
             return False, f"Missing required field: {field}"
 
@@ -149,21 +290,20 @@ def validate_params(params: Dict[str, Any]) -> tuple[bool, str]:
     image_path = params['image_path']
 
     # Convert Windows path to WSL if needed
-    if len(image_path) >= 2 and image_path[1] == ':':
-        image_path = windows_to_wsl_path(image_path)
-        params['image_path'] = image_path
+    image_path = to_wsl_path(image_path)
+    params['image_path'] = image_path
 
     if not Path(image_path).exists():
         return False, f"Image file not found: {image_path}"
 
     # Validate prompt
-    if not params['prompt'] or not params['prompt'].strip():
+    if is_blank(params['prompt']):
         return False, "Prompt cannot be empty"
 
     return True, ""
 
 
-def generate_video(service: VideoService, params: Dict[str, Any]) -> Dict[str, Any]:
+def generate_video(service: "VideoService", params: Dict[str, Any]) -> Dict[str, Any]:
     """
     Generate video and return result as dictionary
 
@@ -183,52 +323,20 @@ def generate_video(service: VideoService, params: Dict[str, Any]) -> Dict[str, A
         }
 
     # Extract parameters
-    image_path = params['image_path']
-    prompt = params['prompt']
-    model_name = params.get('model_name', 'svd-xt')
-    output_path = params.get('output_path')
-    negative_prompt = params.get('negative_prompt')
-    num_frames = params.get('num_frames')
-    fps = params.get('fps')
-    width = params.get('width')
-    height = params.get('height')
-    seed = params.get('seed', -1)
+    gen_args = {key: params.get(key, default) for key, default in GENERATION_DEFAULTS.items()}
 
     # Additional parameters for specific pipelines
-    kwargs = {}
-
-    # SVD-specific
-    if 'motion_bucket_id' in params:
-        kwargs['motion_bucket_id'] = params['motion_bucket_id']
-    if 'noise_aug_strength' in params:
-        kwargs['noise_aug_strength'] = params['noise_aug_strength']
-    if 'decode_chunk_size' in params:
-        kwargs['decode_chunk_size'] = params['decode_chunk_size']
-
-    # AnimateDiff-specific
-    if 'guidance_scale' in params:
-        kwargs['guidance_scale'] = params['guidance_scale']
-    if 'num_inference_steps' in params:
-        kwargs['num_inference_steps'] = params['num_inference_steps']
-    if 'clip_skip' in params:
-        kwargs['clip_skip'] = params['clip_skip']
+    kwargs = {key: params[key] for key in PIPELINE_PARAM_KEYS if key in params}
 
     # Convert output path from Windows to WSL if needed
-    if output_path and len(output_path) >= 2 and output_path[1] == ':':
-        output_path = windows_to_wsl_path(output_path)
+    if gen_args['output_path']:
+        gen_args['output_path'] = to_wsl_path(gen_args['output_path'])
 
     # Generate video
     result = service.generate_video(
-        image_path=image_path,
-        prompt=prompt,
-        model_name=model_name,
-        output_path=output_path,
-        negative_prompt=negative_prompt,
-        num_frames=num_frames,
-        fps=fps,
-        width=width,
-        height=height,
-        seed=seed,
+        image_path=params['image_path'],
+        prompt=params['prompt'],
+        **gen_args,
         **kwargs
     )
 
@@ -243,6 +351,66 @@ def generate_video(service: VideoService, params: Dict[str, Any]) -> Dict[str, A
     return result_dict
 
 
+def handle_request(service: "VideoService", request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Handle a single serve-mode request
+
+    Requests with a "command" of "list_models" or "vram_stats" run the
+    matching special command; anything else is treated as generation parameters.
+
+    Args:
+        service: Video service instance
+        request: Request dictionary
+
+    Returns:
+        Response dictionary
+    """
+    command = request.get('command')
+
+    if command == 'list_models':
+        models = service.list_models()
+        return {'success': True, 'models': models, 'count': len(models)}
+
+    if command == 'vram_stats':
+        return {'success': True, 'vram': service.get_vram_stats()}
+
+    if command is not None:
+        return {'success': False, 'error': f'Unknown command: {command}'}
+
+    return generate_video(service, request)
+
+
+def serve(service: "VideoService") -> int:
+    """
+    Serve newline-delimited JSON requests from stdin until EOF
+
+    Args:
+        service: Video service instance
+
+    Returns:
+        Exit code (0 on EOF)
+    """
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            request = load_json(line)
+            # Keep stdout reserved for responses; progress prints go to stderr
+            with contextlib.redirect_stdout(sys.stderr):
+                response = handle_request(service, request)
+        except json.JSONDecodeError as e:
+            response = {'success': False, 'error': f'Invalid JSON parameters: {str(e)}'}
+        except Exception as e:
+            response = {'success': False, 'error': f'Unexpected error: {str(e)}'}
+
+        emit_json(response)
+        sys.stdout.flush()
+
+    return 0
+
+
 def main() -> int:
     """
     Main entry point
@@ -252,23 +420,37 @@ def main() -> int:
     """
     args = parse_arguments()
 
-    try:
-        # Initialize video service
-        service = VideoService(
-            models_dir=args.models_dir,
-            output_dir=args.output_dir,
-            device='cuda'
-        )
+    # Progress logging: stdout for one-shot runs, stderr in serve mode
+    setup_logging(sys.stderr if args.serve else sys.stdout)
 
-        # Handle special commands
+    try:
+        # Handle special commands (before importing torch/diffusers)
         if args.list_models:
-            list_models(service)
+            list_models(args.models_dir, pretty=args.verbose)
             return 0
 
         if args.vram_stats:
-            show_vram_stats(service)
+            show_vram_stats(pretty=args.verbose)
             return 0
 
+        from services.video_service import VideoService
+
+        # Initialize video service
+        # In serve mode stdout carries only responses, so discovery prints go to stderr
+        redirect = contextlib.redirect_stdout(sys.stderr) if args.serve else contextlib.nullcontext()
+        with redirect:
+            service = VideoService(
+                models_dir=args.models_dir,
+                output_dir=args.output_dir,
+                device='cuda',
+                # A long-lived server reuses compiled kernels across requests;
+                # one-shot runs would pay the compile on every invocation
+                pipeline_options={'enable_compile': True} if args.serve else None
+            )
+
+        if args.serve:
+            return serve(service)
+
         # Parse generation parameters
         if args.base64:
             # Decode base64-encoded JSON parameters
@@ -276,51 +458,51 @@ def main() -> int:
                 import base64
                 json_bytes = base64.b64decode(args.base64)
                 json_str = json_bytes.decode('utf-8')
-                params = json.loads(json_str)
+                params = load_json(json_str)
             except Exception as e:
-                print(json.dumps({
+                emit_json({
                     'success': False,
                     'error': f'Failed to decode base64 parameters: {str(e)}'
-                }))
+                })
                 return 1
         elif args.params:
             # Parse regular JSON parameters
             try:
-                params = json.loads(args.params)
+                params = load_json(args.params)
             except json.JSONDecodeError as e:
-                print(json.dumps({
+                emit_json({
                     'success': False,
                     'error': f'Invalid JSON parameters: {str(e)}'
-                }))
+                })
                 return 1
         else:
-            print(json.dumps({
+            emit_json({
                 'success': False,
                 'error': 'No parameters provided. Use --help or --base64 for usage information.'
-            }))
+            })
             return 1
 
         # Generate video
         result = generate_video(service, params)
 
         # Output result as JSON
-        print(json.dumps(result, indent=2 if args.verbose else None))
+        emit_json(result, pretty=args.verbose)
 
         # Return exit code based on success
         return 0 if result['success'] else 1
 
     except KeyboardInterrupt:
-        print(json.dumps({
+        emit_json({
             'success': False,
             'error': 'Generation cancelled by user'
-        }))
+        })
         return 1
 
     except Exception as e:
-        print(json.dumps({
+        emit_json({
             'success': False,
             'error': f'Unexpected error: {str(e)}'
-        }))
+        })
         return 1
 
 
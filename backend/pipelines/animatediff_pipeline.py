@@ -18,14 +18,23 @@ Model Requirements:
 """
 
 import torch
-from typing import List, Dict, Any, Optional
+import torch.nn.functional as F
+import copy
+import functools
+import threading
+import types
+import warnings
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 from PIL import Image
 import numpy as np
+import logging
 
 try:
     from diffusers import (
         AnimateDiffPipeline as DiffusersAnimateDiffPipeline,
+        StableDiffusionPipeline,
         MotionAdapter,
         DDIMScheduler,
         DPMSolverMultistepScheduler,
@@ -37,8 +46,49 @@ except ImportError:
         "diffusers not installed. Install with: pip install diffusers==0.24.0"
     )
 
-from .base_pipeline import BasePipeline, ModelLoadError, VRAMError
-from utils.prompt_utils import validate_and_prepare_prompts, PromptValidator
+try:
+    from DeepCache import DeepCacheSDHelper
+    HAS_DEEPCACHE = True
+except ImportError:
+    HAS_DEEPCACHE = False
+
+try:
+    from torchao.quantization import quantize_, float8_weight_only
+    HAS_TORCHAO = True
+except ImportError:
+    HAS_TORCHAO = False
+
+# Wrapper type returned by whole-module torch.compile
+try:
+    from torch._dynamo.eval_frame import OptimizedModule
+except ImportError:
+    OptimizedModule = None
+
+from .base_pipeline import AOTCompiledUNet, BasePipeline, CUDAGraphUNet, ModelLoadError, VRAMError
+from utils.prompt_utils import DEFAULT_VALIDATOR
+
+logger = logging.getLogger(__name__)
+
+# Largest finite float8_e4m3fn value (per-channel FP8 scales map amax to it)
+FP8_E4M3_MAX = 448.0
+
+# Converted single-file checkpoints kept in host RAM across unload/load,
+# keyed by (path, mtime, size, dtype). Holds the pristine CPU components
+# from_single_file produced; each pipeline gets its own copies, so device
+# placement and optimizations never reach the cached modules.
+MAX_CACHED_CHECKPOINTS = 2
+_CHECKPOINT_CACHE: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+_CHECKPOINT_CACHE_LOCK = threading.Lock()
+
+# Cached components handed to a pipeline as-is (the SD UNet is only read:
+# the AnimateDiff constructor copies its weights into a new motion UNet)
+_SHARED_CHECKPOINT_COMPONENTS = ('tokenizer', 'unet')
+
+
+def clear_checkpoint_cache() -> None:
+    """Drop all cached single-file checkpoint components"""
+    with _CHECKPOINT_CACHE_LOCK:
+        _CHECKPOINT_CACHE.clear()
 
 
 class AnimateDiffPipeline(BasePipeline):
@@ -52,16 +102,43 @@ class AnimateDiffPipeline(BasePipeline):
     DEFAULT_NUM_INFERENCE_STEPS = 25
     DEFAULT_GUIDANCE_SCALE = 7.5
     DEFAULT_CLIP_SKIP = 1
+    PROMPT_CACHE_SIZE = 128
+
+    # DeepCache: full UNet pass every N steps, cached deep features in between
+    DEEPCACHE_INTERVAL = 3
+    DEEPCACHE_BRANCH_ID = 0
+
+    # Scheduler type -> (scheduler class, config overrides)
+    SCHEDULERS = {
+        "dpm++": (
+            DPMSolverMultistepScheduler,
+            {"algorithm_type": "dpmsolver++", "use_karras_sigmas": True}
+        ),
+        "euler": (EulerAncestralDiscreteScheduler, {}),
+        "ddim": (DDIMScheduler, {}),
+    }
+
+    # Supported weight quantization modes
+    QUANTIZATION_MODES = ("fp8",)
+
+    # Layers kept at full precision when quantizing (entry/exit convs, norms)
+    QUANTIZATION_SKIP = ("norm", "conv_in", "conv_out")
 
     def __init__(
         self,
         model_path: str,
         motion_adapter_path: str,
         device: str = "cuda",
-        torch_dtype: torch.dtype = torch.float16,
+        torch_dtype: Optional[torch.dtype] = None,
         enable_xformers: bool = True,
         enable_cpu_offload: bool = True,
-        scheduler_type: str = "dpm++"
+        scheduler_type: str = "dpm++",
+        enable_compile: bool = False,
+        compile_mode: Optional[str] = None,
+        enable_aot: bool = False,
+        enable_cuda_graphs: bool = False,
+        enable_deepcache: bool = True,
+        quantization: Optional[str] = None
     ):
         """
         Initialize AnimateDiff pipeline
@@ -70,37 +147,62 @@ class AnimateDiffPipeline(BasePipeline):
             model_path: Path to SD 1.5 base model (.safetensors or directory)
             motion_adapter_path: Path to motion adapter directory
             device: Device to run on
-            torch_dtype: Data type for model weights
+            torch_dtype: Data type for model weights (None = auto bf16/fp16)
             enable_xformers: Enable memory-efficient attention
             enable_cpu_offload: Enable CPU offloading
             scheduler_type: Scheduler type ("dpm++", "euler", or "ddim")
+            enable_compile: Compile the UNet with torch.compile
+            compile_mode: torch.compile mode (see BasePipeline)
+            enable_aot: Run the UNet from a cached AOTInductor package
+            enable_cuda_graphs: Replay UNet steps as CUDA graphs (see BasePipeline)
+            enable_deepcache: Reuse UNet features across steps (requires DeepCache;
+                skipped with CUDA graphs, AOT packages or whole-UNet compile)
+            quantization: UNet weight quantization ("fp8" or None)
         """
         super().__init__(
             model_path=model_path,
             device=device,
             torch_dtype=torch_dtype,
             enable_xformers=enable_xformers,
-            enable_cpu_offload=enable_cpu_offload
+            enable_cpu_offload=enable_cpu_offload,
+            enable_compile=enable_compile,
+            compile_mode=compile_mode,
+            enable_aot=enable_aot,
+            enable_cuda_graphs=enable_cuda_graphs
         )
 
         self.motion_adapter_path = Path(motion_adapter_path)
         self.scheduler_type = scheduler_type
         self.motion_adapter = None
+        self.enable_deepcache = enable_deepcache
+        self.deepcache_helper = None
 
-    def load_model(self) -> None:
+        if quantization is not None and quantization not in self.QUANTIZATION_MODES:
+            raise ValueError(
+                f"Unsupported quantization: {quantization}. "
+                f"Supported: {', '.join(self.QUANTIZATION_MODES)}"
+            )
+        self.quantization = quantization
+
+        # Prompt processing is deterministic, so repeat prompts hit the cache
+        self._prompt_validator = DEFAULT_VALIDATOR
+        self._prepare_prompt = functools.lru_cache(maxsize=self.PROMPT_CACHE_SIZE)(
+            self._prepare_prompt_uncached
+        )
+
+        # Pinned host buffer for the conditioning image (allocated on first use)
+        self._image_staging: Optional[torch.Tensor] = None
+
+    def load_weights(self) -> None:
         """
-        Load AnimateDiff model into memory
+        Read the motion adapter and base model into a CPU pipeline
 
         Raises:
             ModelLoadError: If model loading fails
         """
-        if self.is_loaded:
-            print("⚠️  Model already loaded")
-            return
-
-        print(f"📦 Loading AnimateDiff pipeline:")
-        print(f"   Base model: {self.model_path}")
-        print(f"   Motion adapter: {self.motion_adapter_path}")
+        logger.info("📦 Loading AnimateDiff pipeline:")
+        logger.info("   Base model: %s", self.model_path)
+        logger.info("   Motion adapter: %s", self.motion_adapter_path)
 
         # Check if paths exist
         if not self.model_path.exists():
@@ -109,58 +211,45 @@ class AnimateDiffPipeline(BasePipeline):
         if not self.motion_adapter_path.exists():
             raise ModelLoadError(f"Motion adapter not found: {self.motion_adapter_path}")
 
-        # Check VRAM availability
-        stats = self.vram_monitor.get_vram_stats()
-        if stats['available_gb'] < 5.0:
-            raise VRAMError(
-                f"Insufficient VRAM. Need at least 5GB, have {stats['available_gb']:.2f}GB"
-            )
-
         try:
             # Step 1: Load motion adapter
-            print("  Loading motion adapter...")
+            logger.info("  Loading motion adapter...")
+            # download_models.py fetches only the fp16 variant by default
+            has_fp16 = any(self.motion_adapter_path.glob("*.fp16.safetensors"))
+            has_full = (self.motion_adapter_path / "diffusion_pytorch_model.safetensors").exists()
+            variant = None
+            if has_fp16 and (self.torch_dtype in (torch.float16, torch.bfloat16) or not has_full):
+                variant = "fp16"
+
             self.motion_adapter = MotionAdapter.from_pretrained(
                 str(self.motion_adapter_path),
                 torch_dtype=self.torch_dtype,
+                variant=variant,
                 local_files_only=True
             )
-            print("  ✅ Motion adapter loaded")
+            logger.info("  ✅ Motion adapter loaded")
 
             # Step 2: Load base model
-            print("  Loading base model...")
+            logger.info("  Loading base model...")
 
             # Check if it's a .safetensors file (custom model) or directory
             if self.model_path.suffix == ".safetensors":
                 # Load from single file (CivitAI models)
-                print(f"  Loading custom model from .safetensors file")
-
-                # Load AnimateDiffPipeline from base SD 1.5, then inject custom weights
-                import warnings
-                from safetensors.torch import load_file
-
-                # Suppress deprecation warnings
-                warnings.filterwarnings('ignore', category=FutureWarning)
-                warnings.filterwarnings('ignore', category=UserWarning)
-
-                # Load AnimateDiff pipeline with base SD 1.5 model
-                print("  Loading base AnimateDiff pipeline with SD 1.5...")
-                self.pipe = DiffusersAnimateDiffPipeline.from_pretrained(
-                    "runwayml/stable-diffusion-v1-5",
-                    motion_adapter=self.motion_adapter,
-                    torch_dtype=self.torch_dtype
-                )
+                logger.info("  Loading custom model from .safetensors file")
 
-                # Load custom model weights from .safetensors file
-                print(f"  Loading custom weights from {self.model_path.name}...")
-                state_dict = load_file(str(self.model_path))
+                # Build the pipeline directly from the checkpoint (UNet, VAE and
+                # text encoder in one pass), then attach the motion adapter
+                logger.info("  Loading components from %s...", self.model_path.name)
 
-                # Inject custom weights into UNet
-                self.pipe.unet.load_state_dict(state_dict, strict=False)
-                print("  ✅ Custom model weights loaded")
+                # Suppress conversion deprecation warnings for the load only
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    self.pipe = self._load_single_file_pipeline()
+                logger.info("  ✅ Custom model loaded")
 
                 # Disable safety checker for NSFW
                 self.pipe.safety_checker = None
-                print("  🔓 Safety checker disabled (NSFW-capable)")
+                logger.info("  🔓 Safety checker disabled (NSFW-capable)")
 
             else:
                 # Load from pretrained directory
@@ -173,39 +262,306 @@ class AnimateDiffPipeline(BasePipeline):
 
                 # CRITICAL: Disable safety checker for NSFW support
                 self.pipe.safety_checker = None
-                print("  🔓 Safety checker disabled (NSFW-capable)")
+                logger.info("  🔓 Safety checker disabled (NSFW-capable)")
 
             # Step 3: Configure scheduler
-            print(f"  Configuring scheduler: {self.scheduler_type}")
+            logger.info("  Configuring scheduler: %s", self.scheduler_type)
             self._configure_scheduler()
 
-            # Step 4: Apply optimizations
-            self.apply_optimizations()
+        except Exception as e:
+            self.pipe = None
+            raise ModelLoadError(f"Failed to load AnimateDiff pipeline: {e}")
 
-            self.is_loaded = True
-            print(f"✅ AnimateDiff pipeline loaded successfully\n")
+    def place_on_device(self) -> None:
+        """
+        Check free VRAM, then place the pipeline and apply optimizations
+
+        Raises:
+            VRAMError: If less than 5GB of VRAM is free
+            ModelLoadError: If applying optimizations fails
+        """
+        # Check VRAM availability
+        stats = self.vram_monitor.get_vram_stats(refresh=True)
+        if stats['available_gb'] < 5.0:
+            raise VRAMError(
+                f"Insufficient VRAM. Need at least 5GB, have {stats['available_gb']:.2f}GB"
+            )
+
+        try:
+            # Step 4: Apply optimizations (including weight quantization)
+            super().place_on_device()
+
+            # Step 5: Feature caching across denoising steps
+            if self.enable_deepcache:
+                conflict = self._deepcache_conflict()
+                if conflict is not None:
+                    logger.warning("  ⚠️  DeepCache is incompatible with %s, skipping", conflict)
+                else:
+                    self._enable_deepcache()
+
+            logger.info("✅ AnimateDiff pipeline loaded successfully\n")
 
         except Exception as e:
             raise ModelLoadError(f"Failed to load AnimateDiff pipeline: {e}")
 
-    def _configure_scheduler(self) -> None:
-        """Configure scheduler based on type"""
-        if self.scheduler_type == "dpm++":
-            self.pipe.scheduler = DPMSolverMultistepScheduler.from_config(
-                self.pipe.scheduler.config,
-                algorithm_type="dpmsolver++",
-                use_karras_sigmas=True
-            )
-        elif self.scheduler_type == "euler":
-            self.pipe.scheduler = EulerAncestralDiscreteScheduler.from_config(
-                self.pipe.scheduler.config
+    def _prepare_prompt_uncached(
+        self,
+        prompt: str,
+        negative_prompt: Optional[str]
+    ) -> tuple[str, str]:
+        """
+        Validate prompts and add quality tags
+
+        Args:
+            prompt: Raw prompt
+            negative_prompt: Raw negative prompt (None for default)
+
+        Returns:
+            Tuple of (processed_prompt, processed_negative)
+
+        Raises:
+            ValueError: If prompt is invalid
+        """
+        is_valid, proc_prompt, proc_negative, error = self.prepare_prompts(
+            prompt, negative_prompt
+        )
+
+        if not is_valid:
+            raise ValueError(f"Prompt validation failed: {error}")
+
+        # Optionally enhance prompt with quality tags
+        proc_prompt = self._prompt_validator.enhance_prompt(
+            proc_prompt,
+            add_quality_tags=True,
+            pipeline="animatediff"
+        )
+
+        return proc_prompt, proc_negative
+
+    def _stage_image(self, image: Image.Image):
+        """
+        Copy image into a pinned host buffer and start an async upload
+
+        Pinned memory lets the host-to-device copy overlap with kernel
+        launches instead of going through a pageable bounce buffer.
+
+        Args:
+            image: RGB PIL Image
+
+        Returns:
+            (1, 3, H, W) tensor in [0, 1] on self.device, or the PIL image
+            if CUDA is unavailable
+        """
+        if not torch.cuda.is_available() or not str(self.device).startswith("cuda"):
+            return image
+
+        shape = (1, 3, image.height, image.width)
+        if self._image_staging is None or self._image_staging.shape != shape:
+            self._image_staging = torch.empty(shape, dtype=self.torch_dtype, pin_memory=True)
+
+        pixels = torch.from_numpy(np.asarray(image)).permute(2, 0, 1)
+        self._image_staging[0].copy_(pixels).div_(255.0)
+        return self._image_staging.to(self.device, non_blocking=True)
+
+    def _quantize_weights(self) -> None:
+        """Quantize the UNet if requested (runs inside apply_optimizations)"""
+        if self.quantization == "fp8":
+            self._quantize_unet_fp8()
+
+    def _quantize_unet_fp8(self) -> None:
+        """
+        Store UNet Linear/Conv2d weights as float8_e4m3fn
+
+        Halves weight memory and bandwidth; matmuls still run in the compute
+        dtype. Uses torchao when installed, otherwise quantizes manually with
+        one scale per output channel (amax / FP8_E4M3_MAX), so small-magnitude
+        channels keep their precision instead of flushing to zero, and
+        dequantizes per call.
+        """
+        if not hasattr(torch, 'float8_e4m3fn'):
+            logger.warning("  ⚠️  FP8 requires PyTorch >= 2.1, skipping quantization")
+            return
+
+        unet = self.pipe.unet
+
+        if HAS_TORCHAO:
+            try:
+                quantize_(unet, float8_weight_only())
+                logger.info("  ✅ UNet weights quantized to FP8 (torchao)")
+                return
+            except Exception as e:
+                logger.warning("  ⚠️  torchao FP8 failed, using manual cast: %s", e)
+
+        quantized = 0
+        for name, module in unet.named_modules():
+            if any(skip in name for skip in self.QUANTIZATION_SKIP):
+                continue
+            if isinstance(module, torch.nn.Linear):
+                module.forward = types.MethodType(_fp8_linear_forward, module)
+            elif isinstance(module, torch.nn.Conv2d):
+                module.forward = types.MethodType(_fp8_conv2d_forward, module)
+            else:
+                continue
+
+            weight = module.weight.data.float()
+            reduce_dims = tuple(range(1, weight.dim()))
+            amax = weight.abs().amax(dim=reduce_dims, keepdim=True)
+            scale = (amax / FP8_E4M3_MAX).clamp(min=torch.finfo(torch.float32).tiny)
+            module.weight.data = (weight / scale).to(torch.float8_e4m3fn)
+            # fp32 (small scales underflow in fp16); a buffer, so offload
+            # hooks move it with the weight
+            module.register_buffer('weight_scale', scale, persistent=False)
+            quantized += 1
+
+        logger.info("  ✅ UNet weights quantized to FP8 (%s layers)", quantized)
+
+    def _aot_weight_sources(self) -> List[Path]:
+        """Base model and motion adapter (both are baked into the motion UNet)"""
+        return [self.model_path, self.motion_adapter_path]
+
+    def _aot_example_inputs(self):
+        """
+        Example UNet inputs at the default resolution and frame count
+
+        Returns:
+            Tuple of ((sample, timestep, encoder_hidden_states), shape_tag)
+        """
+        unet = self.pipe.unet
+        scale = 2 ** (len(self.pipe.vae.config.block_out_channels) - 1)
+        batch = 2  # classifier-free guidance doubles the batch
+
+        sample = torch.randn(
+            batch, unet.config.in_channels, self.DEFAULT_NUM_FRAMES,
+            self.DEFAULT_HEIGHT // scale, self.DEFAULT_WIDTH // scale,
+            device=self.device, dtype=self.torch_dtype
+        )
+        timestep = torch.tensor(999.0, device=self.device)
+        encoder_hidden_states = torch.randn(
+            batch, self.pipe.tokenizer.model_max_length, unet.config.cross_attention_dim,
+            device=self.device, dtype=self.torch_dtype
+        )
+
+        shape_tag = f"{self.DEFAULT_NUM_FRAMES}x{self.DEFAULT_WIDTH}x{self.DEFAULT_HEIGHT}"
+        return (sample, timestep, encoder_hidden_states), shape_tag
+
+    def _load_single_file_pipeline(self) -> DiffusersAnimateDiffPipeline:
+        """
+        Build an AnimateDiff pipeline from a single-file SD 1.5 checkpoint
+
+        The checkpoint's UNet, VAE and text encoder are converted in one
+        read; only small config files come from the hub cache. The SD UNet
+        is wrapped into a motion UNet by the AnimateDiff constructor.
+
+        Returns:
+            AnimateDiff pipeline using copies of the checkpoint's components
+        """
+        stat = self.model_path.stat()
+        cache_key = (
+            str(self.model_path.resolve()), stat.st_mtime_ns, stat.st_size, str(self.torch_dtype)
+        )
+
+        with _CHECKPOINT_CACHE_LOCK:
+            cached = _CHECKPOINT_CACHE.get(cache_key)
+            if cached is not None:
+                _CHECKPOINT_CACHE.move_to_end(cache_key)
+
+        if cached is not None:
+            logger.info("  ♻️  Reusing cached checkpoint components")
+        else:
+            sd_pipe = StableDiffusionPipeline.from_single_file(
+                str(self.model_path),
+                torch_dtype=self.torch_dtype,
+                load_safety_checker=False
             )
-        elif self.scheduler_type == "ddim":
-            self.pipe.scheduler = DDIMScheduler.from_config(
-                self.pipe.scheduler.config
+            cached = {
+                name: getattr(sd_pipe, name)
+                for name in ('vae', 'text_encoder', 'tokenizer', 'unet', 'scheduler')
+            }
+
+            with _CHECKPOINT_CACHE_LOCK:
+                _CHECKPOINT_CACHE[cache_key] = cached
+                while len(_CHECKPOINT_CACHE) > MAX_CACHED_CHECKPOINTS:
+                    _CHECKPOINT_CACHE.popitem(last=False)
+
+        components = {
+            name: component if name in _SHARED_CHECKPOINT_COMPONENTS else copy.deepcopy(component)
+            for name, component in cached.items()
+        }
+
+        return DiffusersAnimateDiffPipeline(
+            vae=components['vae'],
+            text_encoder=components['text_encoder'],
+            tokenizer=components['tokenizer'],
+            unet=components['unet'],
+            motion_adapter=self.motion_adapter,
+            scheduler=components['scheduler']
+        )
+
+    def _deepcache_conflict(self) -> Optional[str]:
+        """
+        Name the UNet wrapper DeepCache can't work through, if any
+
+        DeepCache patches UNet block forwards and alternates between full
+        and cached paths per step. A captured CUDA graph or an AOT package
+        never runs the patched blocks, and a whole-module torch.compile
+        recompiles or breaks its graph on that per-step Python state.
+
+        Returns:
+            Description of the conflicting wrapper, or None
+        """
+        unet = self.pipe.unet
+        if isinstance(unet, CUDAGraphUNet):
+            return "CUDA graphs"
+        if isinstance(unet, AOTCompiledUNet):
+            return "AOTInductor packages"
+        if OptimizedModule is not None and isinstance(unet, OptimizedModule):
+            return "whole-UNet torch.compile"
+        return None
+
+    def _enable_deepcache(self) -> None:
+        """Enable DeepCache feature reuse if the package is installed"""
+        if not HAS_DEEPCACHE:
+            logger.warning("  ⚠️  DeepCache not installed, skipping feature caching")
+            return
+
+        try:
+            helper = DeepCacheSDHelper(pipe=self.pipe)
+            helper.set_params(
+                cache_interval=self.DEEPCACHE_INTERVAL,
+                cache_branch_id=self.DEEPCACHE_BRANCH_ID
             )
-        else:
-            print(f"  ⚠️  Unknown scheduler type: {self.scheduler_type}, using default")
+            helper.enable()
+            self.deepcache_helper = helper
+            logger.info("  ✅ DeepCache enabled (interval=%s)", self.DEEPCACHE_INTERVAL)
+        except Exception as e:
+            logger.warning("  ⚠️  DeepCache failed: %s", e)
+
+    def unload_model(self) -> None:
+        """Disable DeepCache hooks, then unload model"""
+        if self.deepcache_helper is not None:
+            try:
+                self.deepcache_helper.disable()
+            except Exception:
+                pass
+            self.deepcache_helper = None
+
+        super().unload_model()
+
+    def _configure_scheduler(self) -> None:
+        """Configure scheduler based on type, keeping it if already matching"""
+        if self.scheduler_type not in self.SCHEDULERS:
+            logger.warning("  ⚠️  Unknown scheduler type: %s, using default", self.scheduler_type)
+            return
+
+        scheduler_class, options = self.SCHEDULERS[self.scheduler_type]
+        current = self.pipe.scheduler
+
+        if type(current) is scheduler_class and all(
+            current.config.get(key) == value for key, value in options.items()
+        ):
+            return
+
+        self.pipe.scheduler = scheduler_class.from_config(current.config, **options)
 
     def generate(
         self,
@@ -220,8 +576,10 @@ class AnimateDiffPipeline(BasePipeline):
         height: int = DEFAULT_HEIGHT,
         seed: int = -1,
         clip_skip: int = DEFAULT_CLIP_SKIP,
+        output_format: str = "pil",
+        image_data: Optional[bytes] = None,
         **kwargs
-    ) -> List[Image.Image]:
+    ) -> Union[List[Image.Image], np.ndarray]:
         """
         Generate video frames from input image with text prompt
 
@@ -237,10 +595,12 @@ class AnimateDiffPipeline(BasePipeline):
             height: Output height (must be divisible by 8, recommend 512)
             seed: Random seed (-1 for random)
             clip_skip: CLIP skip layers (1-3)
+            output_format: "pil", or "rgb"/"bgr" for one (N, H, W, 3) uint8 array
+            image_data: Contents of image_path if the caller already read it
             **kwargs: Additional parameters
 
         Returns:
-            List of PIL Image frames
+            List of PIL Image frames, or a uint8 frame array
 
         Raises:
             RuntimeError: If model not loaded
@@ -250,31 +610,18 @@ class AnimateDiffPipeline(BasePipeline):
         if not self.is_loaded:
             raise RuntimeError("Model not loaded. Call load_model() first.")
 
-        # Validate and prepare prompts
-        validator = PromptValidator()
-        is_valid, proc_prompt, proc_negative, error = validate_and_prepare_prompts(
-            prompt=prompt,
-            negative_prompt=negative_prompt,
-            pipeline="animatediff"
-        )
-
-        if not is_valid:
-            raise ValueError(f"Prompt validation failed: {error}")
+        self.check_output_format(output_format)
 
-        # Optionally enhance prompt with quality tags
-        proc_prompt = validator.enhance_prompt(
-            proc_prompt,
-            add_quality_tags=True,
-            pipeline="animatediff"
-        )
+        # Validate, prepare and enhance prompts (cached per prompt pair)
+        proc_prompt, proc_negative = self._prepare_prompt(prompt, negative_prompt)
 
-        print(f"🎬 Generating video with AnimateDiff:")
-        print(f"   Prompt: {proc_prompt}")
-        print(f"   Negative: {proc_negative}")
-        print(f"   Frames: {num_frames} @ {fps} FPS")
-        print(f"   Resolution: {width}x{height}")
-        print(f"   Guidance Scale: {guidance_scale}")
-        print(f"   Inference Steps: {num_inference_steps}")
+        logger.info("🎬 Generating video with AnimateDiff:")
+        logger.info("   Prompt: %s", proc_prompt)
+        logger.info("   Negative: %s", proc_negative)
+        logger.info("   Frames: %s @ %s FPS", num_frames, fps)
+        logger.info("   Resolution: %sx%s", width, height)
+        logger.info("   Guidance Scale: %s", guidance_scale)
+        logger.info("   Inference Steps: %s", num_inference_steps)
 
         # Check VRAM before generation
         params = {
@@ -284,9 +631,9 @@ class AnimateDiffPipeline(BasePipeline):
             'numFrames': num_frames
         }
         estimated_vram = self.estimate_vram_usage(params)
-        available_vram = self.vram_monitor.get_available_vram()
+        available_vram = self.get_vram_stats()['available_gb']
 
-        print(f"   Estimated VRAM: {estimated_vram:.2f}GB / {available_vram:.2f}GB available")
+        logger.info("   Estimated VRAM: %.2fGB / %.2fGB available", estimated_vram, available_vram)
 
         if estimated_vram > available_vram:
             raise VRAMError(
@@ -295,38 +642,39 @@ class AnimateDiffPipeline(BasePipeline):
                 f"Try reducing num_frames, resolution, or num_inference_steps."
             )
 
+        self.configure_vae_decode(estimated_vram, available_vram)
+
         # Load and preprocess image
-        image = self.load_and_preprocess_image(image_path, width, height)
+        image = self.load_image_tensor(image_path, width, height, image_data)
+        if image is None:
+            image = self._stage_image(
+                self.load_and_preprocess_image(image_path, width, height, image_data)
+            )
 
         # Set random seed if specified
-        generator = None
-        if seed >= 0:
-            generator = torch.Generator(device=self.device).manual_seed(seed)
-            print(f"   Seed: {seed}")
-        else:
-            print(f"   Seed: Random")
-
-        # Clear cache before generation
-        self.clear_cache()
+        generator = self.seed_generator(seed)
+        logger.info("   Seed: %s", seed if seed >= 0 else f"Random ({generator.initial_seed()})")
 
         try:
             # Report start
             self.report_progress(0, num_inference_steps, "Starting generation...")
 
             # Generate frames with strong text conditioning
-            output = self.pipe(
-                prompt=proc_prompt,
-                negative_prompt=proc_negative,
-                image=image,
-                num_frames=num_frames,
-                num_inference_steps=num_inference_steps,
-                guidance_scale=guidance_scale,
-                width=width,
-                height=height,
-                generator=generator,
-            )
+            with torch.inference_mode(), self.attention_context():
+                output = self.pipe(
+                    prompt=proc_prompt,
+                    negative_prompt=proc_negative,
+                    image=image,
+                    num_frames=num_frames,
+                    num_inference_steps=num_inference_steps,
+                    guidance_scale=guidance_scale,
+                    width=width,
+                    height=height,
+                    generator=generator,
+                    output_type="pt",
+                )
 
-            frames = output.frames[0]
+            frames = self.convert_frames(output.frames[0], output_format)
 
             # Report completion
             self.report_progress(
@@ -335,7 +683,7 @@ class AnimateDiffPipeline(BasePipeline):
                 "Generation complete!"
             )
 
-            print(f"✅ Generated {len(frames)} frames\n")
+            logger.info("✅ Generated %s frames\n", len(frames))
 
             return frames
 
@@ -349,7 +697,7 @@ class AnimateDiffPipeline(BasePipeline):
                 "  - Reducing batch size (if using multiple prompts)"
             )
         except Exception as e:
-            self.clear_cache()
+            self._maybe_clear_cache()
             raise RuntimeError(f"Generation failed: {e}")
 
     def get_default_params(self) -> Dict[str, Any]:
@@ -380,8 +728,22 @@ class AnimateDiffPipeline(BasePipeline):
         return "animatediff"
 
 
+def _fp8_linear_forward(self, input: torch.Tensor) -> torch.Tensor:
+    """Linear forward that dequantizes per-channel FP8 weights to the input dtype"""
+    weight = (self.weight.float() * self.weight_scale).to(input.dtype)
+    return F.linear(input, weight, self.bias)
+
+
+def _fp8_conv2d_forward(self, input: torch.Tensor) -> torch.Tensor:
+    """Conv2d forward that dequantizes per-channel FP8 weights to the input dtype"""
+    weight = (self.weight.float() * self.weight_scale).to(input.dtype)
+    return self._conv_forward(input, weight, self.bias)
+
+
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print("AnimateDiff Pipeline Test\n")
 
     # Initialize pipeline with custom model
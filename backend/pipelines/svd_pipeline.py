@@ -13,11 +13,16 @@ Features:
 Model: stabilityai/stable-video-diffusion-img2vid-xt
 """
 
+import contextlib
+import hashlib
+import inspect
 import torch
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
 from pathlib import Path
 from PIL import Image
 import numpy as np
+import logging
 
 try:
     from diffusers import StableVideoDiffusionPipeline
@@ -28,7 +33,9 @@ except ImportError:
     )
 
 from .base_pipeline import BasePipeline, ModelLoadError, VRAMError
-from utils.prompt_utils import validate_and_prepare_prompts
+from utils.video_utils import encode_video
+
+logger = logging.getLogger(__name__)
 
 
 class SVDPipeline(BasePipeline):
@@ -44,13 +51,30 @@ class SVDPipeline(BasePipeline):
     DEFAULT_DECODE_CHUNK_SIZE = 4
     DEFAULT_NUM_INFERENCE_STEPS = 25
 
+    # Specialize compiled kernels per (frames, height, width); torch.compile
+    # keeps one graph per shape, so returning to a size reuses its kernels
+    COMPILE_DYNAMIC = False
+
+    # Spatial VAE tile size in pixels (reduce to 128/64 if decode still OOMs)
+    VAE_TILE_SAMPLE_MIN_SIZE = 256
+    MIN_VAE_TILE_SAMPLE_SIZE = 64
+
+    # CLIP image embeddings kept for re-runs on the same input image
+    IMAGE_EMBEDDING_CACHE_SIZE = 8
+
     def __init__(
         self,
         model_path: str,
         device: str = "cuda",
-        torch_dtype: torch.dtype = torch.float16,
+        torch_dtype: Optional[torch.dtype] = None,
         enable_xformers: bool = True,
-        enable_cpu_offload: bool = True
+        enable_cpu_offload: bool = True,
+        enable_compile: bool = False,
+        compile_mode: Optional[str] = None,
+        enable_aot: bool = False,
+        enable_cuda_graphs: bool = False,
+        vae_cpu_decode: bool = False,
+        force_upcast_vae: bool = False
     ):
         """
         Initialize SVD pipeline
@@ -58,65 +82,107 @@ class SVDPipeline(BasePipeline):
         Args:
             model_path: Path to SVD model directory
             device: Device to run on
-            torch_dtype: Data type for model weights
+            torch_dtype: Data type for model weights (None = auto bf16/fp16)
             enable_xformers: Enable memory-efficient attention
             enable_cpu_offload: Enable CPU offloading
+            enable_compile: Compile the UNet with torch.compile
+            compile_mode: torch.compile mode (see BasePipeline)
+            enable_aot: Run the UNet from a cached AOTInductor package
+            enable_cuda_graphs: Replay UNet steps as CUDA graphs (see BasePipeline)
+            vae_cpu_decode: Fall back to decoding on the CPU if the GPU decode
+                still runs out of VRAM after retrying with smaller chunks
+            force_upcast_vae: Let diffusers upcast the VAE to fp32 around
+                encode/decode (default: False, SVD's VAE is stable in fp16)
         """
         super().__init__(
             model_path=model_path,
             device=device,
             torch_dtype=torch_dtype,
             enable_xformers=enable_xformers,
-            enable_cpu_offload=enable_cpu_offload
+            enable_cpu_offload=enable_cpu_offload,
+            enable_compile=enable_compile,
+            compile_mode=compile_mode,
+            enable_aot=enable_aot,
+            enable_cuda_graphs=enable_cuda_graphs
         )
 
-    def load_model(self) -> None:
+        # Current spatial VAE tile size (None when tiling is unsupported)
+        self.vae_tile_size: Optional[int] = None
+        self.vae_cpu_decode = vae_cpu_decode
+        self.force_upcast_vae = force_upcast_vae
+
+        # (width, height, frames, chunk, steps, tile) of the last run that fit in VRAM
+        self._last_ok_signature: Optional[Tuple] = None
+
+        # {(image hash, device, videos per prompt, cfg): image embeddings}
+        self._image_embedding_cache: "OrderedDict[Tuple, torch.Tensor]" = OrderedDict()
+        self._image_key: Optional[str] = None
+
+    def load_weights(self) -> None:
         """
-        Load SVD model into memory
+        Read the SVD model into a CPU pipeline
 
         Raises:
             ModelLoadError: If model loading fails
         """
-        if self.is_loaded:
-            print("⚠️  Model already loaded")
-            return
-
-        print(f"📦 Loading Stable Video Diffusion model from: {self.model_path}")
+        logger.info("📦 Loading Stable Video Diffusion model from: %s", self.model_path)
 
         # Check if model directory exists
         if not self.model_path.exists():
             raise ModelLoadError(f"Model directory not found: {self.model_path}")
 
-        # Check VRAM availability
-        stats = self.vram_monitor.get_vram_stats()
-        if stats['available_gb'] < 6.0:
-            raise VRAMError(
-                f"Insufficient VRAM. Need at least 6GB, have {stats['available_gb']:.2f}GB"
-            )
-
         try:
             # Load pipeline
             self.pipe = StableVideoDiffusionPipeline.from_pretrained(
                 str(self.model_path),
                 torch_dtype=self.torch_dtype,
                 variant="fp16",
+                use_safetensors=True,
+                low_cpu_mem_usage=True,  # Load shards straight into fp16 tensors
                 local_files_only=True  # Critical for offline operation
             )
 
             # CRITICAL: Disable safety checker for NSFW support
             # This is intentional for private, local use
             self.pipe.safety_checker = None
-            print("  🔓 Safety checker disabled (NSFW-capable)")
+            logger.info("  🔓 Safety checker disabled (NSFW-capable)")
+
+            self._cache_image_embeddings()
 
-            # Apply optimizations
-            self.apply_optimizations()
+            # Keep every component in half precision: an fp32 VAE doubles
+            # decode activation memory and halves tensor-core throughput
+            self._cast_to_half_precision()
 
-            self.is_loaded = True
-            print(f"✅ SVD model loaded successfully\n")
+            # Split VAE decode spatially as well as temporally (decode_chunk_size)
+            self._configure_vae_tiling(self.VAE_TILE_SAMPLE_MIN_SIZE)
 
         except Exception as e:
+            self.pipe = None
             raise ModelLoadError(f"Failed to load SVD model: {e}")
 
+    def place_on_device(self) -> None:
+        """
+        Check free VRAM, then place the pipeline and apply optimizations
+
+        Raises:
+            VRAMError: If less than 6GB of VRAM is free
+            ModelLoadError: If applying optimizations fails
+        """
+        # Check VRAM availability
+        stats = self.vram_monitor.get_vram_stats(refresh=True)
+        if stats['available_gb'] < 6.0:
+            raise VRAMError(
+                f"Insufficient VRAM. Need at least 6GB, have {stats['available_gb']:.2f}GB"
+            )
+
+        try:
+            super().place_on_device()
+        except Exception as e:
+            raise ModelLoadError(f"Failed to load SVD model: {e}")
+
+        self._last_ok_signature = None
+        logger.info("✅ SVD model loaded successfully\n")
+
     def generate(
         self,
         image_path: str,
@@ -131,8 +197,10 @@ class SVDPipeline(BasePipeline):
         width: int = DEFAULT_WIDTH,
         height: int = DEFAULT_HEIGHT,
         seed: int = -1,
+        output_format: str = "pil",
+        image_data: Optional[bytes] = None,
         **kwargs
-    ) -> List[Image.Image]:
+    ) -> Union[List[Image.Image], np.ndarray]:
         """
         Generate video frames from input image
 
@@ -149,10 +217,99 @@ class SVDPipeline(BasePipeline):
             width: Output width (must be divisible by 8)
             height: Output height (must be divisible by 8)
             seed: Random seed (-1 for random)
+            output_format: "pil", or "rgb"/"bgr" for one (N, H, W, 3) uint8 array
+            image_data: Contents of image_path if the caller already read it
             **kwargs: Additional parameters
 
         Returns:
-            List of PIL Image frames
+            List of PIL Image frames, or a uint8 frame array
+
+        Raises:
+            RuntimeError: If model not loaded
+            VRAMError: If insufficient VRAM
+        """
+        self.check_output_format(output_format)
+
+        latents, signature = self._denoise(
+            image_path=image_path,
+            prompt=prompt,
+            negative_prompt=negative_prompt,
+            num_frames=num_frames,
+            fps=fps,
+            motion_bucket_id=motion_bucket_id,
+            noise_aug_strength=noise_aug_strength,
+            decode_chunk_size=decode_chunk_size,
+            num_inference_steps=num_inference_steps,
+            width=width,
+            height=height,
+            seed=seed,
+            image_data=image_data
+        )
+
+        with self._generation_errors():
+            with torch.inference_mode():
+                # Decode separately so a decode OOM doesn't throw away the denoising
+                frames = self._decode_latents(latents, decode_chunk_size, output_format)
+
+        self._finish_generation(len(frames), num_inference_steps, signature)
+        return frames
+
+    def generate_iter(self, output_format: str = "rgb", **params) -> Iterator[np.ndarray]:
+        """
+        Generate video frames, yielding each VAE decode chunk's frames as
+        soon as they reach the host
+
+        Only one decode chunk of frames is held in host memory at a time,
+        so peak memory no longer grows with num_frames and encoding starts
+        while later chunks are still decoding.
+
+        Args:
+            output_format: "rgb" or "bgr"
+            **params: generate() parameters
+
+        Yields:
+            (H, W, 3) uint8 frame arrays
+        """
+        if output_format not in ("rgb", "bgr"):
+            raise ValueError("generate_iter() yields arrays; use output_format 'rgb' or 'bgr'")
+
+        params.setdefault('decode_chunk_size', self.DEFAULT_DECODE_CHUNK_SIZE)
+        params.setdefault('num_inference_steps', self.DEFAULT_NUM_INFERENCE_STEPS)
+        latents, signature = self._denoise(**params)
+
+        count = 0
+        with self._generation_errors():
+            for frames in self._stream_decode(latents, params['decode_chunk_size'], output_format == "bgr"):
+                count += len(frames)
+                yield from frames
+
+        self._finish_generation(count, params['num_inference_steps'], signature)
+
+    def _denoise(
+        self,
+        image_path: str,
+        prompt: str,
+        negative_prompt: Optional[str] = None,
+        num_frames: int = DEFAULT_NUM_FRAMES,
+        fps: int = DEFAULT_FPS,
+        motion_bucket_id: int = DEFAULT_MOTION_BUCKET_ID,
+        noise_aug_strength: float = DEFAULT_NOISE_AUG_STRENGTH,
+        decode_chunk_size: int = DEFAULT_DECODE_CHUNK_SIZE,
+        num_inference_steps: int = DEFAULT_NUM_INFERENCE_STEPS,
+        width: int = DEFAULT_WIDTH,
+        height: int = DEFAULT_HEIGHT,
+        seed: int = -1,
+        image_data: Optional[bytes] = None,
+        **kwargs
+    ) -> Tuple[torch.Tensor, Tuple]:
+        """
+        Validate inputs and run the denoising loop up to (undecoded) latents
+
+        Args:
+            See generate()
+
+        Returns:
+            Tuple of (latents, VRAM signature of this run)
 
         Raises:
             RuntimeError: If model not loaded
@@ -162,86 +319,101 @@ class SVDPipeline(BasePipeline):
             raise RuntimeError("Model not loaded. Call load_model() first.")
 
         # Validate and prepare prompts
-        is_valid, proc_prompt, proc_negative, error = validate_and_prepare_prompts(
-            prompt=prompt,
-            negative_prompt=negative_prompt,
-            pipeline="svd"
+        is_valid, proc_prompt, proc_negative, error = self.prepare_prompts(
+            prompt, negative_prompt
         )
 
         if not is_valid:
             raise ValueError(f"Prompt validation failed: {error}")
 
-        print(f"🎬 Generating video with SVD:")
-        print(f"   Prompt: {proc_prompt}")
-        print(f"   Frames: {num_frames} @ {fps} FPS")
-        print(f"   Resolution: {width}x{height}")
-        print(f"   Motion Bucket ID: {motion_bucket_id}")
-        print(f"   Inference Steps: {num_inference_steps}")
-
-        # Check VRAM before generation
-        params = {
-            'pipeline': 'svd',
-            'width': width,
-            'height': height,
-            'numFrames': num_frames,
-            'decodeChunkSize': decode_chunk_size
-        }
-        estimated_vram = self.estimate_vram_usage(params)
-        available_vram = self.vram_monitor.get_available_vram()
-
-        print(f"   Estimated VRAM: {estimated_vram:.2f}GB / {available_vram:.2f}GB available")
-
-        if estimated_vram > available_vram:
-            raise VRAMError(
-                f"Insufficient VRAM. Estimated {estimated_vram:.2f}GB, "
-                f"available {available_vram:.2f}GB. "
-                f"Try reducing num_frames, resolution, or decode_chunk_size."
-            )
+        logger.info("🎬 Generating video with SVD:")
+        logger.info("   Prompt: %s", proc_prompt)
+        logger.info("   Frames: %s @ %s FPS", num_frames, fps)
+        logger.info("   Resolution: %sx%s", width, height)
+        logger.info("   Motion Bucket ID: %s", motion_bucket_id)
+        logger.info("   Inference Steps: %s", num_inference_steps)
+
+        # Check VRAM before generation, unless this exact shape just succeeded
+        signature = (width, height, num_frames, decode_chunk_size, num_inference_steps, self.vae_tile_size)
+        if signature != self._last_ok_signature:
+            params = {
+                'pipeline': 'svd',
+                'width': width,
+                'height': height,
+                'numFrames': num_frames,
+                'decodeChunkSize': decode_chunk_size,
+                'vaeTileSize': self.vae_tile_size
+            }
+            estimated_vram = self.estimate_vram_usage(params)
+            available_vram = self.get_vram_stats()['available_gb']
+
+            logger.info("   Estimated VRAM: %.2fGB / %.2fGB available", estimated_vram, available_vram)
+
+            if estimated_vram > available_vram:
+                raise VRAMError(
+                    f"Insufficient VRAM. Estimated {estimated_vram:.2f}GB, "
+                    f"available {available_vram:.2f}GB. "
+                    f"Try reducing num_frames, resolution, or decode_chunk_size."
+                )
 
         # Load and preprocess image
-        image = self.load_and_preprocess_image(image_path, width, height)
+        image = self.load_and_preprocess_image(image_path, width, height, image_data)
+        self._image_key = hashlib.blake2b(image.tobytes(), digest_size=16).hexdigest()
 
         # Set random seed if specified
-        generator = None
-        if seed >= 0:
-            generator = torch.Generator(device=self.device).manual_seed(seed)
-            print(f"   Seed: {seed}")
-        else:
-            print(f"   Seed: Random")
-
-        # Clear cache before generation
-        self.clear_cache()
+        generator = self.seed_generator(seed)
+        logger.info("   Seed: %s", seed if seed >= 0 else f"Random ({generator.initial_seed()})")
+
+        # Report start
+        self.report_compile_warmup((num_frames, height, width), num_inference_steps)
+        self.report_progress(0, num_inference_steps, "Starting generation...")
+
+        # Generate latents
+        # Note: SVD has limited text conditioning, so prompt is mainly informational
+        # The model is primarily driven by the input image
+        with self._generation_errors():
+            with torch.inference_mode(), self.attention_context():
+                latents = self.pipe(
+                    image=image,
+                    num_frames=num_frames,
+                    motion_bucket_id=motion_bucket_id,
+                    noise_aug_strength=noise_aug_strength,
+                    decode_chunk_size=decode_chunk_size,
+                    num_inference_steps=num_inference_steps,
+                    generator=generator,
+                    output_type="latent",
+                    # SVD doesn't directly use text prompts, but we log it
+                ).frames
+
+        return latents, signature
+
+    def _finish_generation(self, num_frames: int, num_inference_steps: int, signature: Tuple) -> None:
+        """
+        Report completion and remember the VRAM signature that fit
 
-        try:
-            # Report start
-            self.report_progress(0, num_inference_steps, "Starting generation...")
-
-            # Generate frames
-            # Note: SVD has limited text conditioning, so prompt is mainly informational
-            # The model is primarily driven by the input image
-            frames = self.pipe(
-                image=image,
-                num_frames=num_frames,
-                motion_bucket_id=motion_bucket_id,
-                noise_aug_strength=noise_aug_strength,
-                decode_chunk_size=decode_chunk_size,
-                num_inference_steps=num_inference_steps,
-                generator=generator,
-                # SVD doesn't directly use text prompts, but we log it
-            ).frames[0]
-
-            # Report completion
-            self.report_progress(
-                num_inference_steps,
-                num_inference_steps,
-                "Generation complete!"
-            )
+        Args:
+            num_frames: Frames produced
+            num_inference_steps: Denoising steps (for the progress report)
+            signature: VRAM signature of this run
+        """
+        # Report completion
+        self.report_progress(
+            num_inference_steps,
+            num_inference_steps,
+            "Generation complete!"
+        )
 
-            print(f"✅ Generated {len(frames)} frames\n")
+        logger.info("✅ Generated %s frames\n", num_frames)
 
-            return frames
+        self._last_ok_signature = signature
 
+    @contextlib.contextmanager
+    def _generation_errors(self):
+        """Translate errors during denoising/decoding into pipeline errors"""
+        try:
+            yield
         except torch.cuda.OutOfMemoryError:
+            self._last_ok_signature = None
             self.clear_cache()
             raise VRAMError(
                 "Out of VRAM during generation. Try:\n"
@@ -251,9 +423,338 @@ class SVDPipeline(BasePipeline):
                 "  - Reducing num_inference_steps"
             )
         except Exception as e:
-            self.clear_cache()
+            self._maybe_clear_cache()
             raise RuntimeError(f"Generation failed: {e}")
 
+    def _cache_image_embeddings(self) -> None:
+        """
+        Wrap the pipeline's CLIP image encoding with a small LRU cache
+
+        Re-running the same input image with a different seed or motion
+        bucket then skips the image encoder forward pass.
+        """
+        encode_image = self.pipe._encode_image
+        self._image_embedding_cache.clear()
+
+        def cached_encode_image(image, device, num_videos_per_prompt, do_classifier_free_guidance):
+            if self._image_key is None:
+                return encode_image(image, device, num_videos_per_prompt, do_classifier_free_guidance)
+
+            key = (self._image_key, str(device), num_videos_per_prompt, do_classifier_free_guidance)
+            embeddings = self._image_embedding_cache.get(key)
+            if embeddings is not None:
+                self._image_embedding_cache.move_to_end(key)
+                logger.info("   Reusing cached image embeddings")
+                return embeddings
+
+            embeddings = encode_image(image, device, num_videos_per_prompt, do_classifier_free_guidance)
+            self._image_embedding_cache[key] = embeddings
+            while len(self._image_embedding_cache) > self.IMAGE_EMBEDDING_CACHE_SIZE:
+                self._image_embedding_cache.popitem(last=False)
+            return embeddings
+
+        self.pipe._encode_image = cached_encode_image
+
+    def unload_model(self) -> None:
+        """Unload model and drop cached image embeddings"""
+        self._image_embedding_cache.clear()
+        self._image_key = None
+        super().unload_model()
+
+    def _configure_vae_tiling(self, tile_size: int) -> None:
+        """
+        Enable spatial VAE tiling and slicing where the VAE supports them
+
+        Args:
+            tile_size: Tile size in pixels
+        """
+        vae = self.pipe.vae
+        self.vae_tile_size = None
+
+        if hasattr(vae, 'enable_slicing'):
+            vae.enable_slicing()
+
+        if not hasattr(vae, 'enable_tiling'):
+            logger.info("  VAE has no spatial tiling, relying on decode_chunk_size")
+            return
+
+        vae.enable_tiling()
+        vae.tile_sample_min_size = tile_size
+        vae.tile_latent_min_size = tile_size // 2 ** (len(vae.config.block_out_channels) - 1)
+        self.vae_tile_size = tile_size
+        logger.info("  ✅ VAE tiling enabled (%spx tiles)", tile_size)
+
+    def _decode_latents(
+        self,
+        latents: torch.Tensor,
+        decode_chunk_size: int,
+        output_format: str = "pil"
+    ) -> Union[List[Image.Image], np.ndarray]:
+        """
+        Decode latents to frames, retrying once with smaller chunks on OOM
+
+        Args:
+            latents: Denoised latents from the pipeline (batch, frames, C, H, W)
+            decode_chunk_size: Frames decoded per VAE call
+            output_format: One of OUTPUT_FORMATS
+
+        Returns:
+            List of PIL Image frames, or a uint8 frame array
+        """
+        bgr = output_format == "bgr"
+        try:
+            frames = self._decode_to_buffer(latents, decode_chunk_size, bgr)
+        except torch.cuda.OutOfMemoryError:
+            decode_chunk_size = self._shrink_vae_decode(decode_chunk_size)
+            try:
+                frames = self._decode_to_buffer(latents, decode_chunk_size, bgr)
+            except torch.cuda.OutOfMemoryError:
+                if not self.vae_cpu_decode:
+                    raise
+                self.clear_cache()
+                logger.warning("⚠️  VAE decode OOM again, decoding on CPU")
+                frames = self._decode_latents_on_cpu(latents, decode_chunk_size, bgr)
+
+        return self.host_frames_to_output(frames, output_format)
+
+    def _stream_decode(
+        self,
+        latents: torch.Tensor,
+        decode_chunk_size: int,
+        bgr: bool = False
+    ) -> Iterator[np.ndarray]:
+        """
+        Decode latents chunk by chunk, yielding each chunk's frames on the host
+
+        On OOM, decoding resumes from the failed chunk with smaller chunks
+        and tiles, then (if vae_cpu_decode) on the CPU.
+
+        Args:
+            latents: Denoised latents from the pipeline (batch, frames, C, H, W)
+            decode_chunk_size: Frames decoded per VAE call
+            bgr: Yield channels in BGR order (for OpenCV)
+
+        Yields:
+            (chunk, height, width, 3) uint8 arrays
+        """
+        total = latents.shape[0] * latents.shape[1]
+        done = 0
+        retried = False
+        while done < total:
+            try:
+                for start, frames in self._iter_decoded_chunks(latents, decode_chunk_size, bgr, done):
+                    frames = frames.cpu().numpy()
+                    done = start + len(frames)
+                    yield frames
+            except torch.cuda.OutOfMemoryError:
+                if not retried:
+                    retried = True
+                    decode_chunk_size = self._shrink_vae_decode(decode_chunk_size)
+                    continue
+                if not self.vae_cpu_decode:
+                    raise
+                self.clear_cache()
+                logger.warning("⚠️  VAE decode OOM again, decoding on CPU")
+                yield self._decode_latents_on_cpu(
+                    latents.flatten(0, 1)[done:].unsqueeze(0), decode_chunk_size, bgr
+                ).numpy()
+                return
+
+    def _shrink_vae_decode(self, decode_chunk_size: int) -> int:
+        """
+        Halve the decode chunk and VAE tile size after a decode OOM
+
+        Args:
+            decode_chunk_size: Current frames per VAE call
+
+        Returns:
+            New decode_chunk_size
+        """
+        self.clear_cache()
+        decode_chunk_size = max(1, decode_chunk_size // 2)
+        if self.vae_tile_size:
+            self._configure_vae_tiling(
+                max(self.MIN_VAE_TILE_SAMPLE_SIZE, self.vae_tile_size // 2)
+            )
+        logger.warning(
+            "⚠️  VAE decode OOM, retrying with decode_chunk_size=%s, tile=%s",
+            decode_chunk_size, self.vae_tile_size
+        )
+        return decode_chunk_size
+
+    def _decode_to_buffer(
+        self,
+        latents: torch.Tensor,
+        decode_chunk_size: int,
+        bgr: bool = False
+    ) -> torch.Tensor:
+        """
+        Decode latents chunk by chunk straight into one uint8 host buffer
+
+        Each chunk is scaled to uint8 on the device and copied into a
+        preallocated (pinned, when decoding on GPU) buffer, so the float
+        frames for the whole video are never held at once.
+
+        Args:
+            latents: Denoised latents (batch, frames, C, H, W)
+            decode_chunk_size: Frames decoded per VAE call
+            bgr: Store channels in BGR order (for OpenCV)
+
+        Returns:
+            (num_frames, height, width, 3) uint8 tensor on the host
+        """
+        total = latents.shape[0] * latents.shape[1]
+
+        output = None
+        for start, frame in self._iter_decoded_chunks(latents, decode_chunk_size, bgr):
+            if output is None:
+                output = torch.empty(
+                    (total,) + tuple(frame.shape[1:]),
+                    dtype=torch.uint8,
+                    pin_memory=frame.is_cuda
+                )
+            output[start:start + frame.shape[0]].copy_(frame, non_blocking=True)
+
+        if torch.cuda.is_available():
+            torch.cuda.current_stream().synchronize()
+
+        return output
+
+    def _iter_decoded_chunks(
+        self,
+        latents: torch.Tensor,
+        decode_chunk_size: int,
+        bgr: bool = False,
+        start: int = 0
+    ) -> Iterator[Tuple[int, torch.Tensor]]:
+        """
+        Decode latents chunk by chunk to uint8 frames on the VAE's device
+
+        Args:
+            latents: Denoised latents (batch, frames, C, H, W)
+            decode_chunk_size: Frames decoded per VAE call
+            bgr: Channels in BGR order (for OpenCV)
+            start: First frame to decode
+
+        Yields:
+            (index of the chunk's first frame, (chunk, H, W, 3) uint8 tensor)
+        """
+        vae = self.pipe.vae
+        forward = getattr(vae, '_orig_mod', vae).forward
+        accepts_num_frames = 'num_frames' in inspect.signature(forward).parameters
+
+        with torch.inference_mode():
+            latents = latents.flatten(0, 1).to(vae.dtype) / vae.config.scaling_factor
+
+        while start < latents.shape[0]:
+            # Inference mode per chunk, not across the yield, so it never
+            # leaks into the consumer's code
+            with torch.inference_mode():
+                # Match the channels_last VAE weights so conv_in needs no relayout
+                chunk = latents[start:start + decode_chunk_size].contiguous(
+                    memory_format=torch.channels_last
+                )
+                decode_kwargs = {'num_frames': chunk.shape[0]} if accepts_num_frames else {}
+                frame = vae.decode(chunk, **decode_kwargs).sample
+
+                # fp16 VAE overflow shows up as NaN or all-black frames
+                if start == 0 and vae.dtype == torch.float16 and self._is_black(frame):
+                    fallback = torch.bfloat16 if self.torch_dtype == torch.bfloat16 or (
+                        torch.cuda.is_available() and torch.cuda.is_bf16_supported()
+                    ) else torch.float32
+                    logger.warning("⚠️  fp16 VAE produced black frames, re-decoding in %s", fallback)
+                    vae.to(dtype=fallback)
+                    latents = latents.to(fallback)
+                    continue
+
+                frame = (frame / 2 + 0.5).clamp(0, 1).mul(255).round().to(torch.uint8)
+                frame = frame.permute(0, 2, 3, 1)
+                if bgr:
+                    frame = frame.flip(-1)
+
+            yield start, frame
+            start += chunk.shape[0]
+
+    def _cast_to_half_precision(self) -> None:
+        """Cast UNet, VAE and image encoder to the pipeline dtype"""
+        for name in ('unet', 'vae', 'image_encoder'):
+            module = getattr(self.pipe, name, None)
+            if module is not None:
+                module.to(dtype=self.torch_dtype)
+
+        if 'force_upcast' in self.pipe.vae.config:
+            self.pipe.vae.register_to_config(force_upcast=self.force_upcast_vae)
+
+    @staticmethod
+    def _is_black(frames: torch.Tensor) -> bool:
+        """
+        Check whether the first decoded frame is NaN or black
+
+        Args:
+            frames: Decoded frames (N, 3, H, W) in [-1, 1]
+
+        Returns:
+            True if the first frame is unusable
+        """
+        first = frames[0]
+        return not torch.isfinite(first).all() or first.max().item() <= -0.99
+
+    def _decode_latents_on_cpu(
+        self,
+        latents: torch.Tensor,
+        decode_chunk_size: int,
+        bgr: bool = False
+    ) -> torch.Tensor:
+        """
+        Decode latents with the VAE temporarily moved to the CPU in fp32
+
+        Args:
+            latents: Denoised latents from the pipeline
+            decode_chunk_size: Frames decoded per VAE call
+            bgr: Store channels in BGR order (for OpenCV)
+
+        Returns:
+            (num_frames, height, width, 3) uint8 tensor
+        """
+        vae = self.pipe.vae
+
+        # Offload hooks would move the VAE straight back to the GPU
+        if self.enable_cpu_offload:
+            from accelerate.hooks import remove_hook_from_module
+            remove_hook_from_module(vae, recurse=True)
+
+        vae.to("cpu", dtype=torch.float32)
+        try:
+            return self._decode_to_buffer(latents.to("cpu", torch.float32), decode_chunk_size, bgr)
+        finally:
+            vae.to(dtype=self.torch_dtype)
+            if self.enable_cpu_offload:
+                self._enable_cpu_offload(log=False)
+            else:
+                vae.to(self.device)
+            self.vram_monitor.invalidate()
+
+    def encode_to_video(
+        self,
+        frames: Union[List[Image.Image], torch.Tensor],
+        output_path: str,
+        fps: int = DEFAULT_FPS
+    ) -> str:
+        """
+        Encode generated frames to an H.264 MP4 (NVENC when available)
+
+        Args:
+            frames: Frames from generate(), or a (N, H, W, 3) uint8 tensor
+            output_path: Output video path
+            fps: Frames per second
+
+        Returns:
+            Name of the encoder used
+        """
+        codec = encode_video(frames, output_path, fps)
+        logger.info("🎞️  Encoded %s frames with %s: %s", len(frames), codec, output_path)
+        return codec
+
     def get_default_params(self) -> Dict[str, Any]:
         """
         Get default generation parameters
@@ -285,6 +786,8 @@ class SVDPipeline(BasePipeline):
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print("SVD Pipeline Test\n")
 
     # Initialize pipeline
@@ -336,4 +839,5 @@ if __name__ == "__main__":
     })
 
     print("\nPipeline ready for generation!")
-    print("Call pipeline.generate(**params) to generate video frames")
+    print("Call pipeline.generate(**params) to generate video frames,")
+    print("then pipeline.encode_to_video(frames, 'output.mp4', fps) to encode them (NVENC when available)")
@@ -0,0 +1,378 @@
+"""
+Model Discovery
+
+Filesystem scan of the models directory for SVD, AnimateDiff and custom
+.safetensors models.
+
+Kept free of torch/diffusers imports so lightweight callers (e.g.
+generate.py --list-models) can list models without paying their import cost.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from pathlib import Path
+import json
+import logging
+import os
+
+# orjson is optional: faster load/save of the discovery cache
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Concurrent directory walks during discovery (I/O-latency bound, not CPU)
+DISCOVERY_WORKERS = 8
+
+# Files whose size/mtime are part of the discovery cache signature
+WEIGHT_SUFFIXES = (".safetensors", ".bin")
+
+# Discovery results, keyed by models directory (outside the models tree so
+# writing it never changes the mtimes it is validated against)
+CACHE_FILE = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "img-vid-local" / "model_cache.json"
+
+
+class ModelInfo:
+    """Information about a discovered model"""
+
+    __slots__ = ('name', 'path', 'model_type', 'description', 'size_mb', 'metadata')
+
+    def __init__(
+        self,
+        name: str,
+        path: Path,
+        model_type: str,
+        description: str = "",
+        size_mb: float = 0.0,
+        metadata: Dict[str, Any] = None
+    ):
+        """
+        Initialize model info
+
+        Args:
+            name: Model name
+            path: Path to model
+            model_type: Type ("svd", "animatediff", "sd15")
+            description: Human-readable description
+            size_mb: Model size in MB
+            metadata: Additional metadata
+        """
+        self.name = name
+        self.path = path
+        self.model_type = model_type
+        self.description = description
+        self.size_mb = size_mb
+        self.metadata = metadata or {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return {
+            'name': self.name,
+            'path': str(self.path),
+            'type': self.model_type,
+            'description': self.description,
+            'size_mb': self.size_mb,
+            'metadata': self.metadata
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ModelInfo":
+        """Create from a to_dict() dictionary"""
+        return cls(
+            name=data['name'],
+            path=Path(data['path']),
+            model_type=data['type'],
+            description=data.get('description', ""),
+            size_mb=data.get('size_mb', 0.0),
+            metadata=data.get('metadata')
+        )
+
+
+def discover_models(models_dir: Path, use_cache: bool = True) -> Dict[str, ModelInfo]:
+    """
+    Discover available models in models directory
+
+    Only touches the filesystem; does not import torch or diffusers. The
+    result is cached on disk and reused while the directory mtimes and the
+    size/mtime of every weight file are unchanged, which skips rebuilding
+    the model list and its size totals.
+
+    Args:
+        models_dir: Base directory for models
+        use_cache: Reuse the on-disk discovery cache when still valid
+
+    Returns:
+        Dictionary of {model_name: ModelInfo}
+    """
+    logger.info("🔍 Discovering models in: %s\n", models_dir)
+
+    if not models_dir.exists():
+        logger.warning("⚠️  Models directory not found: %s", models_dir)
+        logger.info("   Run download_models.py to download models\n")
+        return {}
+
+    signature = _directory_signature(models_dir)
+
+    if use_cache:
+        cached = _load_cached_models(models_dir, signature)
+        if cached is not None:
+            logger.info("📦 Using cached model list (%s models)\n", len(cached))
+            return cached
+
+    available_models = _scan_models(models_dir)
+    _save_cached_models(models_dir, signature, available_models)
+
+    return available_models
+
+
+def _scan_models(models_dir: Path) -> Dict[str, ModelInfo]:
+    """
+    Walk the models directory and collect model info
+
+    Directory walks run on a thread pool so their filesystem round trips
+    overlap (each one costs up to a millisecond on WSL's /mnt/ drives).
+
+    Args:
+        models_dir: Base directory for models
+
+    Returns:
+        Dictionary of {model_name: ModelInfo}
+    """
+    available_models: Dict[str, ModelInfo] = {}
+
+    svd_path = models_dir / "svd-xt"
+    animatediff_path = models_dir / "animatediff"
+    realistic_vision_dir = models_dir / "realistic-vision"
+    custom_dirs = [
+        Path(entry.path) for entry in os.scandir(models_dir)
+        if entry.is_dir() and entry.name not in ['svd-xt', 'animatediff', 'realistic-vision']
+    ]
+    has_svd = svd_path.is_dir()
+    has_adapter = animatediff_path.is_dir()
+
+    with ThreadPoolExecutor(max_workers=DISCOVERY_WORKERS) as executor:
+        svd_size = executor.submit(get_directory_size, svd_path) if has_svd else None
+        adapter_size = executor.submit(get_directory_size, animatediff_path) if has_adapter else None
+        base_models = executor.submit(_list_safetensors, realistic_vision_dir) \
+            if has_adapter and realistic_vision_dir.is_dir() else None
+        custom_models = [executor.submit(_list_safetensors, d) for d in custom_dirs]
+
+        # Look for SVD model
+        if svd_size is not None:
+            size_mb = svd_size.result()
+            available_models['svd-xt'] = ModelInfo(
+                name='svd-xt',
+                path=svd_path,
+                model_type='svd',
+                description='Stable Video Diffusion XT - Fast image-to-video',
+                size_mb=size_mb,
+                metadata={'resolution': '1024x576', 'max_frames': 60}
+            )
+            logger.info("  ✅ Found SVD-XT model (%.0f MB)", size_mb)
+
+        # Look for AnimateDiff motion adapter
+        if adapter_size is not None:
+            logger.info("  ✅ Found AnimateDiff motion adapter (%.0f MB)", adapter_size.result())
+
+        # Look for SD 1.5 base models in realistic-vision directory
+        if base_models is not None:
+            for model_file, size_mb in base_models.result():
+                model_name = f"animatediff-{model_file.stem}"
+
+                available_models[model_name] = ModelInfo(
+                    name=model_name,
+                    path=model_file,
+                    model_type='animatediff',
+                    description=f'AnimateDiff with {model_file.stem}',
+                    size_mb=size_mb,
+                    metadata={
+                        'base_model': model_file.stem,
+                        'motion_adapter': str(animatediff_path),
+                        'resolution': '512x512',
+                        'max_frames': 64
+                    }
+                )
+                logger.info("  ✅ Found AnimateDiff model: %s (%.0f MB)", model_file.name, size_mb)
+
+        # Look for other custom models (usable only with the AnimateDiff adapter)
+        for listing in custom_models:
+            for model_file, size_mb in listing.result():
+                if not has_adapter:
+                    continue
+
+                model_name = f"custom-{model_file.stem}"
+                available_models[model_name] = ModelInfo(
+                    name=model_name,
+                    path=model_file,
+                    model_type='animatediff',
+                    description=f'Custom model: {model_file.stem}',
+                    size_mb=size_mb,
+                    metadata={
+                        'base_model': model_file.stem,
+                        'motion_adapter': str(animatediff_path),
+                        'source': 'custom'
+                    }
+                )
+                logger.info("  ✅ Found custom model: %s (%.0f MB)", model_file.name, size_mb)
+
+    if not available_models:
+        logger.warning("  ⚠️  No models found")
+        logger.info("  Run download_models.py to download models\n")
+    else:
+        logger.info("\n📦 Total models discovered: %s\n", len(available_models))
+
+    return available_models
+
+
+def _list_safetensors(directory: Path) -> List[Tuple[Path, float]]:
+    """
+    List .safetensors files directly inside a directory
+
+    Args:
+        directory: Directory path
+
+    Returns:
+        Sorted list of (path, size_mb) tuples
+    """
+    with os.scandir(directory) as entries:
+        files = [
+            (Path(entry.path), entry.stat().st_size / (1024 * 1024))
+            for entry in entries
+            if entry.name.endswith(".safetensors") and entry.is_file()
+        ]
+    return sorted(files)
+
+
+def get_directory_size(directory: Path) -> float:
+    """
+    Get total size of directory in MB
+
+    Args:
+        directory: Directory path
+
+    Returns:
+        Size in MB
+    """
+    return _scandir_size(str(directory)) / (1024 * 1024)
+
+
+def _scandir_size(directory: str) -> int:
+    """Sum file sizes under a directory in bytes using os.scandir"""
+    total_size = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                total_size += _scandir_size(entry.path)
+            elif entry.is_file():
+                total_size += entry.stat().st_size
+    return total_size
+
+
+def _directory_signature(models_dir: Path) -> List[List[Any]]:
+    """
+    Fingerprint the models directory for cache validation
+
+    Directory mtimes only change when a direct entry is added or removed,
+    so the size and mtime of every weight file (at any depth, e.g.
+    svd-xt/unet/) are included too: files finishing a download or a
+    checkpoint overwritten in place invalidate the cached sizes.
+
+    Args:
+        models_dir: Base directory for models
+
+    Returns:
+        Sorted list of [name, mtime_ns] and [relative_path, size, mtime_ns] entries
+    """
+    signature = [[".", models_dir.stat().st_mtime_ns]]
+    with os.scandir(models_dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                signature.append([entry.name, entry.stat().st_mtime_ns])
+    _add_weight_file_stats(str(models_dir), "", signature)
+    signature.sort()
+    return signature
+
+
+def _add_weight_file_stats(directory: str, prefix: str, signature: List[List[Any]]) -> None:
+    """Append [relative_path, size, mtime_ns] for weight files under a directory"""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                _add_weight_file_stats(entry.path, f"{prefix}{entry.name}/", signature)
+            elif entry.name.endswith(WEIGHT_SUFFIXES) and entry.is_file():
+                stat = entry.stat()
+                signature.append([f"{prefix}{entry.name}", stat.st_size, stat.st_mtime_ns])
+
+
+def _load_cached_models(
+    models_dir: Path,
+    signature: List[List[Any]]
+) -> Optional[Dict[str, ModelInfo]]:
+    """
+    Load cached discovery results if they match the directory signature
+
+    Args:
+        models_dir: Base directory for models
+        signature: Current directory signature
+
+    Returns:
+        Dictionary of {model_name: ModelInfo}, or None if missing or stale
+    """
+    try:
+        entry = _read_cache_file().get(str(models_dir.resolve()))
+    except (OSError, ValueError, AttributeError):
+        return None
+
+    if not entry or entry.get('signature') != signature:
+        return None
+
+    try:
+        return {name: ModelInfo.from_dict(data) for name, data in entry['models'].items()}
+    except (KeyError, TypeError):
+        return None
+
+
+def _read_cache_file() -> Any:
+    """Read and parse the cache file, using orjson when available"""
+    with open(CACHE_FILE, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _save_cached_models(
+    models_dir: Path,
+    signature: List[List[Any]],
+    models: Dict[str, ModelInfo]
+) -> None:
+    """
+    Store discovery results in the cache file
+
+    Failures are ignored; the cache is only an optimization.
+
+    Args:
+        models_dir: Base directory for models
+        signature: Directory signature the results were computed for
+        models: Discovered models
+    """
+    try:
+        cache = _read_cache_file()
+        if not isinstance(cache, dict):
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+
+    cache[str(models_dir.resolve())] = {
+        'signature': signature,
+        'models': {name: info.to_dict() for name, info in models.items()}
+    }
+
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = CACHE_FILE.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(cache) if orjson is not None else json.dumps(cache).encode('utf-8'))
+        os.replace(tmp_path, CACHE_FILE)
+    except OSError as e:
+        logger.debug("Could not write model cache: %s", e)
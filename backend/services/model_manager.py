@@ -18,62 +18,87 @@ Supported Models:
 """
 
 import torch
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 import json
+import logging
+import threading
+import time
 
 from pipelines.svd_pipeline import SVDPipeline
-from pipelines.animatediff_pipeline import AnimateDiffPipeline
+from pipelines.animatediff_pipeline import AnimateDiffPipeline, clear_checkpoint_cache
 from pipelines.base_pipeline import BasePipeline, ModelLoadError
+from services.model_discovery import ModelInfo, discover_models
 from utils.path_utils import normalize_path, validate_path_exists
 from utils.vram_utils import VRAMMonitor
 
+logger = logging.getLogger(__name__)
 
-class ModelInfo:
-    """Information about a discovered model"""
 
-    def __init__(
-        self,
-        name: str,
-        path: Path,
-        model_type: str,
-        description: str = "",
-        size_mb: float = 0.0,
-        metadata: Dict[str, Any] = None
-    ):
+class _PipelineLRU:
+    """Least-recently-used cache of loaded pipelines"""
+
+    def __init__(self):
+        # {model_name: (pipeline, last_used_ts, estimated_vram_gb)}
+        self._entries: "OrderedDict[str, Tuple[BasePipeline, float, float]]" = OrderedDict()
+
+    def __contains__(self, model_name: str) -> bool:
+        return model_name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, model_name: str) -> Optional[BasePipeline]:
+        """Get a pipeline and mark it most recently used"""
+        entry = self._entries.get(model_name)
+        if entry is None:
+            return None
+        self._entries[model_name] = (entry[0], time.monotonic(), entry[2])
+        self._entries.move_to_end(model_name)
+        return entry[0]
+
+    def put(self, model_name: str, pipeline: BasePipeline, estimated_vram_gb: float) -> None:
+        """Add a pipeline as most recently used"""
+        self._entries[model_name] = (pipeline, time.monotonic(), estimated_vram_gb)
+        self._entries.move_to_end(model_name)
+
+    def pop(self, model_name: str) -> Optional[BasePipeline]:
+        """Remove a pipeline from the cache"""
+        entry = self._entries.pop(model_name, None)
+        return entry[0] if entry else None
+
+    def pop_oldest(self, exclude: Optional[str] = None) -> Optional[Tuple[str, BasePipeline]]:
         """
-        Initialize model info
+        Remove the least recently used pipeline
 
         Args:
-            name: Model name
-            path: Path to model
-            model_type: Type ("svd", "animatediff", "sd15")
-            description: Human-readable description
-            size_mb: Model size in MB
-            metadata: Additional metadata
+            exclude: Model name that must not be evicted
+
+        Returns:
+            (model_name, pipeline) or None if nothing can be evicted
         """
-        self.name = name
-        self.path = path
-        self.model_type = model_type
-        self.description = description
-        self.size_mb = size_mb
-        self.metadata = metadata or {}
-
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return {
-            'name': self.name,
-            'path': str(self.path),
-            'type': self.model_type,
-            'description': self.description,
-            'size_mb': self.size_mb,
-            'metadata': self.metadata
-        }
+        for model_name in self._entries:
+            if model_name != exclude:
+                return model_name, self.pop(model_name)
+        return None
+
+    def values(self) -> List[BasePipeline]:
+        """Get all cached pipelines"""
+        return [entry[0] for entry in self._entries.values()]
+
+    def clear(self) -> None:
+        """Remove all pipelines"""
+        self._entries.clear()
 
 
 class ModelManager:
     """Manages AI models and pipelines"""
 
+    # Free VRAM to keep on top of a model's estimate when admitting it
+    CACHE_VRAM_HEADROOM_GB = 1.0
+
     def __init__(
         self,
         models_dir: str = "/mnt/d/VideoGenerator/models",
@@ -92,8 +117,14 @@ class ModelManager:
         self.device = device
         self.enable_caching = enable_caching
 
-        # Pipeline cache: {model_name: pipeline}
-        self.pipeline_cache: Dict[str, BasePipeline] = {}
+        # Pipeline cache, evicted least-recently-used first under VRAM pressure
+        self.pipeline_cache = _PipelineLRU()
+
+        # Pipelines whose weights are being read in the background:
+        # {model_name: (pipeline kwargs, future)}
+        self._prefetching: Dict[str, Tuple[Dict[str, Any], Future]] = {}
+        self._prefetch_executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
 
         # Current active pipeline
         self.current_pipeline: Optional[BasePipeline] = None
@@ -110,99 +141,7 @@ class ModelManager:
 
     def _discover_models(self) -> None:
         """Discover available models in models directory"""
-        print(f"🔍 Discovering models in: {self.models_dir}\n")
-
-        if not self.models_dir.exists():
-            print(f"⚠️  Models directory not found: {self.models_dir}")
-            print(f"   Run download_models.py to download models\n")
-            return
-
-        # Look for SVD model
-        svd_path = self.models_dir / "svd-xt"
-        if svd_path.exists() and svd_path.is_dir():
-            size_mb = self._get_directory_size(svd_path)
-            self.available_models['svd-xt'] = ModelInfo(
-                name='svd-xt',
-                path=svd_path,
-                model_type='svd',
-                description='Stable Video Diffusion XT - Fast image-to-video',
-                size_mb=size_mb,
-                metadata={'resolution': '1024x576', 'max_frames': 60}
-            )
-            print(f"  ✅ Found SVD-XT model ({size_mb:.0f} MB)")
-
-        # Look for AnimateDiff motion adapter
-        animatediff_path = self.models_dir / "animatediff"
-        if animatediff_path.exists() and animatediff_path.is_dir():
-            size_mb = self._get_directory_size(animatediff_path)
-            print(f"  ✅ Found AnimateDiff motion adapter ({size_mb:.0f} MB)")
-
-            # Look for SD 1.5 base models in realistic-vision directory
-            realistic_vision_dir = self.models_dir / "realistic-vision"
-            if realistic_vision_dir.exists():
-                for model_file in realistic_vision_dir.glob("*.safetensors"):
-                    model_name = f"animatediff-{model_file.stem}"
-                    size_mb = model_file.stat().st_size / (1024 * 1024)
-
-                    self.available_models[model_name] = ModelInfo(
-                        name=model_name,
-                        path=model_file,
-                        model_type='animatediff',
-                        description=f'AnimateDiff with {model_file.stem}',
-                        size_mb=size_mb,
-                        metadata={
-                            'base_model': model_file.stem,
-                            'motion_adapter': str(animatediff_path),
-                            'resolution': '512x512',
-                            'max_frames': 64
-                        }
-                    )
-                    print(f"  ✅ Found AnimateDiff model: {model_file.name} ({size_mb:.0f} MB)")
-
-        # Look for other custom models
-        custom_dirs = [d for d in self.models_dir.iterdir() if d.is_dir() and d.name not in ['svd-xt', 'animatediff', 'realistic-vision']]
-        for custom_dir in custom_dirs:
-            for model_file in custom_dir.glob("*.safetensors"):
-                model_name = f"custom-{model_file.stem}"
-                size_mb = model_file.stat().st_size / (1024 * 1024)
-
-                # Check if AnimateDiff adapter exists
-                if animatediff_path.exists():
-                    self.available_models[model_name] = ModelInfo(
-                        name=model_name,
-                        path=model_file,
-                        model_type='animatediff',
-                        description=f'Custom model: {model_file.stem}',
-                        size_mb=size_mb,
-                        metadata={
-                            'base_model': model_file.stem,
-                            'motion_adapter': str(animatediff_path),
-                            'source': 'custom'
-                        }
-                    )
-                    print(f"  ✅ Found custom model: {model_file.name} ({size_mb:.0f} MB)")
-
-        if not self.available_models:
-            print("  ⚠️  No models found")
-            print("  Run download_models.py to download models\n")
-        else:
-            print(f"\n📦 Total models discovered: {len(self.available_models)}\n")
-
-    def _get_directory_size(self, directory: Path) -> float:
-        """
-        Get total size of directory in MB
-
-        Args:
-            directory: Directory path
-
-        Returns:
-            Size in MB
-        """
-        total_size = 0
-        for file in directory.rglob("*"):
-            if file.is_file():
-                total_size += file.stat().st_size
-        return total_size / (1024 * 1024)
+        self.available_models = discover_models(self.models_dir)
 
     def list_models(self) -> List[Dict[str, Any]]:
         """
@@ -249,22 +188,152 @@ class ModelManager:
                 f"Model '{model_name}' not found. Available models: {list(self.available_models.keys())}"
             )
 
+        # Promote a background prefetch, waiting for it to finish if needed
+        with self._lock:
+            prefetch = self._prefetching.pop(model_name, None)
+        pipeline = None
+        if prefetch is not None:
+            prefetch_kwargs, future = prefetch
+            if prefetch_kwargs != kwargs:
+                future.cancel()
+                logger.info("📦 Discarding prefetched %s (built with different arguments)", model_name)
+            else:
+                try:
+                    pipeline = future.result()
+                    logger.info("📦 Using prefetched pipeline: %s", model_name)
+                except Exception as e:
+                    logger.warning("⚠️  Prefetch of %s failed, loading directly: %s", model_name, e)
+
         # Check cache
-        if self.enable_caching and model_name in self.pipeline_cache:
-            print(f"📦 Using cached pipeline: {model_name}")
-            pipeline = self.pipeline_cache[model_name]
+        if pipeline is None and self.enable_caching and model_name in self.pipeline_cache:
+            logger.info("📦 Using cached pipeline: %s", model_name)
+            pipeline = self.pipeline_cache.get(model_name)
             self.current_pipeline = pipeline
             self.current_model_name = model_name
             return pipeline
 
+        # Free VRAM for the new pipeline (a prefetched one is still on the CPU)
+        self._make_room(model_name)
+
+        # Load new pipeline, then place it (VRAM checks and offload choice
+        # happen here, after room was made)
+        if pipeline is None:
+            pipeline = self._build_pipeline(model_name, **kwargs)
+        pipeline.load_model()
+
+        # Cache if enabled
+        if self.enable_caching:
+            self.pipeline_cache.put(model_name, pipeline, self._estimate_vram_gb(model_name))
+
+        # Set as current
+        self.current_pipeline = pipeline
+        self.current_model_name = model_name
+
+        return pipeline
+
+    def _estimate_vram_gb(self, model_name: str) -> float:
+        """
+        Estimate the VRAM a model's weights need from their size on disk
+
+        Args:
+            model_name: Model name
+
+        Returns:
+            Estimated VRAM in GB
+        """
+        return self.available_models[model_name].size_mb / 1024
+
+    def _make_room(self, model_name: str) -> None:
+        """
+        Unload pipelines until the model's estimated VRAM fits
+
+        Cached pipelines are evicted least-recently-used first. The current
+        pipeline is only unloaded as a last resort, or always when caching
+        is disabled.
+
+        Args:
+            model_name: Model about to be loaded
+        """
+        switching = self.current_pipeline is not None and self.current_model_name != model_name
+
+        if self.enable_caching and torch.cuda.is_available():
+            needed = self._estimate_vram_gb(model_name) + self.CACHE_VRAM_HEADROOM_GB
+
+            while self.vram_monitor.get_vram_stats(refresh=True)['available_gb'] < needed:
+                evicted = self.pipeline_cache.pop_oldest(exclude=self.current_model_name)
+                if evicted is None:
+                    break
+                logger.info("🗑️  Evicting cached pipeline: %s", evicted[0])
+                evicted[1].unload_model()
+
+            if self.vram_monitor.get_vram_stats(refresh=True)['available_gb'] >= needed:
+                switching = False
+
         # Unload current pipeline if different
-        if self.current_pipeline and self.current_model_name != model_name:
-            print(f"🗑️  Unloading current pipeline: {self.current_model_name}")
+        if switching:
+            logger.info("🗑️  Unloading current pipeline: %s", self.current_model_name)
+            self.pipeline_cache.pop(self.current_model_name)
             self.current_pipeline.unload_model()
+            self.current_pipeline = None
+            self.current_model_name = None
+
+    def prefetch(self, model_name: str, **kwargs) -> bool:
+        """
+        Start reading a pipeline's weights in the background
+
+        Reading weights from disk dominates switch time, so the next model
+        is read into CPU memory on a worker thread while the current one
+        keeps generating. The next load_pipeline() call for the model with
+        the same arguments picks it up and places it on the GPU; device
+        placement, offload and VRAM checks wait until then, when room has
+        been made.
+
+        Args:
+            model_name: Model name
+            **kwargs: Additional pipeline arguments
+
+        Returns:
+            True if a background load was started
+        """
+        if model_name not in self.available_models:
+            raise ModelLoadError(
+                f"Model '{model_name}' not found. Available models: {list(self.available_models.keys())}"
+            )
 
-        # Load new pipeline
+        with self._lock:
+            if model_name in self.pipeline_cache or model_name == self.current_model_name:
+                return False
+
+            previous = self._prefetching.get(model_name)
+            if previous is not None:
+                if previous[0] == kwargs:
+                    return False
+                previous[1].cancel()
+
+            if self._prefetch_executor is None:
+                self._prefetch_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="model-prefetch"
+                )
+            self._prefetching[model_name] = (kwargs, self._prefetch_executor.submit(
+                self._build_pipeline, model_name, **kwargs
+            ))
+
+        logger.info("📦 Prefetching pipeline: %s", model_name)
+        return True
+
+    def _build_pipeline(self, model_name: str, **kwargs) -> BasePipeline:
+        """
+        Construct the pipeline for a model and read its weights on the CPU
+
+        Args:
+            model_name: Model name
+            **kwargs: Additional pipeline arguments
+
+        Returns:
+            Pipeline with weights loaded, not yet placed (call load_model())
+        """
         model_info = self.available_models[model_name]
-        print(f"📦 Loading pipeline: {model_name} ({model_info.model_type})")
+        logger.info("📦 Loading pipeline: %s (%s)", model_name, model_info.model_type)
 
         if model_info.model_type == 'svd':
             pipeline = self._load_svd_pipeline(model_info, **kwargs)
@@ -273,16 +342,8 @@ class ModelManager:
         else:
             raise ModelLoadError(f"Unsupported model type: {model_info.model_type}")
 
-        # Load model
-        pipeline.load_model()
-
-        # Cache if enabled
-        if self.enable_caching:
-            self.pipeline_cache[model_name] = pipeline
-
-        # Set as current
-        self.current_pipeline = pipeline
-        self.current_model_name = model_name
+        # Read weights only; load_pipeline() places them
+        pipeline.load_weights()
 
         return pipeline
 
@@ -344,16 +405,27 @@ class ModelManager:
 
     def unload_all(self) -> None:
         """Unload all pipelines and clear cache"""
-        print("🗑️  Unloading all pipelines...")
-
-        for model_name, pipeline in self.pipeline_cache.items():
+        logger.info("🗑️  Unloading all pipelines...")
+
+        with self._lock:
+            prefetching = [future for _, future in self._prefetching.values()]
+            self._prefetching.clear()
+        for future in prefetching:
+            if not future.cancel():
+                try:
+                    future.result().unload_model()
+                except Exception:
+                    pass
+
+        for pipeline in self.pipeline_cache.values():
             pipeline.unload_model()
 
         self.pipeline_cache.clear()
         self.current_pipeline = None
         self.current_model_name = None
+        clear_checkpoint_cache()
 
-        print("✅ All pipelines unloaded\n")
+        logger.info("✅ All pipelines unloaded\n")
 
     def get_vram_stats(self) -> Dict[str, float]:
         """
@@ -367,6 +439,8 @@ class ModelManager:
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print("Model Manager Test\n")
 
     # Initialize manager
@@ -23,16 +23,130 @@ Usage:
 
 import cv2
 import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, Callable, List
 from pathlib import Path
 from PIL import Image
+import hashlib
+import itertools
+import os
+import shutil
 import time
 import json
+import logging
 
 from services.model_manager import ModelManager
 from pipelines.base_pipeline import BasePipeline, PipelineError, VRAMError
 from utils.path_utils import ensure_path_exists, normalize_path
-from utils.prompt_utils import validate_and_prepare_prompts
+from utils.prompt_utils import is_blank, validate_and_prepare_prompts
+from utils.video_utils import (
+    FFMPEG_BINARY, HAS_PYAV, EncoderUnavailableError, Frames, encode_video, encode_video_ffmpeg
+)
+
+logger = logging.getLogger(__name__)
+
+# Numba is optional: compiled in-place RGB -> BGR swap for video export
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# orjson is optional: faster result serialization
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# BLAKE3 is optional (SIMD-accelerated); result-cache keys fall back to BLAKE2
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# Threads converting frames ahead of the (serial) video writer
+EXPORT_WORKERS = 4
+
+
+if HAS_NUMBA:
+    # nogil so export worker threads convert frames concurrently
+    @njit(nogil=True, cache=True)
+    def _swap_red_blue(frame):
+        """Swap the R and B channels of an (H, W, 3) uint8 frame in place"""
+        for y in range(frame.shape[0]):
+            for x in range(frame.shape[1]):
+                red = frame[y, x, 0]
+                frame[y, x, 0] = frame[y, x, 2]
+                frame[y, x, 2] = red
+
+
+def _frame_to_bgr(frame: Image.Image, out: np.ndarray) -> np.ndarray:
+    """
+    Convert a PIL RGB frame to BGR into a reusable buffer
+
+    Args:
+        frame: RGB PIL Image
+        out: (H, W, 3) uint8 destination buffer
+
+    Returns:
+        out
+    """
+    if HAS_NUMBA:
+        out[...] = np.asarray(frame)
+        _swap_red_blue(out)
+    else:
+        cv2.cvtColor(np.asarray(frame), cv2.COLOR_RGB2BGR, dst=out)
+    return out
+
+
+def _open_cv2_writer(output_path: str, fps: int, size: tuple) -> cv2.VideoWriter:
+    """
+    Open an OpenCV video writer, preferring hardware H.264
+
+    Asks the FFmpeg backend for H.264 with any hardware acceleration
+    (NVENC/QSV/VAAPI); falls back to CPU MPEG-4 when this OpenCV build has
+    no H.264 encoder or no acceleration support.
+
+    Args:
+        output_path: Output video path
+        fps: Frames per second
+        size: (width, height)
+
+    Returns:
+        Opened cv2.VideoWriter
+    """
+    if hasattr(cv2, 'VIDEOWRITER_PROP_HW_ACCELERATION'):
+        writer = cv2.VideoWriter(
+            output_path,
+            cv2.CAP_FFMPEG,
+            cv2.VideoWriter_fourcc(*'avc1'),
+            fps,
+            size,
+            [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+        )
+        if writer.isOpened():
+            logger.info("🎞️  Encoding H.264 with OpenCV")
+            return writer
+        writer.release()
+
+    return cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
+
+
+class _CountedFrames:
+    """Frame iterator that counts the frames drawn from it"""
+
+    def __init__(self, frames):
+        self._frames = iter(frames)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        frame = next(self._frames)
+        self.count += 1
+        return frame
 
 
 class GenerationResult:
@@ -94,7 +208,14 @@ class GenerationResult:
 
     def to_json(self) -> str:
         """Convert to JSON string"""
-        return json.dumps(self.to_dict(), indent=2)
+        data = self.to_dict()
+        if orjson is not None:
+            try:
+                return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+            except TypeError:
+                # orjson rejects some metadata json accepts (e.g. non-str keys)
+                pass
+        return json.dumps(data, indent=2)
 
 
 class VideoService:
@@ -104,7 +225,9 @@ class VideoService:
         self,
         models_dir: str = "/mnt/d/VideoGenerator/models",
         output_dir: str = "/mnt/d/VideoGenerator/output",
-        device: str = "cuda"
+        device: str = "cuda",
+        pipeline_options: Optional[Dict[str, Any]] = None,
+        result_cache: bool = False
     ):
         """
         Initialize video service
@@ -113,15 +236,27 @@ class VideoService:
             models_dir: Directory containing models
             output_dir: Directory for output videos
             device: Device to use (cuda or cpu)
+            pipeline_options: Extra pipeline constructor arguments, e.g.
+                {"enable_compile": True} for a long-lived service
+            result_cache: Reuse videos from earlier seeded generations with
+                identical inputs (for development and test runs)
         """
         self.models_dir = models_dir
         self.output_dir = Path(output_dir)
         self.device = device
+        self.pipeline_options = pipeline_options or {}
 
         # Ensure output directory exists
         ensure_path_exists(self.output_dir, is_file=False)
 
-        # Initialize model manager
+        # Finished videos keyed by input image and parameters
+        self.result_cache_dir: Optional[Path] = None
+        if result_cache:
+            self.result_cache_dir = self.output_dir / ".cache"
+            ensure_path_exists(self.result_cache_dir, is_file=False)
+
+        # Initialize model manager (caches loaded pipelines, and with them
+        # any compiled UNet kernels, for the service's lifetime)
         self.model_manager = ModelManager(
             models_dir=models_dir,
             device=device,
@@ -181,25 +316,52 @@ class VideoService:
         start_time = time.time()
 
         try:
-            # Validate inputs
-            if not Path(image_path).exists():
+            # Validate inputs: read the image once here and hand the bytes
+            # to the pipeline, instead of an exists() probe plus a re-open
+            try:
+                with open(image_path, 'rb') as f:
+                    image_data = f.read()
+            except FileNotFoundError:
                 return GenerationResult(
                     success=False,
                     error=f"Image file not found: {image_path}"
                 )
+            except OSError as e:
+                return GenerationResult(
+                    success=False,
+                    error=f"Cannot read image file {image_path}: {e}"
+                )
 
-            if not prompt or not prompt.strip():
+            if is_blank(prompt):
                 return GenerationResult(
                     success=False,
                     error="Prompt is required and cannot be empty"
                 )
 
+            # Reuse an earlier identical seeded generation (random seeds never hit)
+            cache_key = None
+            if self.result_cache_dir is not None and seed >= 0:
+                cache_key = self._result_cache_key(image_data, {
+                    'model_name': model_name,
+                    'prompt': prompt,
+                    'negative_prompt': negative_prompt,
+                    'num_frames': num_frames,
+                    'fps': fps,
+                    'width': width,
+                    'height': height,
+                    'seed': seed,
+                    **kwargs
+                })
+                cached = self._load_cached_result(cache_key, output_path, start_time)
+                if cached is not None:
+                    return cached
+
             # Load pipeline
-            print(f"\n{'=' * 70}")
-            print(f"VIDEO GENERATION")
-            print(f"{'=' * 70}\n")
+            logger.info("\n%s", '=' * 70)
+            logger.info("VIDEO GENERATION")
+            logger.info("%s\n", '=' * 70)
 
-            pipeline = self.model_manager.load_pipeline(model_name)
+            pipeline = self.model_manager.load_pipeline(model_name, **self.pipeline_options)
 
             # Get default parameters
             defaults = pipeline.get_default_params()
@@ -241,43 +403,50 @@ class VideoService:
             if self.progress_callback:
                 pipeline.set_progress_callback(self.progress_callback)
 
-            # Generate frames
-            print(f"\n🎬 Starting generation...\n")
-            frames = pipeline.generate(**gen_params)
-
-            # Generate output path if not provided
-            if output_path is None:
-                timestamp = int(time.time())
-                output_path = self.output_dir / f"video_{timestamp}.mp4"
-            else:
-                output_path = Path(output_path)
-                # Ensure parent directory exists
-                ensure_path_exists(output_path.parent, is_file=False)
-
-            # Export to video
-            print(f"\n💾 Exporting video to: {output_path}")
-            self._export_video(
-                frames=frames,
-                output_path=str(output_path),
-                fps=gen_params['fps']
+            # Stream uint8 frames in the order the encoder takes (RGB for PyAV,
+            # BGR for OpenCV): each is encoded as soon as it is decoded, so
+            # the whole clip is never held in memory
+            logger.info("\n🎬 Starting generation...\n")
+            frame_format = "rgb" if HAS_PYAV else "bgr"
+            frames = pipeline.generate_iter(
+                output_format=frame_format, image_data=image_data, **gen_params
             )
 
+            output_path = self._resolve_output_path(output_path)
+
+            # Export to video. Frames are generated while encoding, so encode
+            # next to the target and rename on success: a failure partway
+            # never leaves a truncated file or clobbers an existing one.
+            logger.info("\n💾 Exporting video to: %s", output_path)
+            partial_path = output_path.with_name(f".{output_path.stem}.partial{output_path.suffix}")
+            try:
+                num_frames = self._export_video(
+                    frames=frames,
+                    output_path=str(partial_path),
+                    fps=gen_params['fps'],
+                    bgr=frame_format == "bgr"
+                )
+                os.replace(partial_path, output_path)
+            except BaseException:
+                partial_path.unlink(missing_ok=True)
+                raise
+
             # Calculate stats
             generation_time = time.time() - start_time
-            duration = len(frames) / gen_params['fps']
+            duration = num_frames / gen_params['fps']
             resolution = (gen_params['width'], gen_params['height'])
 
-            print(f"\n✅ Video generation complete!")
-            print(f"   Output: {output_path}")
-            print(f"   Frames: {len(frames)}")
-            print(f"   Duration: {duration:.2f}s @ {gen_params['fps']} FPS")
-            print(f"   Resolution: {resolution[0]}x{resolution[1]}")
-            print(f"   Time: {generation_time:.1f}s\n")
+            logger.info("\n✅ Video generation complete!")
+            logger.info("   Output: %s", output_path)
+            logger.info("   Frames: %s", num_frames)
+            logger.info("   Duration: %.2fs @ %s FPS", duration, gen_params['fps'])
+            logger.info("   Resolution: %sx%s", resolution[0], resolution[1])
+            logger.info("   Time: %.1fs\n", generation_time)
 
-            return GenerationResult(
+            result = GenerationResult(
                 success=True,
                 output_path=str(output_path),
-                num_frames=len(frames),
+                num_frames=num_frames,
                 duration=duration,
                 fps=gen_params['fps'],
                 resolution=resolution,
@@ -291,6 +460,11 @@ class VideoService:
                 }
             )
 
+            if cache_key is not None:
+                self._store_cached_result(cache_key, result)
+
+            return result
+
         except VRAMError as e:
             return GenerationResult(
                 success=False,
@@ -312,38 +486,193 @@ class VideoService:
                 generation_time=time.time() - start_time
             )
 
+    def _resolve_output_path(self, output_path: Optional[str]) -> Path:
+        """
+        Pick the output path, auto-generating one if not provided
+
+        Args:
+            output_path: Requested output path or None
+
+        Returns:
+            Output path (parent directory exists)
+        """
+        if output_path is None:
+            timestamp = int(time.time())
+            return self.output_dir / f"video_{timestamp}.mp4"
+
+        output_path = Path(output_path)
+        # Ensure parent directory exists
+        ensure_path_exists(output_path.parent, is_file=False)
+        return output_path
+
+    @staticmethod
+    def _result_cache_key(image_data: bytes, params: Dict[str, Any]) -> str:
+        """
+        Hash the input image and canonicalized parameters
+
+        Args:
+            image_data: Input image file contents
+            params: Generation request parameters
+
+        Returns:
+            Hex digest
+        """
+        if orjson is not None:
+            try:
+                canonical = orjson.dumps(params, option=orjson.OPT_SORT_KEYS, default=str)
+            except TypeError:
+                canonical = json.dumps(params, sort_keys=True, default=str).encode()
+        else:
+            canonical = json.dumps(params, sort_keys=True, default=str).encode()
+
+        if blake3 is not None:
+            return blake3.blake3(image_data + canonical).hexdigest()
+        return hashlib.blake2b(image_data + canonical, digest_size=32).hexdigest()
+
+    def _load_cached_result(
+        self,
+        cache_key: str,
+        output_path: Optional[str],
+        start_time: float
+    ) -> Optional[GenerationResult]:
+        """
+        Copy a cached video to the output path
+
+        Args:
+            cache_key: Result cache key
+            output_path: Requested output path or None
+            start_time: Request start time
+
+        Returns:
+            GenerationResult for the copy, or None on a cache miss
+        """
+        video_file = self.result_cache_dir / f"{cache_key}.mp4"
+        result_file = self.result_cache_dir / f"{cache_key}.json"
+        try:
+            data = json.loads(result_file.read_text())
+            output_path = self._resolve_output_path(output_path)
+            shutil.copyfile(video_file, output_path)
+        except (OSError, ValueError):
+            return None
+
+        data['output_path'] = str(output_path)
+        data['resolution'] = tuple(data['resolution'])
+        data['generation_time'] = time.time() - start_time
+        logger.info("♻️  Reused cached result: %s", output_path)
+        return GenerationResult(**data)
+
+    def _store_cached_result(self, cache_key: str, result: GenerationResult) -> None:
+        """
+        Save a finished video and its result to the result cache
+
+        Args:
+            cache_key: Result cache key
+            result: Successful generation result
+        """
+        try:
+            shutil.copyfile(result.output_path, self.result_cache_dir / f"{cache_key}.mp4")
+            (self.result_cache_dir / f"{cache_key}.json").write_text(result.to_json())
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("⚠️  Could not cache result: %s", e)
+
     def _export_video(
         self,
-        frames: List[Image.Image],
+        frames: Frames,
         output_path: str,
-        fps: int
-    ) -> None:
+        fps: int,
+        bgr: bool = False
+    ) -> int:
         """
         Export frames to MP4 video
 
+        Encodes H.264 with PyAV when installed (hardware encoder if the GPU
+        has one), then by piping raw frames to an ffmpeg subprocess,
+        otherwise through OpenCV (hardware H.264 when the build
+        supports it, else MPEG-4).
+
+        Frames may be a lazy iterator (a pipeline's generate_iter()), in
+        which case each frame is encoded as soon as it is produced.
+
         Args:
-            frames: List of PIL Image frames
+            frames: (N, H, W, 3) uint8 array, or an iterable of PIL Images /
+                (H, W, 3) uint8 arrays
             output_path: Output video path
             fps: Frames per second
+            bgr: frames are already in OpenCV's BGR order
+
+        Returns:
+            Number of frames written
         """
-        if not frames:
-            raise ValueError("No frames to export")
+        if hasattr(frames, 'cpu'):
+            frames = frames.cpu().numpy()
+
+        if isinstance(frames, np.ndarray):
+            if len(frames) == 0:
+                raise ValueError("No frames to export")
+            first = frames[0]
+            source = None
+        else:
+            # Every frame is pulled from the source once; the first is
+            # re-chained in front for each encoder attempt
+            source = _CountedFrames(frames)
+            first = next(source, None)
+            if first is None:
+                raise ValueError("No frames to export")
+
+        def all_frames() -> Frames:
+            return frames if source is None else itertools.chain([first], source)
+
+        def frames_written() -> int:
+            return len(frames) if source is None else source.count
+
+        # Hardware H.264 through PyAV (NVENC/QSV, else libx264)
+        if HAS_PYAV and not bgr:
+            try:
+                codec = encode_video(all_frames(), output_path, fps)
+                logger.info("🎞️  Encoded with %s", codec)
+                return frames_written()
+            except EncoderUnavailableError as e:
+                logger.warning("⚠️  PyAV encoding failed, falling back: %s", e)
+
+        # Raw frames piped to an ffmpeg subprocess (one write for an array)
+        if FFMPEG_BINARY is not None:
+            try:
+                codec = encode_video_ffmpeg(all_frames(), output_path, fps, bgr=bgr)
+                logger.info("🎞️  Encoded with %s (ffmpeg)", codec)
+                return frames_written()
+            except EncoderUnavailableError as e:
+                logger.warning("⚠️  ffmpeg encoding failed, falling back to OpenCV: %s", e)
 
         # Get frame dimensions
-        width, height = frames[0].size
+        height, width = np.asarray(first).shape[:2]
 
         # Initialize video writer
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
-
-        # Write frames
-        for i, frame in enumerate(frames):
-            # Convert PIL Image to OpenCV format (RGB -> BGR)
-            frame_np = np.array(frame)
-            frame_bgr = cv2.cvtColor(frame_np, cv2.COLOR_RGB2BGR)
-            writer.write(frame_bgr)
+        writer = _open_cv2_writer(str(output_path), fps, (width, height))
 
-        writer.release()
+        try:
+            # Pipelines already produced BGR: write frames as they are
+            if bgr:
+                for frame_bgr in all_frames():
+                    writer.write(np.asarray(frame_bgr))
+                return frames_written()
+
+            # Convert frames to OpenCV's BGR on worker threads (NumPy, OpenCV and
+            # the Numba kernel release the GIL) while the writer encodes. Each
+            # in-flight frame owns one buffer of a small ring, reused once written.
+            buffers = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(EXPORT_WORKERS)]
+            pending = deque()
+            with ThreadPoolExecutor(max_workers=EXPORT_WORKERS) as pool:
+                for i, frame in enumerate(all_frames()):
+                    if len(pending) == len(buffers):
+                        writer.write(pending.popleft().result())
+                    pending.append(pool.submit(_frame_to_bgr, frame, buffers[i % len(buffers)]))
+
+                while pending:
+                    writer.write(pending.popleft().result())
+
+            return frames_written()
+        finally:
+            writer.release()
 
     def list_models(self) -> List[Dict[str, Any]]:
         """
@@ -392,6 +721,8 @@ class VideoService:
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print("Video Service Test\n")
 
     # Initialize service
@@ -14,6 +14,7 @@ Usage:
 
 import sys
 import argparse
+import logging
 from pathlib import Path
 import time
 
@@ -36,21 +37,19 @@ def create_test_image(width: int = 512, height: int = 512) -> str:
     Returns:
         Path to created image
     """
-    # Create a gradient test image
-    img = Image.new('RGB', (width, height))
-    pixels = img.load()
-
-    for y in range(height):
-        for x in range(width):
-            # Create colorful gradient
-            r = int(255 * (x / width))
-            g = int(255 * (y / height))
-            b = int(128 + 127 * np.sin(x / 50))
-            pixels[x, y] = (r, g, b)
+    # Create a colorful gradient test image (red/blue vary by column, green by row)
+    xs = np.arange(width)
+    ys = np.arange(height)
+    pixels = np.empty((height, width, 3), dtype=np.uint8)
+    pixels[:, :, 0] = (255 * (xs / width)).astype(np.uint8)
+    pixels[:, :, 1] = (255 * (ys / height)).astype(np.uint8)[:, None]
+    pixels[:, :, 2] = (128 + 127 * np.sin(xs / 50)).astype(np.uint8)
+    # Wrap the C-contiguous buffer instead of copying it
+    img = Image.frombuffer('RGB', (width, height), pixels, 'raw', 'RGB', 0, 1)
 
     # Save to temp directory
     test_image_path = "/tmp/test_image.jpg"
-    img.save(test_image_path)
+    img.save(test_image_path, quality=90)
     print(f"📷 Created test image: {test_image_path}")
     return test_image_path
 
@@ -221,9 +220,12 @@ def main() -> int:
     parser.add_argument('--svd-only', action='store_true', help='Test only SVD pipeline')
     parser.add_argument('--animatediff-only', action='store_true', help='Test only AnimateDiff pipeline')
     parser.add_argument('--no-test-image', help='Use existing image instead of creating test image')
+    parser.add_argument('--use-cache', action='store_true', help='Reuse the output of an identical earlier run instead of regenerating')
 
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print("\n" + "=" * 70)
     print("VIDEO GENERATION TEST SUITE")
     print("=" * 70)
@@ -233,7 +235,8 @@ def main() -> int:
     service = VideoService(
         models_dir="/mnt/d/VideoGenerator/models",
         output_dir="/mnt/d/VideoGenerator/output",
-        device="cuda"
+        device="cuda",
+        result_cache=args.use_cache
     )
 
     # Test model discovery
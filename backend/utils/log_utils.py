@@ -0,0 +1,73 @@
+"""
+Logging Utilities
+
+Non-blocking logging setup for the backend. Pipelines and services log
+through module-level loggers; records are queued by the calling thread and
+written by a background listener, so progress output never stalls the
+generation thread on a slow (WSL) stdout.
+"""
+
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, TextIO
+
+# Progress lines are read by the C# frontend, so keep them bare
+LOG_FORMAT = "%(message)s"
+
+# Backend packages that log progress at INFO; everything else stays at WARNING
+BACKEND_LOGGERS = ("pipelines", "services", "utils")
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(stream: Optional[TextIO] = None, level: int = logging.INFO) -> None:
+    """
+    Route backend log records through a queue to a stream
+
+    Safe to call more than once; the previous listener is stopped first.
+
+    Args:
+        stream: Output stream (default: sys.stdout)
+        level: Level for backend loggers (default: INFO)
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+    else:
+        atexit.register(_stop_listener)
+
+    handler = logging.StreamHandler(stream if stream is not None else sys.stdout)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(logging.WARNING)
+
+    for name in BACKEND_LOGGERS:
+        logging.getLogger(name).setLevel(level)
+
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+
+
+def flush_logging() -> None:
+    """
+    Write out all queued log records
+
+    Call before printing anything that must appear after pending log
+    output (e.g. the JSON response on stdout).
+    """
+    if _listener is not None:
+        _listener.stop()
+        _listener.start()
+
+
+def _stop_listener() -> None:
+    """Drain the queue at interpreter exit"""
+    if _listener is not None:
+        _listener.stop()
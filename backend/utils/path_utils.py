@@ -7,8 +7,17 @@ Critical for proper operation in hybrid WSL development + Windows deployment env
 
 import os
 import platform
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Union
+from typing import List, Set, Union
+
+# Drive-letter paths: D:, D:\path, D:/path
+DRIVE_PATH_RE = re.compile(r'^[A-Za-z]:')
+
+# Single-pass separator conversion tables
+BACKSLASH_TO_SLASH = str.maketrans('\\', '/')
+SLASH_TO_BACKSLASH = str.maketrans('/', '\\')
 
 
 def windows_to_wsl_path(windows_path: str) -> str:
@@ -29,7 +38,7 @@ def windows_to_wsl_path(windows_path: str) -> str:
         return windows_path
 
     # Normalize backslashes to forward slashes
-    path = windows_path.replace('\\', '/')
+    path = windows_path.translate(BACKSLASH_TO_SLASH)
 
     # Remove trailing slashes
     path = path.rstrip('/')
@@ -76,12 +85,90 @@ def wsl_to_windows_path(wsl_path: str) -> str:
             rest = '/'.join(parts[3:]) if len(parts) > 3 else ''
 
             # Convert to Windows backslashes
-            rest = rest.replace('/', '\\')
+            rest = rest.translate(SLASH_TO_BACKSLASH)
 
             return f"{drive}:\\{rest}" if rest else f"{drive}:\\"
 
     # Already a Windows path or relative path
-    return wsl_path.replace('/', '\\')
+    return wsl_path.translate(SLASH_TO_BACKSLASH)
+
+
+@lru_cache(maxsize=None)
+def detect_target_system() -> str:
+    """
+    Detect the path style of the running system
+
+    Cached: the platform and the presence of /mnt/c don't change within
+    a process.
+
+    Returns:
+        'windows', 'wsl', or 'linux'
+    """
+    system = platform.system()
+
+    if system == "Windows":
+        return "windows"
+    elif system == "Linux":
+        # Check if running in WSL
+        if os.path.exists('/mnt/c'):
+            return "wsl"
+        return "linux"
+    return "linux"
+
+
+def windows_to_wsl_paths(windows_paths: List[str]) -> List[str]:
+    """
+    Convert many Windows paths to WSL paths
+
+    Same result as windows_to_wsl_path() per path, with one translate()
+    pass per path instead of several intermediate strings.
+
+    Args:
+        windows_paths: Windows-style paths
+
+    Returns:
+        WSL-style paths, in the same order
+    """
+    converted = []
+    for windows_path in windows_paths:
+        if not windows_path:
+            converted.append(windows_path)
+            continue
+
+        path = windows_path.translate(BACKSLASH_TO_SLASH).rstrip('/')
+        if path[1:2] == ':':
+            rest = path[3:] if path[2:3] == '/' else path[2:]
+            drive = path[0].lower()
+            converted.append(f"/mnt/{drive}/{rest}" if rest else f"/mnt/{drive}")
+        else:
+            converted.append(path)
+    return converted
+
+
+def wsl_to_windows_paths(wsl_paths: List[str]) -> List[str]:
+    """
+    Convert many WSL paths to Windows paths
+
+    Same result as wsl_to_windows_path() per path, without splitting and
+    re-joining every path component.
+
+    Args:
+        wsl_paths: WSL-style paths
+
+    Returns:
+        Windows-style paths, in the same order
+    """
+    converted = []
+    for wsl_path in wsl_paths:
+        if not wsl_path:
+            converted.append(wsl_path)
+        elif wsl_path[:5] == '/mnt/':
+            drive, _, rest = wsl_path[5:].partition('/')
+            rest = rest.translate(SLASH_TO_BACKSLASH)
+            converted.append(f"{drive.upper()}:\\{rest}")
+        else:
+            converted.append(wsl_path.translate(SLASH_TO_BACKSLASH))
+    return converted
 
 
 def normalize_path(path: str, target_system: str = None) -> str:
@@ -99,37 +186,34 @@ def normalize_path(path: str, target_system: str = None) -> str:
         return path
 
     # Auto-detect if not specified
-    if target_system is None:
-        system = platform.system()
-
-        if system == "Windows":
-            target_system = "windows"
-        elif system == "Linux":
-            # Check if running in WSL
-            if os.path.exists('/mnt/c'):
-                target_system = "wsl"
-            else:
-                target_system = "linux"
-        else:
-            target_system = "linux"
+    target_system = detect_target_system() if target_system is None else target_system.lower()
 
-    target_system = target_system.lower()
+    # Fast path: most callers already pass the target format
+    if target_system == "windows":
+        if path[1:2] == ':' and '/' not in path:
+            return path
+    elif '\\' not in path and (path[:1] == '/' or target_system != "wsl"):
+        return path
 
     if target_system == "windows":
         # Convert to Windows format
         if path.startswith('/mnt/'):
             return wsl_to_windows_path(path)
-        return path.replace('/', '\\')
+        return path.translate(SLASH_TO_BACKSLASH)
 
     elif target_system == "wsl":
         # Convert to WSL format
-        if len(path) >= 2 and path[1] == ':':
+        if DRIVE_PATH_RE.match(path):
             return windows_to_wsl_path(path)
-        return path.replace('\\', '/')
+        return path.translate(BACKSLASH_TO_SLASH)
 
     else:  # linux
         # Just use forward slashes
-        return path.replace('\\', '/')
+        return path.translate(BACKSLASH_TO_SLASH)
+
+
+# Directories already created or confirmed by ensure_path_exists
+_ensured_dirs: Set[str] = set()
 
 
 def ensure_path_exists(path: Union[str, Path], is_file: bool = False) -> Path:
@@ -144,11 +228,13 @@ def ensure_path_exists(path: Union[str, Path], is_file: bool = False) -> Path:
         Path object
     """
     path = Path(path)
+    directory = path.parent if is_file else path
 
-    if is_file:
-        path.parent.mkdir(parents=True, exist_ok=True)
-    else:
-        path.mkdir(parents=True, exist_ok=True)
+    # Each mkdir is a filesystem round trip (slow on /mnt/ drives under WSL)
+    key = str(directory)
+    if key not in _ensured_dirs:
+        directory.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(key)
 
     return path
 
@@ -6,8 +6,35 @@ Prompts are REQUIRED for all generations in this application
 """
 
 import re
+from functools import lru_cache
 from typing import Tuple, Optional, List
 
+# Distinct (prompt, negative, pipeline) validations kept, e.g. for prompt sweeps
+PROMPT_CACHE_SIZE = 1024
+
+# Distinct strings kept by the token-count and clean-prompt caches
+TEXT_CACHE_SIZE = 512
+
+# Precompiled patterns for clean_prompt / split_long_prompt
+# A run of commas with any spacing around them: ", ,", ",," or " ,"
+COMMA_RUN_RE = re.compile(r' ?,[ ,]*')
+SENTENCE_BREAK_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def is_blank(text: Optional[str]) -> bool:
+    """
+    Check whether a prompt is missing or only whitespace
+
+    Unlike `not text.strip()`, this never builds a stripped copy.
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        True if the prompt is empty
+    """
+    return not text or text.isspace()
+
 
 class PromptValidator:
     """Validate and process prompts for video generation"""
@@ -19,16 +46,22 @@ class PromptValidator:
     MIN_PROMPT_LENGTH = 3
 
     # Common quality/style tags that can enhance prompts
-    QUALITY_TAGS = [
+    QUALITY_TAGS = (
         "masterpiece", "best quality", "high quality", "highly detailed",
         "8k", "4k", "ultra detailed", "cinematic", "professional"
-    ]
+    )
+
+    # Filler words skipped by extract_keywords
+    FILLER_WORDS = frozenset({'a', 'an', 'the', 'with', 'and', 'or', 'in', 'on', 'at'})
+
+    # Keywords returned by extract_keywords
+    MAX_KEYWORDS = 10
 
     # Common negative prompt tags
-    COMMON_NEGATIVE = [
+    COMMON_NEGATIVE = (
         "blurry", "low quality", "distorted", "ugly", "deformed",
         "bad anatomy", "static", "worst quality", "low res"
-    ]
+    )
 
     def __init__(self):
         """Initialize prompt validator"""
@@ -45,20 +78,23 @@ class PromptValidator:
             Tuple of (is_valid, error_message)
             error_message is None if valid
         """
+        # Strip once; every check below works on the stripped prompt
+        stripped = prompt.strip() if prompt else ''
+
         # Check if prompt exists
-        if not prompt or not prompt.strip():
+        if not stripped:
             return False, "Prompt is required and cannot be empty"
 
         # Check minimum length
-        if len(prompt.strip()) < self.MIN_PROMPT_LENGTH:
+        if len(stripped) < self.MIN_PROMPT_LENGTH:
             return False, f"Prompt too short (minimum {self.MIN_PROMPT_LENGTH} characters)"
 
         # Check for potentially problematic characters
-        if prompt.count('"') % 2 != 0:
+        if stripped.count('"') & 1:
             return False, "Unmatched quotation marks in prompt"
 
         # Check token count (approximate)
-        tokens = self.estimate_token_count(prompt)
+        tokens = self.estimate_token_count(stripped)
         if tokens > self.MAX_TOKENS:
             return False, f"Prompt too long ({tokens} tokens, maximum {self.MAX_TOKENS})"
 
@@ -76,10 +112,33 @@ class PromptValidator:
         Returns:
             Estimated token count
         """
-        # Simple estimation: split by spaces and punctuation
-        # CLIP tokenizer is roughly 1.3 tokens per word on average
-        words = len(text.split())
-        return int(words * 1.3)
+        return _estimate_token_count(text)
+
+    @staticmethod
+    def count_words(text: str) -> int:
+        """
+        Count whitespace-separated words, same as len(text.split())
+
+        Typical prompts (printable ASCII, single spaces) are counted by
+        counting spaces, without building the list of words.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Number of words
+        """
+        if not text:
+            return 0
+
+        # The only printable ASCII whitespace is ' ', so single spaces
+        # separate every word
+        if text.isascii() and text.isprintable() and '  ' not in text:
+            if text == ' ':
+                return 0
+            return text.count(' ') + 1 - (text[0] == ' ') - (text[-1] == ' ')
+
+        return len(text.split())
 
     def truncate_prompt(self, prompt: str, max_tokens: int = None) -> str:
         """
@@ -101,11 +160,23 @@ class PromptValidator:
             return prompt
 
         # Truncate by words
-        words = prompt.split()
         # Target ~0.77 words per token (inverse of 1.3 tokens per word)
         target_words = int(max_tokens * 0.77)
 
-        truncated = ' '.join(words[:target_words])
+        # Typical prompts (printable ASCII, single spaces): find the end of
+        # the last kept word and slice, without building the list of words
+        if prompt.isascii() and prompt.isprintable() and '  ' not in prompt:
+            start = end = 1 if prompt[0] == ' ' else 0
+            for _ in range(target_words):
+                space = prompt.find(' ', end)
+                if space < 0:
+                    end = len(prompt)
+                    break
+                end = space + 1
+            truncated = prompt[start:end].rstrip(' ')
+        else:
+            truncated = ' '.join(prompt.split()[:target_words])
+
         return truncated + "..."
 
     def enhance_prompt(
@@ -130,7 +201,8 @@ class PromptValidator:
         if add_quality_tags and pipeline == "animatediff":
             # Only add quality tags for AnimateDiff (stronger text conditioning)
             # Don't add for SVD (limited text conditioning)
-            if not any(tag in enhanced.lower() for tag in self.QUALITY_TAGS):
+            lowered = enhanced.lower()
+            if not any(tag in lowered for tag in self.QUALITY_TAGS):
                 enhanced = f"{enhanced}, masterpiece, best quality, highly detailed"
 
         return enhanced
@@ -165,32 +237,34 @@ class PromptValidator:
         if max_tokens is None:
             max_tokens = self.MAX_TOKENS
 
-        estimated = self.estimate_token_count(prompt)
+        # Budget in words, so each sentence is counted once (no re-estimating
+        # tokens per sentence); matches estimate_token_count's 1.3 tokens/word
+        max_words = int(max_tokens / 1.3)
 
-        if estimated <= max_tokens:
+        if self.count_words(prompt) <= max_words:
             return [prompt]
 
         # Split by sentences
-        sentences = re.split(r'(?<=[.!?])\s+', prompt)
+        sentences = SENTENCE_BREAK_RE.split(prompt)
 
         chunks = []
         current_chunk = []
-        current_tokens = 0
+        current_words = 0
 
         for sentence in sentences:
-            sentence_tokens = self.estimate_token_count(sentence)
+            sentence_words = self.count_words(sentence)
 
-            if current_tokens + sentence_tokens > max_tokens:
+            if current_words + sentence_words > max_words:
                 if current_chunk:
                     chunks.append(' '.join(current_chunk))
                     current_chunk = [sentence]
-                    current_tokens = sentence_tokens
+                    current_words = sentence_words
                 else:
                     # Single sentence too long, truncate it
                     chunks.append(self.truncate_prompt(sentence, max_tokens))
             else:
                 current_chunk.append(sentence)
-                current_tokens += sentence_tokens
+                current_words += sentence_words
 
         if current_chunk:
             chunks.append(' '.join(current_chunk))
@@ -207,19 +281,7 @@ class PromptValidator:
         Returns:
             Cleaned prompt
         """
-        # Remove extra whitespace
-        cleaned = ' '.join(prompt.split())
-
-        # Remove redundant commas
-        cleaned = re.sub(r',\s*,', ',', cleaned)
-
-        # Ensure comma spacing
-        cleaned = re.sub(r',(?!\s)', ', ', cleaned)
-
-        # Remove trailing comma
-        cleaned = cleaned.rstrip(',').strip()
-
-        return cleaned
+        return _clean_prompt(prompt)
 
     def extract_keywords(self, prompt: str) -> List[str]:
         """
@@ -229,23 +291,48 @@ class PromptValidator:
             prompt: Input prompt
 
         Returns:
-            List of keywords
+            Up to MAX_KEYWORDS keywords, in prompt order
         """
+        keywords = []
         # Split by comma and extract main terms
-        parts = [p.strip() for p in prompt.split(',')]
+        for part in prompt.split(','):
+            for word in part.split():
+                # Keep only meaningful words
+                if len(word) > 2 and word.lower() not in self.FILLER_WORDS:
+                    keywords.append(word)
+                    if len(keywords) == self.MAX_KEYWORDS:
+                        return keywords
 
-        # Remove common filler words
-        filler = {'a', 'an', 'the', 'with', 'and', 'or', 'in', 'on', 'at'}
+        return keywords
+
+
+# PromptValidator is stateless: share one instance instead of building one
+# per validation
+DEFAULT_VALIDATOR = PromptValidator()
 
-        keywords = []
-        for part in parts:
-            words = part.split()
-            # Keep only meaningful words
-            keywords.extend([w for w in words if w.lower() not in filler and len(w) > 2])
 
-        return keywords[:10]  # Return top 10 keywords
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _estimate_token_count(text: str) -> int:
+    """Cached body of PromptValidator.estimate_token_count"""
+    # Simple estimation: count whitespace-separated words
+    # CLIP tokenizer is roughly 1.3 tokens per word on average
+    return int(PromptValidator.count_words(text) * 1.3)
 
 
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _clean_prompt(prompt: str) -> str:
+    """Cached body of PromptValidator.clean_prompt"""
+    # Remove extra whitespace
+    cleaned = ' '.join(prompt.split())
+
+    # Collapse redundant commas and normalize comma spacing in one pass
+    cleaned = COMMA_RUN_RE.sub(', ', cleaned)
+
+    # Remove leading/trailing commas
+    return cleaned.strip(' ,')
+
+
+@lru_cache(maxsize=PROMPT_CACHE_SIZE)
 def validate_and_prepare_prompts(
     prompt: str,
     negative_prompt: str = None,
@@ -254,6 +341,9 @@ def validate_and_prepare_prompts(
     """
     Validate and prepare prompts for generation
 
+    Results are cached, so repeated prompts (service pre-checks, pipeline
+    validation, sweeps over seeds) are validated and cleaned once.
+
     Args:
         prompt: Main prompt
         negative_prompt: Negative prompt (optional)
@@ -262,7 +352,7 @@ def validate_and_prepare_prompts(
     Returns:
         Tuple of (is_valid, processed_prompt, processed_negative_prompt, error_message)
     """
-    validator = PromptValidator()
+    validator = DEFAULT_VALIDATOR
 
     # Validate main prompt
     is_valid, error = validator.validate_prompt(prompt)
@@ -273,7 +363,7 @@ def validate_and_prepare_prompts(
     processed_prompt = validator.clean_prompt(prompt)
 
     # Handle negative prompt
-    if negative_prompt and negative_prompt.strip():
+    if not is_blank(negative_prompt):
         # Validate negative prompt
         is_valid_neg, error_neg = validator.validate_prompt(negative_prompt)
         if not is_valid_neg:
@@ -0,0 +1,351 @@
+"""
+Video Encoding Utilities
+
+H.264 encoding through PyAV or an ffmpeg subprocess, preferring hardware
+encoders (NVIDIA NVENC, Intel Quick Sync) and falling back to libx264 when
+neither is available.
+
+Frames may be a (N, H, W, 3) array or any iterable of frames, so a pipeline
+can stream frames into the encoder as they are decoded.
+
+Also samples frames from input videos (for video inputs and reference
+metrics).
+"""
+
+import itertools
+import logging
+import shutil
+import subprocess
+from functools import lru_cache
+from typing import Iterable, Iterator, Tuple, Union
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# PyAV is optional (pip install av)
+try:
+    import av
+    HAS_PYAV = True
+except ImportError:
+    HAS_PYAV = False
+
+logger = logging.getLogger(__name__)
+
+# Encoders tried in order, with their options
+H264_ENCODERS = (
+    ("h264_nvenc", {"preset": "p4", "rc": "vbr", "cq": "19"}),
+    ("h264_qsv", {"preset": "veryfast", "global_quality": "20"}),
+    ("libx264", {"preset": "veryfast", "crf": "18"}),
+)
+
+Frame = Union[Image.Image, np.ndarray]
+Frames = Union[np.ndarray, Iterable[Frame]]
+
+# ffmpeg executable for the raw-video pipe encoder (None if not on PATH)
+FFMPEG_BINARY = shutil.which("ffmpeg")
+
+# Pipe buffer for the ffmpeg subprocess stdin
+FFMPEG_PIPE_BUFFER = 1 << 20
+
+
+class EncoderUnavailableError(RuntimeError):
+    """
+    No H.264 encoder could be opened
+
+    Raised before any frame after the first has been consumed, so a caller
+    streaming frames can re-chain the first frame and try another encoder.
+    """
+    pass
+
+
+def split_first_frame(frames: Frames) -> Tuple[np.ndarray, Frames]:
+    """
+    Peek at the first frame without losing it from a frame iterator
+
+    Args:
+        frames: Frame array/tensor or iterable of frames
+
+    Returns:
+        Tuple of (first frame as an array, frames to encode). Arrays are
+        returned as-is; iterators come back with the first frame chained on.
+
+    Raises:
+        ValueError: If there are no frames
+    """
+    if hasattr(frames, 'cpu'):
+        frames = frames.cpu().numpy()
+
+    if isinstance(frames, np.ndarray):
+        if len(frames) == 0:
+            raise ValueError("No frames to export")
+        return frames[0], frames
+
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None:
+        raise ValueError("No frames to export")
+    return np.asarray(first), itertools.chain([first], frames)
+
+
+def encode_video(frames: Frames, output_path: str, fps: int) -> str:
+    """
+    Encode RGB frames to an H.264 MP4 with PyAV
+
+    Args:
+        frames: RGB frames as a (N, H, W, 3) uint8 array/tensor, or an
+            iterable of PIL Images / (H, W, 3) uint8 arrays
+        output_path: Output video path
+        fps: Frames per second
+
+    Returns:
+        Name of the encoder used
+
+    Raises:
+        ImportError: If PyAV is not installed
+        EncoderUnavailableError: If no H.264 encoder could be opened
+    """
+    if not HAS_PYAV:
+        raise ImportError("PyAV not installed. Install with: pip install av")
+
+    first, frames = split_first_frame(frames)
+    rest = iter(frames)
+    next(rest)
+
+    errors = []
+    for codec, options in H264_ENCODERS:
+        # Encoders open lazily, so encode the first frame to find out whether
+        # this one works before consuming the rest
+        container = av.open(output_path, mode="w")
+        try:
+            stream = _open_stream(container, codec, options, first, fps)
+        except Exception as e:
+            container.close()
+            logger.info("   %s unavailable (%s), trying next encoder", codec, e)
+            errors.append(f"{codec}: {e}")
+            continue
+
+        with container:
+            for frame in rest:
+                _encode_frame(container, stream, np.asarray(frame))
+
+            # Flush delayed packets
+            for packet in stream.encode():
+                container.mux(packet)
+        return codec
+
+    raise EncoderUnavailableError(f"H.264 encoding failed ({'; '.join(errors)})")
+
+
+def _open_stream(container, codec: str, options: dict, first: np.ndarray, fps: int):
+    """
+    Add an H.264 stream to a container and encode the first frame
+
+    Args:
+        container: Output container opened for writing
+        codec: FFmpeg encoder name
+        options: Encoder options
+        first: First RGB frame
+        fps: Frames per second
+
+    Returns:
+        The video stream
+    """
+    height, width = first.shape[:2]
+
+    stream = container.add_stream(codec, rate=fps)
+    stream.width = width
+    stream.height = height
+    stream.pix_fmt = "yuv420p"
+    stream.options = options
+
+    _encode_frame(container, stream, first)
+    return stream
+
+
+def _encode_frame(container, stream, frame: np.ndarray) -> None:
+    """Encode one RGB frame and mux its packets"""
+    video_frame = av.VideoFrame.from_ndarray(frame, format="rgb24")
+    for packet in stream.encode(video_frame):
+        container.mux(packet)
+
+
+def encode_video_ffmpeg(
+    frames: Frames,
+    output_path: str,
+    fps: int,
+    bgr: bool = False
+) -> str:
+    """
+    Encode frames to an H.264 MP4 by piping raw video into ffmpeg
+
+    A frame array is handed to ffmpeg in a single write, instead of one
+    encoder call per frame; an iterable is written frame by frame as it
+    produces them.
+
+    Args:
+        frames: Frames as a (N, H, W, 3) uint8 array/tensor, or an iterable
+            of PIL Images / (H, W, 3) uint8 arrays
+        output_path: Output video path
+        fps: Frames per second
+        bgr: Frames are in BGR order (RGB otherwise)
+
+    Returns:
+        Name of the encoder used
+
+    Raises:
+        FileNotFoundError: If ffmpeg is not on PATH
+        EncoderUnavailableError: If ffmpeg has no working H.264 encoder
+        RuntimeError: If ffmpeg fails while encoding
+    """
+    if FFMPEG_BINARY is None:
+        raise FileNotFoundError("ffmpeg not found on PATH")
+
+    first, frames = split_first_frame(frames)
+
+    for codec, options in H264_ENCODERS:
+        if _ffmpeg_can_encode(codec, tuple(options.items())):
+            _pipe_to_ffmpeg(codec, options, first, frames, output_path, fps, bgr)
+            return codec
+        logger.info("   %s unavailable, trying next encoder", codec)
+
+    raise EncoderUnavailableError("ffmpeg has no working H.264 encoder")
+
+
+@lru_cache(maxsize=None)
+def _ffmpeg_can_encode(codec: str, options: Tuple[Tuple[str, str], ...]) -> bool:
+    """
+    Check once per process whether ffmpeg can open an encoder
+
+    ffmpeg builds list hardware encoders even without a GPU to back them,
+    so this encodes one synthetic frame. Streamed frames cannot be replayed
+    into a second encoder after a failed encode.
+
+    Args:
+        codec: FFmpeg encoder name
+        options: Encoder options as (key, value) pairs
+
+    Returns:
+        True if the test encode succeeded
+    """
+    command = [
+        FFMPEG_BINARY, "-loglevel", "error",
+        "-f", "lavfi", "-i", "color=size=256x256:duration=0.1",
+        "-frames:v", "1", "-c:v", codec,
+    ]
+    for key, value in options:
+        command += [f"-{key}", value]
+    command += ["-pix_fmt", "yuv420p", "-f", "null", "-"]
+
+    try:
+        # Only the exit code matters; discard output instead of buffering it
+        return subprocess.run(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=30
+        ).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+
+def _pipe_to_ffmpeg(
+    codec: str,
+    options: dict,
+    first: np.ndarray,
+    frames: Frames,
+    output_path: str,
+    fps: int,
+    bgr: bool
+) -> None:
+    """
+    Run one ffmpeg encode with a specific encoder
+
+    Args:
+        codec: FFmpeg encoder name
+        options: Encoder options
+        first: First frame (for the dimensions)
+        frames: Frames, including the first
+        output_path: Output video path
+        fps: Frames per second
+        bgr: Frames are in BGR order
+
+    Raises:
+        RuntimeError: If ffmpeg exits with an error
+    """
+    height, width = first.shape[:2]
+
+    command = [
+        FFMPEG_BINARY, "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "bgr24" if bgr else "rgb24",
+        "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+        "-c:v", codec,
+    ]
+    for key, value in options.items():
+        command += [f"-{key}", value]
+    command += ["-pix_fmt", "yuv420p", str(output_path)]
+
+    proc = subprocess.Popen(
+        command,
+        stdin=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        bufsize=FFMPEG_PIPE_BUFFER
+    )
+    try:
+        if isinstance(frames, np.ndarray):
+            # One write of the whole contiguous buffer (no tobytes() copy)
+            proc.stdin.write(memoryview(np.ascontiguousarray(frames)).cast("B"))
+        else:
+            for frame in frames:
+                proc.stdin.write(memoryview(np.ascontiguousarray(frame)).cast("B"))
+        proc.stdin.close()
+    except BrokenPipeError:
+        # ffmpeg exited early; report its error below
+        pass
+    except BaseException:
+        # The frame source failed (e.g. a generation error): abandon the encode
+        proc.kill()
+        proc.wait()
+        raise
+
+    stderr = proc.communicate()[1]
+    if proc.returncode != 0:
+        raise RuntimeError(stderr.decode(errors="replace").strip() or f"exit code {proc.returncode}")
+
+
+def sample_video_frames(video_path: str, target_fps: float) -> Iterator[np.ndarray]:
+    """
+    Yield frames from a video at (approximately) a lower frame rate
+
+    Skipped frames are only grab()bed, which advances the decoder without
+    the YUV -> BGR conversion and copy that retrieve() performs.
+
+    Args:
+        video_path: Input video path
+        target_fps: Desired sampling rate (frames per second)
+
+    Yields:
+        (H, W, 3) uint8 BGR frames
+
+    Raises:
+        FileNotFoundError: If the video cannot be opened
+    """
+    capture = cv2.VideoCapture(str(video_path))
+    if not capture.isOpened():
+        raise FileNotFoundError(f"Cannot open video: {video_path}")
+
+    try:
+        source_fps = capture.get(cv2.CAP_PROP_FPS) or target_fps
+        step = max(1, round(source_fps / target_fps))
+
+        index = 0
+        while capture.grab():
+            if index % step == 0:
+                ok, frame = capture.retrieve()
+                if not ok:
+                    break
+                yield frame
+            index += 1
+    finally:
+        capture.release()
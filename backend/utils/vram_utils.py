@@ -5,24 +5,63 @@ Provides VRAM monitoring, estimation, and dynamic optimization
 to ensure video generation stays within hardware constraints.
 """
 
+import time
+import numpy as np
 import torch
-from typing import Dict, Any, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Any, NamedTuple, Optional, Sequence, Tuple, Union
+
+# Bytes -> GB as one multiply
+GB_PER_BYTE = 1.0 / (1024 ** 3)
+
+# Scalar or array input to batch_estimate_vram_usage
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+@lru_cache(maxsize=1)
+def total_vram_gb() -> float:
+    """
+    Get total VRAM on the GPU
+
+    Cached: device properties never change within a process, and every
+    VRAMMonitor/VRAMOptimizer would otherwise query them again.
+
+    Returns:
+        Total VRAM in GB (0.0 without CUDA)
+    """
+    if torch.cuda.is_available():
+        return torch.cuda.get_device_properties(0).total_memory * GB_PER_BYTE
+    return 0.0
 
 
 class VRAMMonitor:
     """Monitor and manage GPU VRAM usage"""
 
-    def __init__(self, device: str = "cuda", target_vram_gb: float = 11.0):
+    # Seconds within which repeated clear_cache() calls are coalesced
+    CLEAR_CACHE_INTERVAL = 0.5
+
+    def __init__(
+        self,
+        device: str = "cuda",
+        target_vram_gb: float = 11.0,
+        stats_ttl: float = 0.5
+    ):
         """
         Initialize VRAM monitor
 
         Args:
             device: CUDA device (default: "cuda")
             target_vram_gb: Target maximum VRAM usage in GB (default: 11.0, leaving 1GB headroom)
+            stats_ttl: Seconds get_vram_stats() reuses its last result (default: 0.5)
         """
         self.device = device
         self.target_vram = target_vram_gb
+        self.has_cuda = torch.cuda.is_available()
         self.total_vram = self._get_total_vram()
+        self.stats_ttl = stats_ttl
+        self._cached_stats: Optional[Dict[str, float]] = None
+        self._cached_at = 0.0
+        self._last_clear = 0.0
 
     def _get_total_vram(self) -> float:
         """
@@ -31,9 +70,7 @@ class VRAMMonitor:
         Returns:
             Total VRAM in GB
         """
-        if torch.cuda.is_available():
-            return torch.cuda.get_device_properties(0).total_memory / (1024 ** 3)
-        return 0.0
+        return total_vram_gb()
 
     def get_available_vram(self) -> float:
         """
@@ -42,9 +79,9 @@ class VRAMMonitor:
         Returns:
             Available VRAM in GB
         """
-        if torch.cuda.is_available():
+        if self.has_cuda:
             free, total = torch.cuda.mem_get_info()
-            return free / (1024 ** 3)
+            return free * GB_PER_BYTE
         return 0.0
 
     def get_used_vram(self) -> float:
@@ -54,22 +91,53 @@ class VRAMMonitor:
         Returns:
             Used VRAM in GB
         """
-        if torch.cuda.is_available():
-            allocated = torch.cuda.memory_allocated() / (1024 ** 3)
+        if self.has_cuda:
+            allocated = torch.cuda.memory_allocated() * GB_PER_BYTE
             return allocated
         return 0.0
 
-    def get_vram_stats(self) -> Dict[str, float]:
+    def get_vram_stats(self, refresh: bool = False) -> Dict[str, float]:
         """
         Get comprehensive VRAM statistics
 
+        Results are cached for stats_ttl seconds, since each query is a
+        driver round-trip and the answer rarely changes within one call.
+
+        Args:
+            refresh: Bypass the cache (default: False)
+
         Returns:
             Dictionary with total, used, available, and percentage used
         """
-        if torch.cuda.is_available():
-            total = self.total_vram
-            used = self.get_used_vram()
-            available = self.get_available_vram()
+        now = time.monotonic()
+        if (
+            not refresh
+            and self._cached_stats is not None
+            and now - self._cached_at < self.stats_ttl
+        ):
+            return dict(self._cached_stats)
+
+        self._cached_stats = self._query_vram_stats()
+        self._cached_at = now
+        return dict(self._cached_stats)
+
+    def invalidate(self) -> None:
+        """Drop cached VRAM statistics"""
+        self._cached_stats = None
+
+    def _query_vram_stats(self) -> Dict[str, float]:
+        """
+        Query VRAM statistics from the driver
+
+        Returns:
+            Dictionary with total, used, available, and percentage used
+        """
+        if self.has_cuda:
+            # One driver query for free/total; memory_allocated() is a counter
+            free, total = torch.cuda.mem_get_info()
+            total = total * GB_PER_BYTE
+            used = torch.cuda.memory_allocated() * GB_PER_BYTE
+            available = free * GB_PER_BYTE
             percent_used = (used / total * 100) if total > 0 else 0
 
             return {
@@ -85,10 +153,25 @@ class VRAMMonitor:
             "percent_used": 0.0
         }
 
-    def clear_cache(self):
-        """Clear PyTorch CUDA cache"""
-        if torch.cuda.is_available():
+    def clear_cache(self, force: bool = False):
+        """
+        Clear PyTorch CUDA cache
+
+        empty_cache() synchronizes the device and releases blocks the
+        allocator will likely re-request, so calls within
+        CLEAR_CACHE_INTERVAL of the last clear are skipped.
+
+        Args:
+            force: Clear even if the cache was cleared just now
+        """
+        now = time.monotonic()
+        if not force and now - self._last_clear < self.CLEAR_CACHE_INTERVAL:
+            return
+        self._last_clear = now
+
+        if self.has_cuda:
             torch.cuda.empty_cache()
+        self.invalidate()
 
     def is_vram_available(self, required_gb: float) -> bool:
         """
@@ -104,21 +187,32 @@ class VRAMMonitor:
         return available >= required_gb
 
 
+class VRAMEstimate(NamedTuple):
+    """Fixed VRAM costs of a pipeline type, in GB"""
+    base_model: float
+    overhead: float
+
+
 class VRAMOptimizer:
     """Optimize generation parameters based on available VRAM"""
 
     # VRAM estimates based on testing (RTX 3060 12GB)
     VRAM_ESTIMATES = {
-        "svd": {
-            "base_model": 6.0,  # SVD model loaded
-            "overhead": 1.5      # System overhead
-        },
-        "animatediff": {
-            "base_model": 5.0,  # SD 1.5 + motion adapter
-            "overhead": 1.5      # System overhead
-        }
+        "svd": VRAMEstimate(
+            base_model=6.0,  # SVD model loaded
+            overhead=1.5     # System overhead
+        ),
+        "animatediff": VRAMEstimate(
+            base_model=5.0,  # SD 1.5 + motion adapter
+            overhead=1.5     # System overhead
+        )
     }
 
+    @classmethod
+    def _estimates_for(cls, pipeline: str) -> VRAMEstimate:
+        """Fixed VRAM costs for a pipeline type (SVD's for unknown types)"""
+        return cls.VRAM_ESTIMATES.get(pipeline) or cls.VRAM_ESTIMATES['svd']
+
     def __init__(self, target_vram_gb: float = 11.0):
         """
         Initialize VRAM optimizer
@@ -139,25 +233,66 @@ class VRAMOptimizer:
         Returns:
             Estimated VRAM usage in GB
         """
-        pipeline = params.get('pipeline', 'svd')
-        width = params.get('width', 512)
-        height = params.get('height', 512)
-        num_frames = params.get('numFrames', 25)
-        decode_chunk_size = params.get('decodeChunkSize', 4)
+        get = params.get
+        width = get('width', 512)
+        height = get('height', 512)
+        pixels = width * height
 
         # Get base estimates
-        estimates = self.VRAM_ESTIMATES.get(pipeline, self.VRAM_ESTIMATES['svd'])
-        base = estimates['base_model']
-        overhead = estimates['overhead']
+        estimates = self._estimates_for(get('pipeline', 'svd'))
 
         # Calculate frame buffer memory
         # Formula: (width * height * num_frames * bytes_per_pixel) / (1024^3) / decode_chunk_size
-        # bytes_per_pixel = 4 (float32)
-        frame_buffer = (width * height * num_frames * 4) / (1024 ** 3)
-        frame_buffer /= decode_chunk_size  # Chunked decoding reduces memory
+        # bytes_per_pixel = 4 (float32); chunked decoding reduces memory
+        frame_buffer = pixels * get('numFrames', 25) * 4 * GB_PER_BYTE / get('decodeChunkSize', 4)
+
+        # Spatial VAE tiling only holds one tile's activations at a time
+        tile_size = get('vaeTileSize')
+        if tile_size:
+            frame_buffer *= min(1.0, (tile_size * tile_size) / pixels)
 
-        total = base + frame_buffer + overhead
-        return round(total, 2)
+        # Unrounded: callers compare against available VRAM; round for display only
+        return estimates.base_model + frame_buffer + estimates.overhead
+
+    def batch_estimate_vram_usage(
+        self,
+        widths: ArrayLike,
+        heights: ArrayLike,
+        num_frames: ArrayLike,
+        decode_chunk_sizes: ArrayLike = 4,
+        pipeline: str = "svd",
+        tile_size: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Estimate VRAM usage for many parameter sets at once
+
+        Same formula as estimate_vram_usage(), evaluated with NumPy
+        broadcasting, e.g. over a grid of candidate resolutions and frame
+        counts when searching for settings that fit.
+
+        Args:
+            widths: Frame widths
+            heights: Frame heights
+            num_frames: Frame counts
+            decode_chunk_sizes: Decode chunk sizes
+            pipeline: Pipeline type ("svd" or "animatediff")
+            tile_size: Spatial VAE tile size, if tiling is enabled
+
+        Returns:
+            Estimated VRAM usage in GB, broadcast over the inputs
+        """
+        estimates = self._estimates_for(pipeline)
+
+        pixels = np.asarray(widths, dtype=np.float64) * np.asarray(heights, dtype=np.float64)
+        frame_buffer = (
+            pixels * np.asarray(num_frames, dtype=np.float64) * (4 * GB_PER_BYTE)
+            / np.asarray(decode_chunk_sizes, dtype=np.float64)
+        )
+
+        if tile_size:
+            frame_buffer *= np.minimum(1.0, (tile_size * tile_size) / pixels)
+
+        return estimates.base_model + estimates.overhead + frame_buffer
 
     def optimize_params(self, params: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
         """
@@ -169,8 +304,10 @@ class VRAMOptimizer:
         Returns:
             Tuple of (optimized_params, optimization_message)
         """
-        estimated = self.estimate_vram_usage(params)
+        # One driver query; every re-estimate below is pure arithmetic
+        # compared against this snapshot
         available = self.monitor.get_available_vram()
+        estimated = self.estimate_vram_usage(params)
 
         optimized = params.copy()
         optimizations = []
@@ -220,7 +357,8 @@ class VRAMOptimizer:
         pipeline: str = "svd",
         width: int = 512,
         height: int = 512,
-        decode_chunk_size: int = 4
+        decode_chunk_size: int = 4,
+        available_gb: Optional[float] = None
     ) -> int:
         """
         Calculate maximum frames for given parameters
@@ -230,27 +368,27 @@ class VRAMOptimizer:
             width: Frame width
             height: Frame height
             decode_chunk_size: Decode chunk size
+            available_gb: Available VRAM, if already known (saves a driver
+                query when checking several resolutions)
 
         Returns:
             Maximum number of frames possible
         """
-        available = self.monitor.get_available_vram()
+        if available_gb is None:
+            available_gb = self.monitor.get_available_vram()
 
-        estimates = self.VRAM_ESTIMATES.get(pipeline, self.VRAM_ESTIMATES['svd'])
-        base = estimates['base_model']
-        overhead = estimates['overhead']
+        base, overhead = self._estimates_for(pipeline)
 
-        # Available for frames
-        available_for_frames = available - base - overhead
+        # Bytes available for frames
+        bytes_for_frames = (available_gb - base - overhead) * (1024 ** 3)
 
         # Calculate max frames
         # frame_buffer = (width * height * num_frames * 4) / (1024^3) / decode_chunk_size
-        # Solve for num_frames
-        bytes_per_frame = (width * height * 4) / (1024 ** 3) / decode_chunk_size
-        max_frames = int(available_for_frames / bytes_per_frame)
+        # Solve for num_frames (clamped divisors: a zero size can't divide by zero)
+        bytes_per_frame = (width * height * 4) // max(decode_chunk_size, 1)
 
         # Apply safety margin
-        max_frames = int(max_frames * 0.9)
+        max_frames = int(bytes_for_frames * 0.9 / max(bytes_per_frame, 1))
 
         # Reasonable bounds
         max_frames = max(16, min(max_frames, 250))
@@ -16,7 +16,10 @@ Usage:
 
 import sys
 import os
-from pathlib import Path
+import shutil
+import stat
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
 import subprocess
 
 # Colors for terminal output
@@ -28,22 +31,77 @@ class Colors:
     BOLD = '\033[1m'
     END = '\033[0m'
 
+# Message prefixes, built once
+SUCCESS_PREFIX = f"{Colors.GREEN}✓{Colors.END} "
+ERROR_PREFIX = f"{Colors.RED}✗{Colors.END} "
+WARNING_PREFIX = f"{Colors.YELLOW}⚠{Colors.END} "
+INFO_PREFIX = "ℹ  "
+HEADER_RULE = f"{Colors.BLUE}{Colors.BOLD}{'=' * 70}{Colors.END}"
+
 def print_header(text):
-    print(f"\n{Colors.BLUE}{Colors.BOLD}{'=' * 70}{Colors.END}")
+    # Output is block-buffered (see below); write out the previous section
+    sys.stdout.flush()
+    print(f"\n{HEADER_RULE}")
     print(f"{Colors.BLUE}{Colors.BOLD}{text}{Colors.END}")
-    print(f"{Colors.BLUE}{Colors.BOLD}{'=' * 70}{Colors.END}\n")
+    print(f"{HEADER_RULE}\n")
 
 def print_success(text):
-    print(f"{Colors.GREEN}✓{Colors.END} {text}")
+    print(SUCCESS_PREFIX + text)
 
 def print_error(text):
-    print(f"{Colors.RED}✗{Colors.END} {text}")
+    print(ERROR_PREFIX + text)
 
 def print_warning(text):
-    print(f"{Colors.YELLOW}⚠{Colors.END} {text}")
+    print(WARNING_PREFIX + text)
 
 def print_info(text):
-    print(f"ℹ  {text}")
+    print(INFO_PREFIX + text)
+
+@lru_cache(maxsize=None)
+def _cached_stat(path):
+    """stat() a path once per run (None if it does not exist)"""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+def path_exists(path):
+    """Cached os.path.exists()"""
+    return _cached_stat(str(path)) is not None
+
+def path_is_dir(path):
+    """Cached os.path.isdir()"""
+    path_stat = _cached_stat(str(path))
+    return path_stat is not None and stat.S_ISDIR(path_stat.st_mode)
+
+def path_is_file(path):
+    """Cached os.path.isfile()"""
+    path_stat = _cached_stat(str(path))
+    return path_stat is not None and stat.S_ISREG(path_stat.st_mode)
+
+def list_safetensors(directory):
+    """
+    List the .safetensors files in a directory with one scandir pass
+
+    Args:
+        directory: Directory to list (need not exist)
+
+    Returns:
+        List of DirEntry objects, empty if the directory is missing
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return [
+                entry for entry in entries
+                if entry.name.endswith(".safetensors") and entry.is_file()
+            ]
+    except OSError:
+        return []
+
+# On a terminal stdout flushes every line; buffer instead and flush once per
+# section (print_header) and at exit
+if hasattr(sys.stdout, 'reconfigure'):
+    sys.stdout.reconfigure(line_buffering=False)
 
 # Track overall status
 all_checks_passed = True
@@ -121,32 +179,30 @@ except ImportError:
 
 print_header("4. Dependencies Check")
 
+# Versions are read from the installed distribution metadata, so the
+# packages are never imported (transformers alone takes seconds to import).
+# Each entry lists the distributions that provide the package.
 required_packages = [
-    ('diffusers', '0.24.0'),
-    ('transformers', '4.36.0'),
-    ('accelerate', '0.25.0'),
-    ('xformers', '0.0.23'),
-    ('cv2', 'opencv-python'),
-    ('PIL', 'Pillow'),
+    ('diffusers', ('diffusers',)),
+    ('transformers', ('transformers',)),
+    ('accelerate', ('accelerate',)),
+    ('xformers', ('xformers',)),
+    ('opencv-python', ('opencv-python', 'opencv-python-headless',
+                       'opencv-contrib-python', 'opencv-contrib-python-headless')),
+    ('Pillow', ('Pillow',)),
 ]
 
 missing_packages = []
 
-for package_name, display_name in required_packages:
-    try:
-        if package_name == 'cv2':
-            import cv2
-            version = cv2.__version__
-        elif package_name == 'PIL':
-            from PIL import Image
-            import PIL
-            version = PIL.__version__
-        else:
-            module = __import__(package_name)
-            version = getattr(module, '__version__', 'unknown')
-
-        print_success(f"{display_name}: {version}")
-    except ImportError:
+for display_name, dist_names in required_packages:
+    for dist_name in dist_names:
+        try:
+            package_version = version(dist_name)
+        except PackageNotFoundError:
+            continue
+        print_success(f"{display_name}: {package_version}")
+        break
+    else:
         print_error(f"{display_name} not installed")
         missing_packages.append(display_name)
 
@@ -168,7 +224,7 @@ required_dirs = [
 ]
 
 for dir_path in required_dirs:
-    if os.path.exists(dir_path):
+    if path_exists(dir_path):
         print_success(f"{dir_path} exists")
     else:
         print_warning(f"{dir_path} does not exist")
@@ -180,52 +236,57 @@ for dir_path in required_dirs:
 
 print_header("6. Models Check")
 
-models_dir = Path("/mnt/d/VideoGenerator/models")
+# Plain string paths, joined once: every check below takes them as-is
+models_dir = "/mnt/d/VideoGenerator/models"
+
+# A complete download is recognized by a few files it always contains,
+# rather than by walking the whole snapshot tree
+SVD_REQUIRED_FILES = ("model_index.json", "unet/config.json")
+ANIMATEDIFF_WEIGHT_FILES = (
+    "diffusion_pytorch_model.fp16.safetensors",
+    "diffusion_pytorch_model.safetensors",
+)
 
 # Check SVD-XT
-svd_path = models_dir / "svd-xt"
-if svd_path.exists() and svd_path.is_dir():
-    file_count = len(list(svd_path.rglob("*")))
-    if file_count > 10:
-        print_success(f"SVD-XT model found ({file_count} files)")
+svd_path = os.path.join(models_dir, "svd-xt")
+if path_is_dir(svd_path):
+    missing = [name for name in SVD_REQUIRED_FILES if not path_is_file(os.path.join(svd_path, name))]
+    if not missing:
+        print_success("SVD-XT model found")
     else:
-        print_warning(f"SVD-XT directory exists but may be incomplete ({file_count} files)")
+        print_warning(f"SVD-XT directory exists but may be incomplete (missing {', '.join(missing)})")
 else:
     print_error("SVD-XT model not found")
     print_info("Download with: python backend/download_models.py")
     all_checks_passed = False
 
 # Check AnimateDiff
-animatediff_path = models_dir / "animatediff"
-if animatediff_path.exists() and animatediff_path.is_dir():
-    file_count = len(list(animatediff_path.rglob("*")))
-    if file_count > 5:
-        print_success(f"AnimateDiff motion adapter found ({file_count} files)")
+animatediff_path = os.path.join(models_dir, "animatediff")
+if path_is_dir(animatediff_path):
+    has_config = path_is_file(os.path.join(animatediff_path, "config.json"))
+    has_weights = any(path_is_file(os.path.join(animatediff_path, name)) for name in ANIMATEDIFF_WEIGHT_FILES)
+    if has_config and has_weights:
+        print_success("AnimateDiff motion adapter found")
     else:
-        print_warning(f"AnimateDiff directory exists but may be incomplete ({file_count} files)")
+        print_warning("AnimateDiff directory exists but may be incomplete (missing config or weights)")
 else:
     print_error("AnimateDiff motion adapter not found")
     print_info("Download with: python backend/download_models.py")
     all_checks_passed = False
 
-# Check for SD 1.5 base models
-realistic_vision_dir = models_dir / "realistic-vision"
+# Check for SD 1.5 base models (bundled Realistic Vision, then custom models)
+base_model_dirs = [
+    ("Realistic Vision", os.path.join(models_dir, "realistic-vision")),
+    ("Custom", os.path.join(models_dir, "custom")),
+]
 model_count = 0
 
-if realistic_vision_dir.exists():
-    safetensors = list(realistic_vision_dir.glob("*.safetensors"))
-    model_count += len(safetensors)
-    if safetensors:
-        print_success(f"Realistic Vision model found: {safetensors[0].name}")
-
-# Check custom models
-custom_dir = models_dir / "custom"
-if custom_dir.exists():
-    custom_safetensors = list(custom_dir.glob("*.safetensors"))
-    model_count += len(custom_safetensors)
-    if custom_safetensors:
-        print_success(f"Custom models found: {len(custom_safetensors)}")
-        for model in custom_safetensors:
+for label, model_dir in base_model_dirs:
+    found = list_safetensors(model_dir)
+    model_count += len(found)
+    if found:
+        print_success(f"{label} models found: {len(found)}")
+        for model in found:
             print_info(f"  - {model.name}")
 
 if model_count == 0:
@@ -240,17 +301,18 @@ if model_count == 0:
 print_header("7. Disk Space Check")
 
 try:
-    stat = os.statvfs(models_dir)
-    available_gb = (stat.f_bavail * stat.f_frsize) / (1024**3)
+    # Free space available to this user, in MiB (integer thresholds below)
+    free_mib = shutil.disk_usage(models_dir).free >> 20
+    available = f"{free_mib / 1024:.2f} GB"
 
-    print_info(f"Available space on D:\\: {available_gb:.2f} GB")
+    print_info(f"Available space on D:\\: {available}")
 
-    if available_gb >= 10:
+    if free_mib >= 10 * 1024:
         print_success("Sufficient disk space")
-    elif available_gb >= 5:
-        print_warning(f"Low disk space ({available_gb:.2f} GB). 10GB+ recommended for model downloads.")
+    elif free_mib >= 5 * 1024:
+        print_warning(f"Low disk space ({available}). 10GB+ recommended for model downloads.")
     else:
-        print_error(f"Very low disk space ({available_gb:.2f} GB). Free up space before downloading models.")
+        print_error(f"Very low disk space ({available}). Free up space before downloading models.")
         all_checks_passed = False
 
 except Exception as e:
@@ -269,10 +331,11 @@ backend_scripts = [
 ]
 
 for script in backend_scripts:
-    if os.path.exists(script):
+    script_stat = _cached_stat(script)
+    if script_stat is not None:
         print_success(f"{script} exists")
-        # Check if executable
-        if os.access(script, os.X_OK):
+        # Check if executable (any execute bit, from the same stat)
+        if script_stat.st_mode & 0o111:
             print_info(f"  ✓ Executable")
     else:
         print_error(f"{script} not found")
@@ -10,36 +10,100 @@ Usage:
     # Or make executable: chmod +x scripts/check_gpu.py && ./scripts/check_gpu.py
 """
 
+import csv
+import io
+import os
+import shutil
 import sys
 import subprocess
 import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+
+# Message prefixes
+SUCCESS_PREFIX = "✅ "
+ERROR_PREFIX = "❌ "
+WARNING_PREFIX = "⚠️  "
+INFO_PREFIX = "ℹ️  "
+HEADER_RULE = "=" * 70
+
+# Device nodes present when a GPU driver is loaded (native Linux, WSL2)
+GPU_DEVICE_NODES = ("/dev/nvidiactl", "/dev/dxg")
+
+# Bytes per GB
+GB = 1024 ** 3
+
+# Fields read from nvidia-smi; a targeted query skips building the full report
+NVIDIA_SMI_QUERY = "name,driver_version,memory.total"
+
+
+class ThreadLocalStdout:
+    """
+    sys.stdout stand-in that sends each capturing thread's output to its own buffer
+
+    Lets checks run concurrently while their output is still printed one
+    section at a time, in order.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def write(self, text):
+        return getattr(self._local, 'buffer', self._stream).write(text)
+
+    def flush(self):
+        getattr(self._local, 'buffer', self._stream).flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    def run_captured(self, check):
+        """
+        Run a check with its output captured
+
+        Args:
+            check: Check function
+
+        Returns:
+            Tuple of (check result, captured output)
+        """
+        self._local.buffer = io.StringIO()
+        try:
+            result = check()
+            return result, self._local.buffer.getvalue()
+        finally:
+            del self._local.buffer
 
 
 def print_header(text):
-    """Print a formatted header"""
-    print("\n" + "=" * 70)
+    """Print a formatted header, writing out the previous section first"""
+    sys.stdout.flush()
+    print("\n" + HEADER_RULE)
     print(f"  {text}")
-    print("=" * 70)
+    print(HEADER_RULE)
 
 
 def print_success(text):
     """Print success message"""
-    print(f"✅ {text}")
+    print(SUCCESS_PREFIX + text)
 
 
 def print_error(text):
     """Print error message"""
-    print(f"❌ {text}")
+    print(ERROR_PREFIX + text)
 
 
 def print_warning(text):
     """Print warning message"""
-    print(f"⚠️  {text}")
+    print(WARNING_PREFIX + text)
 
 
 def print_info(text):
     """Print info message"""
-    print(f"ℹ️  {text}")
+    print(INFO_PREFIX + text)
 
 
 def check_python_version():
@@ -69,7 +133,7 @@ def check_nvidia_smi():
 
     try:
         result = subprocess.run(
-            ['nvidia-smi'],
+            ['nvidia-smi', f'--query-gpu={NVIDIA_SMI_QUERY}', '--format=csv,noheader'],
             capture_output=True,
             text=True,
             timeout=5
@@ -80,13 +144,14 @@ def check_nvidia_smi():
             print("\nGPU Information:")
             print("-" * 70)
 
-            # Parse output for key information
-            lines = result.stdout.split('\n')
-            for line in lines:
-                if 'Driver Version' in line or 'CUDA Version' in line:
-                    print(line.strip())
-                if 'GeForce' in line or 'RTX' in line or 'GTX' in line:
-                    print(line.strip())
+            # One CSV row per GPU
+            for row in csv.reader(result.stdout.splitlines(), skipinitialspace=True):
+                if len(row) < 3:
+                    continue
+                name, driver_version, memory_total = row[:3]
+                print(f"GPU: {name}")
+                print(f"  Driver Version: {driver_version}")
+                print(f"  Memory: {memory_total}")
 
             print("-" * 70)
             return True
@@ -108,10 +173,49 @@ def check_nvidia_smi():
         return False
 
 
+def report_driver_from_torch():
+    """
+    Report the NVIDIA driver as working when PyTorch has already initialized CUDA
+
+    A CUDA context can only be created through a working driver, so this
+    stands in for check_nvidia_smi() without spawning nvidia-smi.
+
+    Returns:
+        True
+    """
+    import torch
+
+    print_header("NVIDIA Driver Check")
+    print_success("NVIDIA driver is working (CUDA initialized by PyTorch)")
+    print(f"CUDA Version: {torch.version.cuda}")
+    print(f"GPU: {torch.cuda.get_device_name(0)}")
+    print_info("Run nvidia-smi for the driver version")
+    return True
+
+
+def gpu_device_present():
+    """Check for a GPU driver device node (a stat each, no driver calls)"""
+    return any(os.path.exists(node) for node in GPU_DEVICE_NODES)
+
+
 def check_pytorch():
     """Check if PyTorch is installed and can access CUDA"""
     print_header("PyTorch and CUDA Check")
 
+    # Without a driver the CUDA test is bound to fail; report from package
+    # metadata instead of importing torch and initializing CUDA
+    if not gpu_device_present():
+        try:
+            torch_version = version("torch")
+        except PackageNotFoundError:
+            torch_version = None
+
+        if torch_version is not None:
+            print_success(f"PyTorch {torch_version} is installed")
+            print_error("No NVIDIA GPU device found - skipping the CUDA test")
+            print_info(f"Expected one of: {', '.join(GPU_DEVICE_NODES)}")
+            return False
+
     try:
         import torch
         print_success(f"PyTorch {torch.__version__} is installed")
@@ -119,18 +223,19 @@ def check_pytorch():
         # Check CUDA availability
         if torch.cuda.is_available():
             print_success("CUDA is available to PyTorch!")
+            print(f"CUDA Version: {torch.version.cuda}")
 
             # Get device information
             device_count = torch.cuda.device_count()
             print(f"\nNumber of CUDA devices: {device_count}")
 
             for i in range(device_count):
-                device_name = torch.cuda.get_device_name(i)
-                device_capability = torch.cuda.get_device_capability(i)
-                total_memory = torch.cuda.get_device_properties(i).total_memory / (1024**3)
+                props = torch.cuda.get_device_properties(i)
+                device_name = props.name
+                total_memory = props.total_memory / (1024**3)
 
                 print(f"\nDevice {i}: {device_name}")
-                print(f"  Compute Capability: {device_capability[0]}.{device_capability[1]}")
+                print(f"  Compute Capability: {props.major}.{props.minor}")
                 print(f"  Total VRAM: {total_memory:.2f} GB")
 
                 # Check if it's RTX 3060
@@ -146,15 +251,15 @@ def check_pytorch():
             # Test CUDA with a simple operation
             print("\nTesting CUDA with tensor operation...")
             try:
-                x = torch.rand(5, 3).cuda()
-                y = torch.rand(5, 3).cuda()
-                z = x + y
+                # Create the tensors on the GPU (no host copies); item() syncs
+                # so any kernel error surfaces here. No empty_cache(): the
+                # allocator is released at exit anyway.
+                device = torch.device('cuda')
+                x = torch.rand(5, 3, device=device)
+                y = torch.rand(5, 3, device=device)
+                (x + y).sum().item()
                 print_success("CUDA tensor operations working!")
 
-                # Clean up
-                del x, y, z
-                torch.cuda.empty_cache()
-
             except Exception as e:
                 print_error(f"CUDA test failed: {e}")
                 return False
@@ -173,24 +278,41 @@ def check_pytorch():
         return None  # None = not yet installed (not an error)
 
 
+@lru_cache(maxsize=1)
+def read_proc_version():
+    """
+    Read /proc/version once per process
+
+    Returns:
+        Lowercased kernel version string ('' if unavailable)
+    """
+    try:
+        with open('/proc/version', 'r') as f:
+            return f.read().lower()
+    except OSError:
+        return ''
+
+
+def is_wsl():
+    """Check if running in WSL (Windows Subsystem for Linux)"""
+    version = read_proc_version()
+    return 'microsoft' in version or 'wsl' in version
+
+
 def check_system_info():
     """Display system information"""
     print_header("System Information")
 
-    print(f"Platform: {platform.system()}")
-    print(f"Architecture: {platform.machine()}")
-    print(f"Kernel: {platform.release()}")
+    uname = platform.uname()
+    print(f"Platform: {uname.system}")
+    print(f"Architecture: {uname.machine}")
+    print(f"Kernel: {uname.release}")
 
     # Check if running in WSL
-    try:
-        with open('/proc/version', 'r') as f:
-            version = f.read().lower()
-            if 'microsoft' in version or 'wsl' in version:
-                print_success("Running in WSL (Windows Subsystem for Linux)")
-            else:
-                print_info("Running in native Linux")
-    except:
-        pass
+    if is_wsl():
+        print_success("Running in WSL (Windows Subsystem for Linux)")
+    elif read_proc_version():
+        print_info("Running in native Linux")
 
 
 def check_disk_space():
@@ -198,38 +320,23 @@ def check_disk_space():
     print_header("Disk Space Check")
 
     try:
-        # Check current directory
-        result = subprocess.run(
-            ['df', '-h', '.'],
-            capture_output=True,
-            text=True
-        )
-
+        # shutil.disk_usage is a single statvfs() call; no df subprocess
+        usage = shutil.disk_usage('.')
         print("Current directory:")
-        print(result.stdout)
-
-        # Check /mnt/d if it exists (Windows D: drive)
-        import os
-        if os.path.exists('/mnt/d'):
-            result = subprocess.run(
-                ['df', '-h', '/mnt/d'],
-                capture_output=True,
-                text=True
-            )
-            print("\nD:\\ drive (for models):")
-            print(result.stdout)
-
-            # Parse to check if >= 20GB available
-            lines = result.stdout.split('\n')
-            if len(lines) > 1:
-                parts = lines[1].split()
-                if len(parts) >= 4:
-                    available = parts[3]
-                    print_info(f"Available space on D:\\: {available}")
-                    print_info("Need at least 20GB for models (~15GB models + 5GB buffer)")
-        else:
+        print(f"  Total: {usage.total / GB:.1f} GB, Free: {usage.free / GB:.1f} GB")
+
+        # Check /mnt/d if it exists (Windows D: drive). statvfs() doubles as
+        # the existence test, so the slow DrvFs mount is queried only once.
+        try:
+            usage = shutil.disk_usage('/mnt/d')
+        except FileNotFoundError:
             print_warning("/mnt/d not found - D:\\ drive may not be accessible from WSL")
             print_info("Models should be stored on D:\\VideoGenerator\\models\\")
+        else:
+            print("\nD:\\ drive (for models):")
+            print(f"  Total: {usage.total / GB:.1f} GB")
+            print_info(f"Available space on D:\\: {usage.free / GB:.1f} GB")
+            print_info("Need at least 20GB for models (~15GB models + 5GB buffer)")
 
     except Exception as e:
         print_warning(f"Could not check disk space: {e}")
@@ -237,6 +344,11 @@ def check_disk_space():
 
 def main():
     """Run all checks"""
+    # On a terminal stdout flushes every line; buffer instead and flush
+    # once per section (print_header) and at exit
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=False)
+
     print("\n" + "=" * 70)
     print("  IMAGE-TO-VIDEO GENERATOR - GPU VERIFICATION")
     print("=" * 70)
@@ -245,21 +357,45 @@ def main():
     checks_failed = []
     checks_pending = []
 
-    # Run checks
-    if check_python_version():
+    # Run the independent checks concurrently (they mostly wait on
+    # subprocesses, file reads and the PyTorch import), then print each
+    # one's output in order. One worker per check, so the slow `import torch`
+    # in check_pytorch starts immediately instead of queueing behind the
+    # others.
+    checks = (check_python_version, check_system_info, check_disk_space, check_pytorch)
+    original_stdout = sys.stdout
+    stdout = ThreadLocalStdout(original_stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = [executor.submit(stdout.run_captured, check) for check in checks]
+            results = []
+            for future in futures:
+                result, output = future.result()
+                stdout.write(output)
+                results.append(result)
+    finally:
+        sys.stdout = original_stdout
+
+    python_ok, _, _, pytorch_result = results
+
+    if python_ok:
         checks_passed.append("Python Version")
     else:
         checks_failed.append("Python Version")
 
-    check_system_info()
-    check_disk_space()
+    # Working CUDA in PyTorch proves the driver; only spawn nvidia-smi
+    # when it is needed to diagnose a problem
+    if pytorch_result is True:
+        driver_ok = report_driver_from_torch()
+    else:
+        driver_ok = check_nvidia_smi()
 
-    if check_nvidia_smi():
+    if driver_ok:
         checks_passed.append("NVIDIA Drivers")
     else:
         checks_failed.append("NVIDIA Drivers")
 
-    pytorch_result = check_pytorch()
     if pytorch_result is True:
         checks_passed.append("PyTorch + CUDA")
     elif pytorch_result is False:
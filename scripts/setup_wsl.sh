@@ -183,7 +183,7 @@ print_header "Step 3: Installing PyTorch with CUDA 11.8"
 
 print_info "This may take 5-10 minutes depending on your internet speed..."
 
-pip install torch==2.3.1 torchvision==0.18.1 torchaudio==2.3.1 \
+pip install torch==2.6.0 torchvision==0.21.0 torchaudio==2.6.0 \
     --index-url https://download.pytorch.org/whl/cu118
 
 print_success "PyTorch installed"